@@ -0,0 +1,150 @@
+"""
+Консольный режим ASX Hub без окна - для скриптов развёртывания на множестве машин:
+
+    python -m asx check [--tweak KEY ...] [--full] [--no-save]
+    python -m asx diff optimized
+    python -m asx apply optimized | preset.json | <имя сохранённого пресета>
+    python -m asx export [--name NAME] [--output preset.json]
+
+(то же самое - python main.py --headless <команда>). customtkinter не импортируется.
+Анализ читается и сохраняется в tweak_analysis.json рядом с программой, а не в текущем каталоге.
+Результат печатается в stdout одним JSON-документом, сообщения твиков уходят в stderr.
+
+Коды возврата: 0 - успех; 1 - машина не в нужном состоянии (diff нашёл изменения,
+шаги apply не выполнены, статус части твиков не определён); 2 - ошибка запуска
+(неизвестный пресет или твик); 3 - пресет применён, нужна перезагрузка.
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+import contextlib
+from dataclasses import asdict
+from datetime import datetime
+from typing import Optional, Any, Dict, List, Tuple
+
+from utils.preset_planner import PresetPlanner, Preset, resolve_preset, save_preset
+
+EXIT_OK = 0
+EXIT_CHANGES = 1
+EXIT_ERROR = 2
+EXIT_REBOOT = 3
+
+CommandResult = Tuple[Dict[str, Any], int]
+
+
+def _select_keys(planner: PresetPlanner, keys: Optional[List[str]], include_manual: bool = True) -> List[str]:
+    """Requested tweak keys (all tweaks with a class by default)"""
+    if keys:
+        unknown = [key for key in keys if not planner.tweaks.configs.get(key, {}).get("class_name")]
+        if unknown:
+            raise ValueError(f"Unknown tweaks: {', '.join(unknown)}")
+        return list(keys)
+    return planner.tweak_keys(include_manual)
+
+
+def cmd_check(planner: PresetPlanner, args) -> CommandResult:
+    keys = _select_keys(planner, args.keys)
+    analysis = planner.analyze(keys, incremental=not args.full)
+    if not args.keys and not args.no_save:
+        # Полный анализ сохраняется как обычно: следующий запуск (и окно) переиспользуют отпечатки
+        from utils.tweak_analyzer import TweakAnalyzer
+        TweakAnalyzer().save_analysis(analysis)
+    statuses = analysis["tweaks"]
+    unknown = [key for key in keys if key not in statuses]
+    result = {
+        "command": "check",
+        "total": len(keys),
+        "optimized": sum(1 for status in statuses.values() if status.get("optimized")),
+        "not_optimized": sorted(key for key, status in statuses.items() if not status.get("optimized")),
+        "unknown": unknown,
+        "timeouts": analysis.get("probe_timeouts", []),
+        "reused": analysis.get("reused", 0),
+        "probe_ms": analysis.get("probe_ms"),
+        "tweaks": statuses,
+    }
+    return result, EXIT_CHANGES if unknown else EXIT_OK
+
+
+def cmd_diff(planner: PresetPlanner, args) -> CommandResult:
+    preset = resolve_preset(args.profile)
+    plan = planner.plan(preset)
+    result = {
+        "command": "diff",
+        "preset": preset.name,
+        "changes": plan.changes(),
+        "unchanged": plan.unchanged,
+        "skipped": plan.skipped,
+        "probe_ms": plan.probe_ms,
+    }
+    return result, EXIT_OK if plan.is_noop else EXIT_CHANGES
+
+
+def cmd_apply(planner: PresetPlanner, args) -> CommandResult:
+    preset = resolve_preset(args.profile)
+    plan = planner.apply(preset)
+    result = dict(plan.summary(), command="apply", steps=[asdict(step) for step in plan.steps])
+    if result["failed"]:
+        return result, EXIT_CHANGES
+    return result, EXIT_REBOOT if plan.requires_reboot else EXIT_OK
+
+
+def cmd_export(planner: PresetPlanner, args) -> CommandResult:
+    # Однонаправленные действия в пресет не попадают - apply их всё равно пропустит
+    keys = _select_keys(planner, None, include_manual=False)
+    statuses = planner.probe(keys)
+    preset = Preset(name=args.name or platform.node() or "exported",
+                    tweaks={key: statuses[key] for key in keys if key in statuses},
+                    description=f"Состояние твиков {platform.node()} на {datetime.now().isoformat(timespec='seconds')}")
+    if args.output:
+        save_preset(preset, args.output)
+    # Вывод - сам пресет: `asx export > p.json` и затем `asx apply p.json`
+    result = preset.to_dict()
+    missing = [key for key in keys if key not in statuses]
+    return result, EXIT_CHANGES if missing else EXIT_OK
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="asx", description="Check and apply ASX Hub tweaks without the GUI")
+    parser.add_argument("--indent", type=int, default=None, help="indent the JSON output")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    check = commands.add_parser("check", help="report the status of every tweak")
+    check.add_argument("--tweak", action="append", dest="keys", help="limit the check to these tweak keys")
+    check.add_argument("--full", action="store_true", help="probe every tweak, ignoring unchanged fingerprints")
+    check.add_argument("--no-save", action="store_true", help="do not store the analysis for later runs")
+    check.set_defaults(handler=cmd_check)
+
+    diff = commands.add_parser("diff", help="list the changes a preset would make")
+    diff.add_argument("profile", help="'optimized', a preset JSON file or a saved preset name")
+    diff.set_defaults(handler=cmd_diff)
+
+    apply = commands.add_parser("apply", help="bring the tweaks to a preset")
+    apply.add_argument("profile", help="'optimized', a preset JSON file or a saved preset name")
+    apply.set_defaults(handler=cmd_apply)
+
+    export = commands.add_parser("export", help="print the current state as a preset")
+    export.add_argument("--name", help="preset name (default: computer name)")
+    export.add_argument("--output", help="also save the preset to this file")
+    export.set_defaults(handler=cmd_export)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    try:
+        # stdout занят JSON-результатом - print() твиков и планировщика уходит в stderr
+        with contextlib.redirect_stdout(sys.stderr):
+            result, code = args.handler(PresetPlanner(), args)
+    except Exception as e:
+        # Любой сбой - тоже JSON-документ: скрипты развёртывания разбирают stdout, а не трассировку
+        result, code = {"command": args.command, "error": str(e) or type(e).__name__}, EXIT_ERROR
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    print(json.dumps(result, ensure_ascii=False, indent=args.indent))
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
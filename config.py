@@ -1,10 +1,6 @@
 # Application configuration
-from utils.tweaks.fso_gamebar import FsoGameBarTweak
-from utils.tweaks.hdcp import HdcpTweak
-from utils.tweaks.nvidia_optimization import NvidiaOptimizationTweak
-from utils.tweaks.power_throttling import PowerThrottlingTweak
-from utils.tweaks.powerplan import PowerPlanTweak
-from utils.tweaks.spectre_meltdown import SpectreMeltdownTweak
+# Классы твиков указаны в TWEAKS по имени (module/class_name) и загружаются
+# utils.tweak_registry по требованию - импортировать модули твиков здесь не нужно
 
 # GitHub API configuration
 GITHUB_API_URL = "https://api.github.com"
@@ -94,6 +90,7 @@ TWEAKS = [
         'module': 'spectre_meltdown',
         'category': "Оптимизация и настройки",
         'optimized_state': False,  # True means enabled is optimized, False means disabled is optimized
+        'requires_reboot': True,  # Вступает в силу после перезагрузки
     },
     {
         'key': 'nvidia_optimization',
@@ -108,6 +105,7 @@ TWEAKS = [
         'module': 'hdcp',
         'category': "Оптимизация и настройки",
         'optimized_state': False,  # True means enabled is optimized, False means disabled is optimized
+        'requires_reboot': True,  # Вступает в силу после перезагрузки
     },
     {
         'key': 'power_throttling',
@@ -220,6 +218,7 @@ TWEAKS = [
         'module': 'uac',
         'category': "Оптимизация и настройки",
         'optimized_state': False,  # True means enabled is optimized, False means disabled is optimized
+        'requires_reboot': True,  # Вступает в силу после перезагрузки
     },
     {
         'key': 'hw_sch_mode',
@@ -227,6 +226,7 @@ TWEAKS = [
         'module': 'hw_sch_mode',
         'category': "Оптимизация и настройки",
         'optimized_state': False,  # True means enabled is optimized, False means disabled is optimized
+        'requires_reboot': True,  # Вступает в силу после перезагрузки
     },
     {
         'key': 'widgets_uninstall',
@@ -248,6 +248,7 @@ TWEAKS = [
         'module': 'core_isolation',
         'category': "Оптимизация и настройки",
         'optimized_state': True,  # True means enabled is optimized, False means disabled is optimized
+        'requires_reboot': True,  # Вступает в силу после перезагрузки
     },
     {
         'key': 'auto_update_maps',
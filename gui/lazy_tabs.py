@@ -0,0 +1,119 @@
+"""
+Ленивое построение вкладок CTkTabview.
+
+Вкладка регистрируется фабрикой: кнопка вкладки появляется сразу, а содержимое строится
+при первом выборе вкладки. Дешёвые вкладки можно построить заранее в простое
+(prewarm), а построенную вкладку - разобрать, чтобы освободить память; при следующем
+выборе она построится заново.
+"""
+import time
+import logging
+from dataclasses import dataclass
+from typing import Optional, Any, Callable, Dict, List
+
+
+@dataclass
+class _TabEntry:
+    name: str
+    frame: Any
+    factory: Callable[[Any], Any]
+    prewarm: bool = False
+    instance: Any = None
+    built: bool = False
+    build_ms: Optional[float] = None
+
+
+class LazyTabs:
+    """Builds tabview tabs from registered factories the first time they are selected"""
+
+    def __init__(self, tabview, on_built: Optional[Callable[[str, Any], None]] = None):
+        self.tabview = tabview
+        self.on_built = on_built
+        self._tabs: Dict[str, _TabEntry] = {}
+        self._prewarm_scheduled = False
+        # Клики по кнопкам вкладок; программный tabview.set() сюда не приходит - для него select()
+        self.tabview.configure(command=self._on_tab_changed)
+
+    def register(self, name: str, factory: Callable[[Any], Any], prewarm: bool = False):
+        """Adds the tab; factory(frame) builds its content and returns the tab object"""
+        frame = self.tabview.add(name)
+        self._tabs[name] = _TabEntry(name, frame, factory, prewarm)
+        return frame
+
+    def frame(self, name: str):
+        return self._tabs[name].frame
+
+    def get(self, name: str) -> Optional[Any]:
+        """The tab object if the tab has been built"""
+        entry = self._tabs.get(name)
+        return entry.instance if entry is not None and entry.built else None
+
+    def is_built(self, name: str) -> bool:
+        entry = self._tabs.get(name)
+        return entry is not None and entry.built
+
+    def ensure(self, name: str) -> Any:
+        """Builds the tab now if it has not been built yet"""
+        entry = self._tabs[name]
+        if entry.built:
+            return entry.instance
+        start = time.perf_counter()
+        entry.built = True  # повторный вызов из фабрики не должен строить вкладку ещё раз
+        try:
+            entry.instance = entry.factory(entry.frame)
+        except Exception as e:
+            entry.built = False
+            logging.error(f"Error building tab {name}: {e}")
+            raise
+        entry.build_ms = round((time.perf_counter() - start) * 1000, 1)
+        if self.on_built is not None:
+            self.on_built(name, entry.instance)
+        return entry.instance
+
+    def select(self, name: str) -> Any:
+        """Shows the tab, building it first if needed"""
+        self.tabview.set(name)
+        return self.ensure(name)
+
+    def teardown(self, name: str) -> bool:
+        """Destroys the tab's widgets; the next selection builds it again"""
+        entry = self._tabs[name]
+        if not entry.built or self.tabview.get() == name:
+            return False
+        for widget in entry.frame.winfo_children():
+            widget.destroy()
+        entry.instance = None
+        entry.built = False
+        return True
+
+    def teardown_inactive(self, keep: Optional[List[str]] = None) -> List[str]:
+        """Tears down every built tab except the active one and those in keep"""
+        keep = set(keep or ())
+        return [name for name in list(self._tabs) if name not in keep and self.teardown(name)]
+
+    def prewarm_when_idle(self, delay: int = 500):
+        """Builds the tabs registered with prewarm=True one at a time in idle time"""
+        if self._prewarm_scheduled:
+            return
+        self._prewarm_scheduled = True
+        self.tabview.after(delay, self._prewarm_next)
+
+    def _prewarm_next(self):
+        pending = [entry.name for entry in self._tabs.values() if entry.prewarm and not entry.built]
+        if not pending:
+            self._prewarm_scheduled = False
+            return
+        try:
+            self.ensure(pending[0])
+        except Exception:
+            # Уже записано в журнал; вкладка попробует построиться при выборе
+            self._tabs[pending[0]].prewarm = False
+        # Следующая вкладка - только когда цикл событий снова свободен
+        self.tabview.after_idle(lambda: self.tabview.after(50, self._prewarm_next))
+
+    def _on_tab_changed(self):
+        self.ensure(self.tabview.get())
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """tab name -> build time in ms (None - not built)"""
+        return {name: entry.build_ms if entry.built else None for name, entry in self._tabs.items()}
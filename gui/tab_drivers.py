@@ -1,9 +1,7 @@
 import os
 import json
 import sys
-import threading
 import tkinter as tk
-import asyncio
 import subprocess
 import re
 from collections import defaultdict
@@ -37,13 +35,6 @@ settings = load_settings()
 ctk.set_appearance_mode(settings.get("appearance_mode", "System"))
 ctk.set_default_color_theme(settings.get("theme", "blue"))
 
-def start_asyncio_loop(loop):
-    asyncio.set_event_loop(loop)
-    loop.run_forever()
-
-loop = asyncio.new_event_loop()
-threading.Thread(target=start_asyncio_loop, args=(loop,), daemon=True).start()
-
 class DynamicStatusBar(ctk.CTkFrame):
     """Status bar widget with text update capability."""
     def __init__(self, parent, default_text="", *args, **kwargs):
@@ -3,8 +3,11 @@ import json
 from datetime import datetime, timedelta
 import psutil
 import platform
-import subprocess
 from gui.utils import resource_path  # Импортируем resource_path из gui/utils.py
+from utils.powershell_host import run_powershell
+from utils.analysis_store import get_analysis_store
+from utils.executor import task_group
+from utils.lazy_import import lazy_import, module_available
 
 try:
     import customtkinter as ctk
@@ -13,11 +16,10 @@ except ImportError:
     import sys
     sys.exit(1)
 
-try:
-    import GPUtil
-    GPU_AVAILABLE = True
-except ImportError:
-    GPU_AVAILABLE = False
+# GPUtil импортируется при первом запросе данных о видеокарте
+GPUtil = lazy_import("GPUtil")
+GPU_AVAILABLE = module_available("GPUtil")
+if not GPU_AVAILABLE:
     print("Warning: GPUtil library not found. GPUtil information will not be available.")
 
 from PIL import Image
@@ -32,7 +34,13 @@ class HomeCenter:
         self.last_update = None
         self.update_interval = 5000
         self.recommendation_icons = self._load_recommendation_icons()
+        # Статусы твиков берутся из общего хранилища анализа, а не из tweak_analysis.json
+        self.store = get_analysis_store()
+        self._restore_point_date = None
+        self._restore_point_checked = False
+        self._restore_point_future = None
         self.setup_information_content()
+        self.store.subscribe_tk(self.parent, self._on_analysis_changes)
 
     def _load_recommendation_icons(self):
         """Loads recommendation icons for better organization."""
@@ -58,7 +66,9 @@ class HomeCenter:
         self._clear_frame(self.info_frame) # Use internal clear_frame
         self._create_welcome_card() # Use internal card creation
         self.optimization_card = self._create_system_status_card() # Use internal card creation
-        self.create_recommendations_section(self.optimization_card) # Keep recommendations as is
+        self.recommendations_frame = ctk.CTkFrame(self.optimization_card, fg_color="transparent")
+        self.recommendations_frame.pack(fill="x")
+        self.create_recommendations_section(self.recommendations_frame)
         self.schedule_updates()
 
     def _create_welcome_card(self):
@@ -158,11 +168,36 @@ class HomeCenter:
         except Exception as e:
             print(f"Error updating system info: {e}")
 
-    def update_system_status_widgets(self):
-        """Updates the system status widgets with current data."""
+    def _on_analysis_changes(self, changes):
+        """Refreshes the optimization gauge and the recommendations when tweak statuses change."""
+        self._update_optimization_widget()
+        self._refresh_recommendations()
+
+    def _refresh_recommendations(self):
+        self._clear_frame(self.recommendations_frame)
+        self.create_recommendations_section(self.recommendations_frame)
+
+    def _request_restore_point_date(self):
+        if self._restore_point_future is not None:
+            return
+        self._restore_point_future = task_group("home").submit(self.get_last_restore_point_date)
+        self._restore_point_future.add_done_callback(
+            lambda future: self.parent.after(0, self._on_restore_point_date, future))
+
+    def _on_restore_point_date(self, future):
+        if not future.cancelled() and future.exception() is None:
+            self._restore_point_date = future.result()
+        self._restore_point_checked = True
+        self._refresh_recommendations()
+
+    def _update_optimization_widget(self):
         percent = self.calculate_optimization_percentage()
         self._update_status_widget(self.optimization_progress, self.optimization_percentage, self.optimization_status, percent, "Система оптимизирована", "Требуется оптимизация", "Можно улучшить")
 
+    def update_system_status_widgets(self):
+        """Updates the system status widgets with current data."""
+        self._update_optimization_widget()
+
         disk = psutil.disk_usage('/')
         self._update_status_widget(self.disk_usage_progress, self.disk_usage_percentage, self.disk_usage_status, disk.percent, "Диск в норме", "Мало места на диске", "Диск заполнен наполовину", thresholds=[70, 90])
 
@@ -186,17 +221,15 @@ class HomeCenter:
     def calculate_optimization_percentage(self):
         """Calculate the optimization percentage using tweak analysis data."""
         try:
-            with open("tweak_analysis.json", "r", encoding='utf-8') as f:
-                analysis = json.load(f)
-                tweaks = analysis.get("tweaks", {})
-                optimization_tweaks = [
-                    data for data in tweaks.values()
-                    if data.get("category") == "Оптимизация и настройки"
-                ]
-                total_tweaks = len(optimization_tweaks)
-                optimized_tweaks = sum(1 for tweak in optimization_tweaks if tweak.get("optimized", False))
-                return (optimized_tweaks / total_tweaks) * 100 if total_tweaks else 0
-        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            tweaks = self.store.statuses()
+            optimization_tweaks = [
+                data for data in tweaks.values()
+                if data.get("category") == "Оптимизация и настройки"
+            ]
+            total_tweaks = len(optimization_tweaks)
+            optimized_tweaks = sum(1 for tweak in optimization_tweaks if tweak.get("optimized", False))
+            return (optimized_tweaks / total_tweaks) * 100 if total_tweaks else 0
+        except KeyError as e:
             print(f"Error calculating optimization percentage: {e}")
             return 0
 
@@ -208,7 +241,9 @@ class HomeCenter:
     def optimize_system(self):
         """Switch to Tweaks tab."""
         main_window = self.parent.winfo_toplevel()
-        if hasattr(main_window, 'tabview'):
+        if hasattr(main_window, 'select_tab'):
+            main_window.select_tab("Твики")
+        elif hasattr(main_window, 'tabview'):
             main_window.tabview.set("Твики")
 
     def clear_cache(self): # Removed parent argument
@@ -291,21 +326,16 @@ class HomeCenter:
             return f"{minutes} мин, {seconds} сек"
 
     def get_last_restore_point_date(self):
-        """Get the creation date of the last system restore point using subprocess with error handling."""
+        """Get the creation date of the last system restore point through the shared PowerShell worker."""
         try:
             powershell_command = r'Get-WmiObject -Class SystemRestore -Namespace root\default | Sort-Object CreationTime -Descending | Select-Object -First 1 CreationTime | ForEach-Object {$_.CreationTime}'
-            command = ['powershell.exe', '-Command', powershell_command]
-            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                       shell=False)  # shell=False for security
-            stdout, stderr = process.communicate()
-
-            if stderr:
-                error_message = stderr.decode('cp866',
-                                              errors='ignore').strip()  # Decode assuming CP866 or similar Windows encoding, adjust if needed
-                print(f"PowerShell Error: {error_message}")
+            result = run_powershell(powershell_command)
+
+            if result.errors:
+                print(f"PowerShell Error: {'; '.join(result.errors)}")
                 return None
 
-            stdout_str = stdout.decode('cp866', errors='ignore').strip()  # Decode assuming CP866, adjust if needed
+            stdout_str = result.text
 
             if not stdout_str:
                 return None
@@ -336,7 +366,9 @@ class HomeCenter:
     def go_to_tweak_page(self, category):
         """Navigates to the Tweaks tab and selects the specified category."""
         main_window = self.parent.winfo_toplevel()
-        if hasattr(main_window, 'tabview'):
+        if hasattr(main_window, 'select_tab'):
+            main_window.select_tab("Твики")
+        elif hasattr(main_window, 'tabview'):
             main_window.tabview.set("Твики")
             if hasattr(main_window, 'select_category_in_tweaks'):
                 main_window.select_category_in_tweaks(category)
@@ -346,14 +378,16 @@ class HomeCenter:
         recommendations = []
 
         try:
-            with open("tweak_analysis.json", "r", encoding='utf-8') as f:
-                analysis = json.load(f)
-                tweaks = analysis.get("tweaks", {})
+            tweaks = self.store.statuses()
 
             outdated_drivers_data = self.load_outdated_drivers_data()
             outdated_count = outdated_drivers_data.get("count", 0)
-            last_restore_date_str = self.get_last_restore_point_date()
-            restore_recommendation_needed = self.is_restore_point_recommendation_needed(last_restore_date_str)
+            # Дата точки восстановления запрашивается у PowerShell один раз и в фоне:
+            # до ответа рекомендация о точке восстановления не показывается
+            self._request_restore_point_date()
+            last_restore_date_str = self._restore_point_date
+            restore_recommendation_needed = (self._restore_point_checked and
+                                             self.is_restore_point_recommendation_needed(last_restore_date_str))
 
             if outdated_count > 0:
                 recommendations.append({
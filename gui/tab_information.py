@@ -11,12 +11,12 @@ import sys
 import webbrowser
 import psutil  # Import psutil for system info
 from gui.utils import resource_path
+from utils.lazy_import import lazy_import, module_available
 
-try:
-    import GPUtil # Import GPUtil for GPU info
-    GPU_AVAILABLE = True
-except ImportError:
-    GPU_AVAILABLE = False
+# GPUtil импортируется при первом запросе данных о видеокарте
+GPUtil = lazy_import("GPUtil")
+GPU_AVAILABLE = module_available("GPUtil")
+if not GPU_AVAILABLE:
     print("Warning: GPUtil library not found. GPU information will not be available.")
 
 from config import APP_VERSION
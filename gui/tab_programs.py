@@ -5,7 +5,6 @@ from tkinter import messagebox, ttk
 import requests
 import subprocess
 import zipfile
-import threading
 import re
 import winreg
 import sys
@@ -17,6 +16,8 @@ except ImportError:
     print("Error: CustomTkinter not found.  Please install it using: pip install customtkinter")
     sys.exit(1)
 
+from utils.executor import task_group
+
 
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
@@ -172,7 +173,7 @@ class Program:
         self.install_check_path = install_check_path
         self.install_check_command = install_check_command
         self.is_installed_cache = None
-        self.install_check_thread = None
+        self.install_check_future = None
         self.version = None
 
     def is_installed(self):
@@ -190,11 +191,9 @@ class Program:
         return self.is_installed_cache
 
     def start_install_check(self, callback):
-        if self.install_check_thread and self.install_check_thread.is_alive():
+        if self.install_check_future and not self.install_check_future.done():
             return
-        self.install_check_thread = threading.Thread(target=self._check_install_and_update, args=(callback,))
-        self.install_check_thread.daemon = True
-        self.install_check_thread.start()
+        self.install_check_future = task_group("programs").submit(self._check_install_and_update, callback)
 
     def _check_install_and_update(self, callback):
         is_installed = self.is_installed()
@@ -340,9 +339,7 @@ class ProgramsTab:
             self.download_button.bind("<Leave>", lambda e, b=self.download_button: b.configure(fg_color=self.accent_color))
 
     def start_download_thread(self, program, progress_bar):
-        download_thread = threading.Thread(target=self.download_program, args=(program, progress_bar))
-        download_thread.daemon = True
-        download_thread.start()
+        task_group("programs").submit(self.download_program, program, progress_bar)
 
     def download_program(self, program, progress_bar):
         """Downloads and installs the program."""
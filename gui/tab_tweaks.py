@@ -4,7 +4,7 @@ import sys
 import threading
 import tkinter as tk
 import asyncio
-import time
+from datetime import datetime
 
 try:
     import customtkinter as ctk
@@ -14,6 +14,12 @@ except ImportError:
 
 from config import TWEAK_CATEGORIES, TWEAKS
 from utils.system_tweaks import SystemTweaks
+from utils.registry_handler import RegistryHandler
+from utils.tweak_specs import default_probe_plan
+from utils.tweak_registry import get_tweak
+from utils.executor import task_group
+from utils.analysis_store import get_analysis_store
+from utils.tweak_jobs import get_job_queue, JOB_PROGRESS, JOB_FINISHED, JOB_FAILED, JOB_CANCELLED
 
 
 def load_settings(settings_file="settings.json"):
@@ -36,21 +42,13 @@ ctk.set_appearance_mode(settings.get("appearance_mode", "System"))
 ctk.set_default_color_theme(settings.get("theme", "blue"))
 
 
-def start_asyncio_loop(loop):
-    asyncio.set_event_loop(loop)
-    loop.run_forever()
-
-
-# Asyncio loop in a separate thread
-loop = asyncio.new_event_loop()
-threading.Thread(target=start_asyncio_loop, args=(loop,), daemon=True).start()
-
-
 class TweaksTab:
     def __init__(self, parent):
         # Add lazy initialization
         self.parent = parent
         self.initialized = False
+        # Фоновые задачи вкладки - в общем исполнителе, отменяются при закрытии вкладки
+        self.tasks = task_group("tweaks")
         self._initialize_basic_components()
         # Defer full initialization
         self.parent.after(100, self._initialize_full)
@@ -61,7 +59,9 @@ class TweaksTab:
         """Initialize only essential components for initial display"""
         # Basic cache and state variables
         self.tweak_cards = {}
-        self.status_cache = {}
+        # Статусы твиков - в общем хранилище анализа (его же читает главная вкладка)
+        self.store = get_analysis_store()
+        self._store_subscription = None
         self.search_cache = {}
         self.category_buttons = {}
         self.update_lock = threading.Lock()
@@ -113,6 +113,11 @@ class TweaksTab:
 
             # Initialize system tweaks
             self.system_tweaks = SystemTweaks()
+            self.registry = RegistryHandler()
+            # Переключение твиков выполняется в очереди заданий, события разбираются здесь через after
+            self._tweak_jobs = {}
+            get_job_queue().poll_with(self.parent, self._on_tweak_job_event)
+            self._store_subscription = self.store.subscribe_tk(self.parent, self._on_analysis_changes)
             self._init_progress = 20
 
             # Initialize analyzer with optimized settings
@@ -164,10 +169,7 @@ class TweaksTab:
     def _preload_analyzer_cache(self):
         """Предварительная загрузка кэша анализатора в фоновом режиме"""
         try:
-            threading.Thread(
-                target=self.analyzer.load_latest_analysis,
-                daemon=True
-            ).start()
+            self.tasks.submit(self.analyzer.load_latest_analysis)
         except Exception as e:
             print(f"Error preloading analyzer cache: {e}")
 
@@ -211,9 +213,11 @@ class TweaksTab:
 
     def _cleanup(self, event=None):
         """Clean up resources when tab is destroyed"""
+        self.tasks.cancel()
         # Clear caches
         self.search_cache.clear()
-        self.status_cache.clear()
+        if self._store_subscription is not None:
+            self.store.unsubscribe(self._store_subscription)
 
         # Clear UI elements
         for card in self.tweak_cards.values():
@@ -307,11 +311,10 @@ class TweaksTab:
     def _create_tweak_data(self, tweak_config):
         tweak_data = {"category": tweak_config["category"], "instance": None, "switch_ref": None}
         if tweak_config["class_name"]:
-            module_name = tweak_config.get("module", tweak_config["key"])
-            module = __import__(f"utils.tweaks.{module_name}", fromlist=[tweak_config["class_name"]])
-            tweak_class = getattr(module, tweak_config["class_name"])
-            tweak_data["instance"] = tweak_class()
-            tweak_data["check_status_func"] = tweak_data["instance"].check_status
+            # Общий экземпляр из реестра: те же объекты используют SystemTweaks и опрос статусов
+            instance = get_tweak(tweak_config["key"])
+            tweak_data["instance"] = instance
+            tweak_data["check_status_func"] = instance.check_status
         else:
             tweak_data["check_status_func"] = getattr(self.system_tweaks, f"check_{tweak_config['key']}_status", None)
         tweak_data["toggle_command"] = getattr(self, f"toggle_{tweak_config['key']}", None)
@@ -584,7 +587,7 @@ class TweaksTab:
                              self.system_tweaks.toggle_service_diagnostics)
 
     def _generic_toggle(self, tweak_key, enable_func, disable_func):
-        """Handles toggling a tweak with separate enable/disable functions."""
+        """Handles toggling a tweak with separate enable/disable functions (off the UI thread)."""
         switch_ref = self.tweaks[tweak_key]["switch_ref"]
         status_bar = self.parent.winfo_toplevel().dynamic_status
         tweak_instance = self.tweaks[tweak_key].get("instance")
@@ -597,26 +600,63 @@ class TweaksTab:
         # Determine the *intended* action based on the switch's *initial* state.
         initial_state = bool(switch_ref.get())  # True if switch is ON, False if OFF
 
+        running = self._tweak_jobs.get(tweak_key)
+        if running is not None:
+            # Повторный клик по твику, который ещё применяется: отмена, если твик её поддерживает
+            self.parent.after(0, switch_ref.select if not initial_state else switch_ref.deselect)
+            if getattr(tweak_instance, "cancellable", False):
+                running["job"].cancel()
+                status_bar.update_text(f"Отмена твика '{tweak_name}'...", duration=3000)
+            else:
+                status_bar.update_text(f"Твик '{tweak_name}' ещё применяется", duration=3000)
+            return
+
         # Call the appropriate function (enable or disable) based on the *initial* state.
         if initial_state:
             # Switch was initially ON, so the user intends to *disable*.
-            success = disable_func()
+            func = disable_func
             action = "включен"  # User intended to *disable*.
         else:
             # Switch was initially OFF, so the user intends to *enable*.
-            success = enable_func()
+            func = enable_func
             action = "выключен"  # User intended to *enable*.
 
-        if success:
+        job = get_job_queue().submit(tweak_key, func, label=tweak_name)
+        self._tweak_jobs[tweak_key] = {"job": job, "name": tweak_name, "action": action,
+                                       "initial_state": initial_state}
+        status_bar.update_text(f"Применение твика '{tweak_name}'...", duration=60000)
+
+    def _on_tweak_job_event(self, event):
+        """Tweak job events, delivered on the Tk thread by the job queue poller"""
+        info = self._tweak_jobs.get(event.key)
+        if not self.tweaks or info is None or info["job"].id != event.job_id:
+            return
+        status_bar = self.parent.winfo_toplevel().dynamic_status
+        tweak_name = info["name"]
+        if event.kind == JOB_PROGRESS:
+            progress = f" ({event.fraction:.0%})" if event.fraction is not None else ""
+            status_bar.update_text(f"{tweak_name}: {event.message}{progress}", duration=60000, immediate=True)
+            return
+        if event.kind not in (JOB_FINISHED, JOB_FAILED, JOB_CANCELLED):
+            return
+
+        del self._tweak_jobs[event.key]
+        switch_ref = self.tweaks[event.key]["switch_ref"]
+        action = info["action"]
+        if event.kind == JOB_FINISHED and event.result:
             status_bar.update_text(f"Твик '{tweak_name}' успешно {action}", duration=3000)
-            self.status_cache.pop(tweak_key, None)  # Invalidate cache
-            self._update_switch_status(tweak_key)  # Update UI from cache
+            self.store.invalidate(event.key)  # Invalidate cache
+            self._update_switch_status(event.key)  # Update UI from cache
+            return
+        if event.kind == JOB_CANCELLED:
+            status_bar.update_text(f"Применение твика '{tweak_name}' отменено", duration=3000)
         else:
             status_bar.update_text(
                 f"Ошибка при {'включении' if action == 'включен' else 'выключении'} твика '{tweak_name}'",
                 duration=4000)
-            # Correctly revert the switch based on the *initial* state.
-            self.parent.after(0, switch_ref.select if not initial_state else switch_ref.deselect)
+        # Correctly revert the switch based on the *initial* state.
+        if switch_ref and switch_ref.winfo_exists():
+            switch_ref.select() if info["initial_state"] else switch_ref.deselect()
 
     def setup_tweaks_page(self, category, search_term=""):
         # Add batch processing for better performance
@@ -684,6 +724,8 @@ class TweaksTab:
 
     def _update_switch_status(self, tweak_key):
         tweak_data = self.tweaks.get(tweak_key)
+        if tweak_key in getattr(self, "_tweak_jobs", {}):
+            return  # Твик ещё применяется - переключатель обновится по завершении задания
         if tweak_data and tweak_data.get("check_status_func"):
             switch = tweak_data["switch_ref"]
             if switch and switch.winfo_exists():
@@ -696,15 +738,26 @@ class TweaksTab:
                 except Exception as e:
                     print(f"Error during check_status_func for {tweak_key}: {e}")
 
+    def _on_analysis_changes(self, changes):
+        """Moves switches whose status changed elsewhere (analysis, presets), on the Tk thread"""
+        for tweak_key, status in changes.items():
+            tweak_data = self.tweaks.get(tweak_key) if self.tweaks else None
+            if status is None or tweak_data is None or tweak_key in self._tweak_jobs:
+                continue
+            switch = tweak_data.get("switch_ref")
+            if switch and switch.winfo_exists():
+                switch.select() if status.get("enabled") else switch.deselect()
+
     def _check_status_cached(self, tweak_key, check_status_func):
-        now = time.time()
-        if tweak_key in self.status_cache:
-            is_enabled, timestamp = self.status_cache[tweak_key]
-            if now - timestamp < 300:  # 5-minute cache
-                return is_enabled
+        generation = self.registry.cache_generation()
+        # Пока кэш реестра не видел изменений, статус остаётся верным (но не дольше 5 минут,
+        # твики служб и задач реестр не читают)
+        is_enabled = self.store.enabled(tweak_key, generation=generation, max_age=300)
+        if is_enabled is not None:
+            return is_enabled
         try:
             is_enabled = check_status_func()
-            self.status_cache[tweak_key] = (is_enabled, now)
+            self.store.set_status(tweak_key, is_enabled, generation)
             return is_enabled
         except Exception as e:
             print(f"Error checking status for {tweak_key}: {e}")
@@ -752,7 +805,7 @@ class TweaksTab:
 
         if search_term:
             self.is_searching = True
-            asyncio.run_coroutine_threadsafe(self.setup_tweaks_page_async(search_term=search_term), loop)
+            self.tasks.run_coroutine(self.setup_tweaks_page_async(search_term=search_term))
         else:
             self.is_searching = False
             self.show_category(self.current_category or "Оптимизация и настройки")
@@ -764,20 +817,56 @@ class TweaksTab:
     def update_status_manual(self):
         self.update_status(manual=True)
 
-    def analyze_tweaks(self):
-        """Analyze and save current tweak statuses"""
-        analysis = self.analyzer.collect_tweak_statuses(self.tweaks)
-        window = self.parent.winfo_toplevel()
-
-        if self.analyzer.save_analysis(analysis):
-            # Successfully saved without showing a message
-            pass
+    def analyze_tweaks(self, on_status=None):
+        """Analyzes tweak statuses in the background; returns the Future of run_analysis()"""
+        return self.tasks.submit(self.run_analysis, on_status)
+
+    def run_analysis(self, on_status=None):
+        """Collects and saves tweak statuses; every status reaches the analysis store as soon as it is known"""
+        generation = self.registry.cache_generation()
+
+        def publish(tweak_key, status):
+            fields = {name: value for name, value in status.items() if name not in ("enabled", "optimized")}
+            self.store.set_status(tweak_key, status["enabled"], generation, **fields)
+            if on_status is not None:
+                on_status(tweak_key, status)
+
+        # С работающим локальным агентом статусы берутся из его памяти, здесь проверяется только остальное
+        analysis = self._analysis_from_agent()
+        if analysis is not None:
+            for tweak_key, status in list(analysis["tweaks"].items()):
+                if tweak_key in self.tweaks:
+                    publish(tweak_key, status)
+            rest = {tweak_key: tweak_data for tweak_key, tweak_data in self.tweaks.items()
+                    if tweak_key not in analysis["tweaks"]}
+            if rest:
+                analysis["tweaks"].update(self.analyzer.collect_tweak_statuses(rest, on_status=publish)["tweaks"])
         else:
-            if hasattr(window, 'dynamic_status'):
-                window.dynamic_status.update_text(
-                    "Ошибка при сохранении анализа твиков",
-                    message_type="error"
-                )
+            analysis = self.analyzer.collect_tweak_statuses(self.tweaks, on_status=publish)
+        if self.analyzer.save_analysis(analysis):
+            return True
+        window = self.parent.winfo_toplevel()
+        if hasattr(window, 'dynamic_status'):
+            self.parent.after(0, lambda: window.dynamic_status.update_text(
+                "Ошибка при сохранении анализа твиков",
+                message_type="error"
+            ))
+        return False
+
+    def _analysis_from_agent(self):
+        """Statuses held by a running tweak agent, None when no agent answers"""
+        from utils.tweak_agent import AgentClient, AgentError
+        client = AgentClient.discover(timeout=30.0, connect_timeout=1.0)
+        if client is None:
+            return None
+        try:
+            result = client.call("status", max_age=60)
+        except (AgentError, OSError, ValueError) as e:
+            print(f"Error getting statuses from agent: {e}")
+            return None
+        finally:
+            client.close()
+        return {"timestamp": datetime.now().isoformat(), "tweaks": result["tweaks"], "agent_age": result["age"]}
 
     def update_status(self, manual=False):
         if not self.update_lock.acquire(blocking=False):
@@ -787,18 +876,27 @@ class TweaksTab:
 
         def update_in_thread():
             try:
-                for tweak_key, tweak_data in self.tweaks.items():
-                    if tweak_data.get("check_status_func"):
-                        try:
-                            self._check_status_cached(tweak_key, tweak_data["check_status_func"])  # Update cache
-                        except Exception:
-                            print(f"Error updating cache for {tweak_key}")
+                # Статусы декларативных твиков - одним планом проб по всем их значениям
+                generation = self.registry.cache_generation()
+                planned = default_probe_plan().evaluate(self.registry)
+                for tweak_key, is_enabled in planned.items():
+                    if tweak_key in self.tweaks:
+                        self.store.set_status(tweak_key, is_enabled, generation)
+
+                # Один сгруппированный проход по реестру на все остальные твики
+                with self.registry.prefetch(RegistryHandler.observed_reads()):
+                    for tweak_key, tweak_data in self.tweaks.items():
+                        if tweak_data.get("check_status_func"):
+                            try:
+                                self._check_status_cached(tweak_key, tweak_data["check_status_func"])  # Update cache
+                            except Exception:
+                                print(f"Error updating cache for {tweak_key}")
             finally:
                 self.update_lock.release()
                 if manual:
                     print("Statuses updated manually.")
 
-        threading.Thread(target=update_in_thread, daemon=True).start()
+        self.tasks.submit(update_in_thread)
 
     def on_visibility_change(self, event):
         if event.widget == self.parent:
@@ -830,7 +928,7 @@ class TweaksTab:
                     self._update_switch_status(tweak_key)
                 await asyncio.sleep(0.1)  # Small delay between batches
 
-        asyncio.run_coroutine_threadsafe(batch_update(), loop)
+        self.tasks.run_coroutine(batch_update())
         self.parent.after(UPDATE_INTERVAL, self._schedule_ui_update)
 
 
@@ -4,6 +4,12 @@ import ctypes
 import platform
 import json
 import logging
+
+# python main.py --headless <команда>: консольный режим (asx.py) без окна и без customtkinter
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    import asx
+    sys.exit(asx.main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+
 import tkinter as tk
 
 try:
@@ -13,15 +19,21 @@ except ImportError:
     sys.exit(1)
 
 from gui.tab_tweaks import TweaksTab
-from gui.tab_programs import ProgramsTab
-from gui.tab_utilities import UtilitiesTab
-from gui.tab_drivers import DriverTab
-from gui.tab_WebResources import WebResourcesTab
-from gui.tab_information import InformationTab
-from gui.tab_settings import SettingsTab
 from gui.tab_home import HomeCenter  # Import the HomeCenter class
+from gui.lazy_tabs import LazyTabs
 
 from config import APP_VERSION
+from utils.executor import get_executor
+from utils.lazy_import import lazy_import
+from utils.startup_timeline import get_startup_timeline, FIRST_PAINT, INTERACTIVE, ANALYSIS_DONE
+
+# Модули вкладок, которые не нужны до их первого открытия, импортируются вместе с ними
+tab_programs = lazy_import("gui.tab_programs")
+tab_utilities = lazy_import("gui.tab_utilities")
+tab_drivers = lazy_import("gui.tab_drivers")
+tab_web_resources = lazy_import("gui.tab_WebResources")
+tab_information = lazy_import("gui.tab_information")
+tab_settings = lazy_import("gui.tab_settings")
 
 # Настройка логирования
 logging.basicConfig(
@@ -357,25 +369,6 @@ def update_status(message, message_type="info", duration=3000,
         _status_bar_instance.update_text(message, message_type, duration, animate, immediate, animate_icon)
 
 
-class LoadingInterface(ctk.CTkFrame):
-    """
-    Интерфейс загрузки, который отображается поверх основного окна
-    до завершения инициализации всех вкладок.
-    """
-    def __init__(self, master, **kwargs):
-        super().__init__(master, **kwargs)
-        # Можно задать цвет фона, соответствующий теме приложения
-        self.configure(fg_color=master.cget("fg_color"))
-        self.place(relx=0, rely=0, relwidth=1, relheight=1)
-
-        self.label = ctk.CTkLabel(self, text="Загрузка...", font=("Helvetica", 24))
-        self.label.pack(expand=True)
-
-        self.progressbar = ctk.CTkProgressBar(self, mode="indeterminate")
-        self.progressbar.pack(padx=20, pady=20)
-        self.progressbar.start()
-
-
 class ASXHub(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -393,10 +386,6 @@ class ASXHub(ctk.CTk):
         # Создаём TabView для категорий (но пока не упаковываем)
         self.tabview = ctk.CTkTabview(self.main_container)
 
-        # Создаём оверлей загрузки
-        self.loading_interface = LoadingInterface(self.main_container)
-        self.loading_interface.lift()  # Поднимаем поверх всех виджетов
-
         # Создаём статусбар, но пока не упаковываем
         default_status = f"ASX Hub v{APP_VERSION} | {'Администратор' if is_admin() else 'Обычный пользователь'}"
         self.dynamic_status = DynamicStatusBar(self.main_container, default_text=default_status, height=25)
@@ -405,60 +394,106 @@ class ASXHub(ctk.CTk):
         self.tabview.pack(fill="both", expand=True, pady=(0, 6))
         self.dynamic_status.pack(fill="x", side="bottom")
 
-        # Обновляем окно, чтобы отобразить загрузочный экран
-        self.update()
-
-        # Создаём вкладку твиков (нужна для анализа)
-        self.tab_tweaks = self.tabview.add("Твики")
-        self.tweaks_tab = TweaksTab(self.tab_tweaks)
-
         # Устанавливаем глобальный экземпляр статусбара
         set_status_bar_instance(self.dynamic_status)
 
-        # Запускаем анализ твиков
-        self.after(150, self._run_analysis_and_initialize)
+        # Кнопки всех вкладок появляются сразу, а содержимое вкладки строится при первом её
+        # выборе: драйверы (pnputil), программы (проверки установки) и т.п. не запускаются,
+        # пока их не открыли. Статичные вкладки достраиваются в простое.
+        self.timeline = get_startup_timeline()
+        self.tabs = LazyTabs(self.tabview)
+        self.tabs.register("Твики", TweaksTab)
+        self.tabs.register("Главная", HomeCenter)
+        self.tabs.register("Программы", lambda frame: tab_programs.ProgramsTab(frame))
+        self.tabs.register("Утилиты", lambda frame: tab_utilities.UtilitiesTab(frame))
+        self.tabs.register("Драйвера", lambda frame: tab_drivers.DriverTab(frame, self.dynamic_status))
+        self.tabs.register("Веб-ресурсы", lambda frame: tab_web_resources.WebResourcesTab(frame), prewarm=True)
+        self.tabs.register("Информация", lambda frame: tab_information.InformationTab(frame), prewarm=True)
+        self.tabs.register("Настройки", lambda frame: tab_settings.SettingsTab(frame), prewarm=True)
+        self.tabview.set("Главная")
 
-    def _run_analysis_and_initialize(self):
-        """Выполняет анализ твиков и затем инициализирует остальной UI"""
+        # Твики строятся всегда - они нужны анализу; затем активная вкладка
+        self._startup_stages = [self._build_tweaks_tab, lambda: self.tabs.ensure(self.tabview.get())]
+        self._analysis_future = None
+        self._analysis_seen = set()  # ключи твиков, статус которых уже получен
+        self._analysis_shown_count = -1
+
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after_idle(self._on_first_paint)
+
+    def on_close(self):
+        """Отменяет фоновые задачи и закрывает окно"""
+        get_executor().shutdown()
+        self.destroy()
+
+    def _on_first_paint(self):
+        """Окно с пустыми вкладками отрисовано - дальше этапы запуска"""
+        self.timeline.mark(FIRST_PAINT)
+        self.after(1, self._run_next_stage)
+
+    def _run_next_stage(self):
+        """Строит следующую вкладку и отдаёт управление циклу событий"""
+        if not self._startup_stages:
+            self._wait_interactive()
+            return
+        stage = self._startup_stages.pop(0)
         try:
-            # Сначала выполняем анализ твиков
-            self.tweaks_tab.analyze_tweaks()
-
-            # После завершения анализа инициализируем остальной UI
-            self._initialize_full_ui()
-
-        finally:
-            # Уничтожаем экран загрузки
-            if hasattr(self, 'loading_interface') and self.loading_interface:
-                self.loading_interface.destroy()
-                self.loading_interface = None
-
-    def _initialize_full_ui(self):
-        """Инициализация полного UI после завершения анализа твиков"""
-        # Добавляем вкладки в правильном порядке
-        self.tab_home = self.tabview.add("Главная")  # Главная вкладка первая
-        self.tab_programs = self.tabview.add("Программы")
-        self.tab_utilities = self.tabview.add("Утилиты")
-        self.tab_drivers = self.tabview.add("Драйвера")
-        self.tab_web = self.tabview.add("Веб-ресурсы")
-        self.tab_info = self.tabview.add("Информация")
-        self.tab_settings = self.tabview.add("Настройки")
-
-        # Инициализируем вкладки
-        self.home_tab = HomeCenter(self.tab_home)
-        self.driver_tab = DriverTab(self.tab_drivers, self.dynamic_status)
-        self.programs_tab = ProgramsTab(self.tab_programs)
-        self.utilities_tab = UtilitiesTab(self.tab_utilities)
-        self.settings_tab = SettingsTab(self.tab_settings)
-        self.web_resources_tab = WebResourcesTab(self.tab_web)
-        self.information_tab = InformationTab(self.tab_info)
-
-        # Устанавливаем "Главная" как активную вкладку
-        self.tabview.set("Главная")
+            stage()
+        except Exception as e:
+            logging.error(f"Startup stage failed: {e}")
+        self.after(1, self._run_next_stage)
+
+    def _build_tweaks_tab(self):
+        self.tweaks_tab = self.tabs.ensure("Твики")
+        self._start_analysis()
+
+    def select_tab(self, name):
+        """Переключает вкладку, при необходимости строя её"""
+        return self.tabs.select(name)
 
-        # Обновляем статус
-        self.dynamic_status.update_text("Добро пожаловать в ASX Hub!", duration=3000)
+    def _wait_interactive(self):
+        # Вкладка твиков достраивает себя через after - ждём её готовности
+        if not self.tweaks_tab.initialized:
+            self.after(50, self._wait_interactive)
+            return
+        self.timeline.mark(INTERACTIVE)
+        self._log_timeline_when_complete()
+        self.tabs.prewarm_when_idle()
+
+    def _start_analysis(self):
+        """Запускает анализ твиков в фоне, как только вкладка твиков инициализирована"""
+        if not self.tweaks_tab.initialized:
+            self.after(50, self._start_analysis)
+            return
+        self._analysis_future = self.tweaks_tab.analyze_tweaks(on_status=self._on_analysis_status)
+        self._poll_analysis()
+
+    def _on_analysis_status(self, tweak_key, status):
+        # Вызывается из потоков анализа; интерфейс обновляет _poll_analysis
+        self._analysis_seen.add(tweak_key)
+
+    def _poll_analysis(self):
+        """Показывает ход анализа в статус-баре и отмечает его завершение"""
+        total = sum(1 for tweak_data in self.tweaks_tab.tweaks.values() if tweak_data.get("check_status_func"))
+        if not self._analysis_future.done():
+            done = len(self._analysis_seen)
+            if done != self._analysis_shown_count:
+                self._analysis_shown_count = done
+                self.dynamic_status.update_text(f"Анализ твиков: {done}/{total}",
+                                                duration=60000, animate=False, immediate=True)
+            self.after(100, self._poll_analysis)
+            return
+        self.timeline.mark(ANALYSIS_DONE)
+        try:
+            self._analysis_future.result()
+        except Exception as e:
+            logging.error(f"Tweak analysis failed: {e}")
+        self.dynamic_status.update_text("Добро пожаловать в ASX Hub!", duration=3000, immediate=True)
+        self._log_timeline_when_complete()
 
+    def _log_timeline_when_complete(self):
+        if self.timeline.has(FIRST_PAINT, INTERACTIVE, ANALYSIS_DONE):
+            self.timeline.log()
 
     def load_and_apply_settings(self):
         """Загружает настройки и применяет их, корректно обрабатывая режим 'System'."""
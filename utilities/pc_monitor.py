@@ -4,7 +4,7 @@ import psutil
 import tkinter as tk
 from datetime import datetime
 import cpuinfo
-import threading # Импорт модуля threading
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import customtkinter as ctk
@@ -62,6 +62,7 @@ class PCInfoViewer:
     def __init__(self, master):
         # ... (остальная часть __init__ остается без изменений до self.update_info())
         self.master = master
+        self.pool = None  # пул потоков для обновления секций, создаётся при первом обновлении
         self.master.title("Информация о ПК")
         ctk.set_appearance_mode("Dark")
         ctk.set_default_color_theme("dark-blue")
@@ -283,20 +284,15 @@ class PCInfoViewer:
             self.info_labels[key].configure(text=value if value else "N/A")
 
     def update_info(self):
-        # Запускаем обновление каждой секции в отдельном потоке
-        threads = [
-            threading.Thread(target=self.update_system_info_thread),
-            threading.Thread(target=self.update_cpu_info_thread),
-            threading.Thread(target=self.update_memory_info_thread),
-            threading.Thread(target=self.update_swap_info_thread),
-            threading.Thread(target=self.update_disk_info_thread),
-            threading.Thread(target=self.update_network_info_thread),
-            threading.Thread(target=self.update_gpu_info_thread),
-            threading.Thread(target=self.update_battery_info_thread),
-            threading.Thread(target=self.update_users_info_thread)
-        ]
-        for thread in threads:
-            thread.start()
+        # Секции обновляются в одном пуле потоков, а не в новых потоках на каждое обновление
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pc-monitor")
+        for update in (self.update_system_info_thread, self.update_cpu_info_thread,
+                       self.update_memory_info_thread, self.update_swap_info_thread,
+                       self.update_disk_info_thread, self.update_network_info_thread,
+                       self.update_gpu_info_thread, self.update_battery_info_thread,
+                       self.update_users_info_thread):
+            self.pool.submit(update)
 
 
     def update_system_info_thread(self):
@@ -0,0 +1,287 @@
+"""
+Общее хранилище результатов анализа твиков.
+
+Статусы живут в памяти процесса: анализатор заменяет анализ целиком, вкладка твиков
+обновляет отдельные твики после проверок и переключений. Подписчики (шкала оптимизации
+и рекомендации на главной, переключатели твиков) получают только изменившиеся твики.
+tweak_analysis.json лежит рядом с программой (не в текущем каталоге), читается один раз
+при холодном старте, а записывается в фоне: изменения за debounce секунд уходят на диск
+одной атомарной записью.
+"""
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import itertools
+import tempfile
+import threading
+from typing import Optional, Any, Callable, Dict, Iterable, Tuple
+
+# ключ твика -> новый статус (None - твик удалён из анализа)
+AnalysisChanges = Dict[str, Optional[Dict[str, Any]]]
+
+# Поля статуса, изменение которых видят подписчики
+_TRACKED_FIELDS = ("enabled", "optimized")
+
+
+def _default_path() -> str:
+    """tweak_analysis.json in the app directory (next to the exe in a PyInstaller build)"""
+    if getattr(sys, "frozen", False):
+        app_dir = os.path.dirname(sys.executable)
+    else:
+        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(app_dir, "tweak_analysis.json")
+
+
+def _optimized_state(tweak_key: str) -> bool:
+    from config import TWEAKS
+    for tweak in TWEAKS:
+        if tweak["key"] == tweak_key:
+            return tweak.get("optimized_state", True)
+    return True
+
+
+class AnalysisStore:
+    """Process-wide tweak analysis kept in memory, with change subscriptions and debounced persistence"""
+
+    def __init__(self, path: str = "tweak_analysis.json", debounce: float = 1.0):
+        self.path = path
+        self.debounce = debounce
+        self.lock = threading.RLock()
+        # Запись на диск целиком под отдельной блокировкой: иначе flush по таймеру и явный
+        # flush() могли бы пересечься, и старый снимок перезаписал бы новый файл
+        self._write_lock = threading.Lock()
+        self._analysis: Optional[Dict[str, Any]] = None
+        self._loaded = False
+        # Когда и при каком поколении кэша реестра статус проверялся в этом процессе (на диск не пишется)
+        self._checked: Dict[str, Tuple[float, int]] = {}
+        self._subscribers: Dict[int, Tuple[Callable[[AnalysisChanges], None], Optional[frozenset]]] = {}
+        self._ids = itertools.count(1)
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+        self.loads = 0
+        self.saves = 0
+
+    # --- чтение ---
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self.lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._analysis = json.load(f)
+                self.loads += 1
+            except FileNotFoundError:
+                self._analysis = None
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"Error loading analysis: {e}")
+                self._analysis = None
+
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        """Copy of the whole analysis, None before the first one"""
+        self._ensure_loaded()
+        with self.lock:
+            return copy.deepcopy(self._analysis) if self._analysis is not None else None
+
+    def statuses(self) -> Dict[str, Dict[str, Any]]:
+        """tweak key -> status dict (copies)"""
+        self._ensure_loaded()
+        with self.lock:
+            tweaks = (self._analysis or {}).get("tweaks", {})
+            return {tweak_key: dict(status) for tweak_key, status in tweaks.items()}
+
+    def status(self, tweak_key: str) -> Optional[Dict[str, Any]]:
+        self._ensure_loaded()
+        with self.lock:
+            status = (self._analysis or {}).get("tweaks", {}).get(tweak_key)
+            return dict(status) if status is not None else None
+
+    def enabled(self, tweak_key: str, generation: Optional[int] = None, max_age: Optional[float] = None) -> Optional[bool]:
+        """
+        Status checked in this process, or None when it has to be checked again: never
+        checked, invalidated, older than max_age or taken at another registry cache generation.
+        """
+        with self.lock:
+            checked = self._checked.get(tweak_key)
+            if checked is None:
+                return None
+            checked_at, checked_generation = checked
+            if generation is not None and checked_generation != generation:
+                return None
+            if max_age is not None and time.time() - checked_at >= max_age:
+                return None
+            status = (self._analysis or {}).get("tweaks", {}).get(tweak_key)
+            return status.get("enabled") if status is not None else None
+
+    # --- изменение ---
+
+    def replace(self, analysis: Dict[str, Any], generation: int = 0):
+        """Installs a complete analysis (from TweakAnalyzer) and notifies about changed tweaks"""
+        self._ensure_loaded()
+        analysis = copy.deepcopy(analysis)
+        now = time.time()
+        with self.lock:
+            old = (self._analysis or {}).get("tweaks", {})
+            new = analysis.get("tweaks", {})
+            self._analysis = analysis
+            self._checked = {tweak_key: (now, generation) for tweak_key in new}
+            changes: AnalysisChanges = {tweak_key: dict(status) for tweak_key, status in new.items()
+                                        if self._differs(old.get(tweak_key), status)}
+            changes.update({tweak_key: None for tweak_key in old if tweak_key not in new})
+            self._schedule_save()
+        self._publish(changes)
+
+    def set_status(self, tweak_key: str, enabled: bool, generation: int = 0, **fields):
+        """Records a fresh check of one tweak; subscribers hear about it if enabled/optimized changed"""
+        self._ensure_loaded()
+        with self.lock:
+            if self._analysis is None:
+                self._analysis = {"timestamp": None, "tweaks": {}}
+            tweaks = self._analysis.setdefault("tweaks", {})
+            old = tweaks.get(tweak_key)
+            status = dict(old or {"category": fields.get("category", "Unknown"), "title": tweak_key})
+            status.update(fields)
+            status["enabled"] = enabled
+            status["optimized"] = enabled == _optimized_state(tweak_key)
+            status.pop("reused", None)
+            tweaks[tweak_key] = status
+            self._checked[tweak_key] = (time.time(), generation)
+            changed = self._differs(old, status)
+            if changed:
+                self._schedule_save()
+        if changed:
+            self._publish({tweak_key: dict(status)})
+
+    def invalidate(self, tweak_key: Optional[str] = None):
+        """Forces the next enabled() for the tweak (or all tweaks) to return None"""
+        with self.lock:
+            if tweak_key is None:
+                self._checked.clear()
+            else:
+                self._checked.pop(tweak_key, None)
+
+    @staticmethod
+    def _differs(old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> bool:
+        if old is None or new is None:
+            return old is not new
+        return any(old.get(name) != new.get(name) for name in _TRACKED_FIELDS)
+
+    # --- подписки ---
+
+    def subscribe(self, callback: Callable[[AnalysisChanges], None], keys: Optional[Iterable[str]] = None) -> int:
+        """
+        Calls callback(changes) after every change that touches the given tweaks (all tweaks
+        by default). The callback runs on the thread that made the change.
+        """
+        with self.lock:
+            token = next(self._ids)
+            self._subscribers[token] = (callback, frozenset(keys) if keys is not None else None)
+            return token
+
+    def subscribe_tk(self, widget, callback: Callable[[AnalysisChanges], None],
+                     keys: Optional[Iterable[str]] = None, interval: int = 100) -> int:
+        """subscribe() whose callback runs on the Tk thread, polled with widget.after"""
+        pending: "queue.Queue[AnalysisChanges]" = queue.Queue()
+        token = self.subscribe(pending.put, keys)
+
+        def poll():
+            merged: AnalysisChanges = {}
+            while True:
+                try:
+                    merged.update(pending.get_nowait())
+                except queue.Empty:
+                    break
+            if merged:
+                try:
+                    callback(merged)
+                except Exception as e:
+                    print(f"Error handling analysis change: {e}")
+            try:
+                widget.after(interval, poll)
+            except Exception:
+                self.unsubscribe(token)  # виджет уничтожен
+
+        widget.after(interval, poll)
+        return token
+
+    def unsubscribe(self, token: int):
+        with self.lock:
+            self._subscribers.pop(token, None)
+
+    def _publish(self, changes: AnalysisChanges):
+        if not changes:
+            return
+        with self.lock:
+            subscribers = list(self._subscribers.values())
+        for callback, keys in subscribers:
+            selected = changes if keys is None else {k: v for k, v in changes.items() if k in keys}
+            if not selected:
+                continue
+            try:
+                callback(selected)
+            except Exception as e:
+                print(f"Error in analysis subscriber: {e}")
+
+    # --- сохранение ---
+
+    def _schedule_save(self):
+        # Вызывается под self.lock; уже запланированная запись заберёт и это изменение
+        self._dirty = True
+        if self._save_timer is None:
+            self._save_timer = threading.Timer(self.debounce, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self) -> bool:
+        """Writes pending changes to disk now"""
+        with self._write_lock:
+            with self.lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty or self._analysis is None:
+                    return True
+                data = json.dumps(self._analysis, indent=4, ensure_ascii=False)
+                self._dirty = False
+            directory = os.path.dirname(os.path.abspath(self.path))
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        f.write(data)
+                    os.replace(tmp_path, self.path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                self.saves += 1
+                return True
+            except OSError as e:
+                print(f"Error saving analysis: {e}")
+                with self.lock:
+                    self._dirty = True
+                return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"tweaks": len((self._analysis or {}).get("tweaks", {})), "subscribers": len(self._subscribers),
+                    "loads": self.loads, "saves": self.saves, "dirty": self._dirty}
+
+
+_store: Optional[AnalysisStore] = None
+_store_lock = threading.Lock()
+
+
+def get_analysis_store() -> AnalysisStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = AnalysisStore(_default_path())
+            atexit.register(_store.flush)
+        return _store
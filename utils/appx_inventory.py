@@ -0,0 +1,177 @@
+"""
+Кэш установленных Appx-пакетов для твиков виджетов и UWP.
+
+Пакеты перечисляются одним запросом Get-AppxPackage через общий процесс PowerShell,
+шаблоны сопоставляются в памяти. Результат (вместе с результатами поиска файлов в
+WindowsApps) сохраняется на диск и считается актуальным, пока не изменились время
+изменения папки WindowsApps и ключи репозитория пакетов в реестре.
+"""
+import os
+import json
+import fnmatch
+import threading
+from typing import Optional, Any, Dict, List
+
+from utils.registry_handler import RegistryHandler
+from utils.powershell_host import run_powershell, PowerShellError
+
+# Ключи, которые меняются при установке/удалении пакетов
+PACKAGE_REPOSITORY_KEYS = [
+    r"HKCU\Software\Classes\Local Settings\Software\Microsoft\Windows\CurrentVersion\AppModel\Repository\Packages",
+    r"HKLM\SOFTWARE\Microsoft\Windows\CurrentVersion\Appx\AppxAllUserStore\Applications",
+    r"HKLM\SOFTWARE\Microsoft\Windows\CurrentVersion\Appx\AppxAllUserStore\Deprovisioned",
+]
+
+_PACKAGES_SCRIPT = (
+    "@(Get-AppxPackage | Select-Object Name, PackageFullName, InstallLocation) | ConvertTo-Json -Compress"
+)
+
+
+def _default_cache_file() -> str:
+    app_data_dir = os.getenv('APPDATA') or os.path.expanduser("~")
+    return os.path.join(app_data_dir, "ASX-Hub", "Cache", "appx_inventory.json")
+
+
+def _windows_apps_dir() -> Optional[str]:
+    program_files = os.getenv("ProgramFiles")
+    return os.path.join(program_files, "WindowsApps") if program_files else None
+
+
+class AppxInventory:
+    """Installed Appx packages, enumerated once per change of the package repository"""
+
+    def __init__(self, registry: Optional[RegistryHandler] = None, cache_file: Optional[str] = None):
+        self.registry = registry or RegistryHandler()
+        self.cache_file = cache_file or _default_cache_file()
+        self.lock = threading.Lock()
+        self._fingerprint: Optional[List[Any]] = None
+        self._packages: Optional[List[Dict[str, str]]] = None
+        self._files: Dict[str, bool] = {}  # имя файла в нижнем регистре -> найден в WindowsApps
+        self._loaded_from_disk = False
+        self.enumerations = 0
+        self.walks = 0
+
+    def fingerprint(self) -> List[Any]:
+        """WindowsApps mtime plus the last write times of the package repository keys"""
+        windows_apps = _windows_apps_dir()
+        try:
+            mtime = os.stat(windows_apps).st_mtime_ns if windows_apps else None
+        except OSError:
+            mtime = None
+        return [mtime] + [self.registry.key_fingerprint(key_path) for key_path in PACKAGE_REPOSITORY_KEYS]
+
+    # --- кэш ---
+
+    def _load_from_disk(self):
+        self._loaded_from_disk = True
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        fingerprint = data.get("fingerprint")
+        # Без известных составляющих отпечатка сохранённым данным нельзя доверять
+        if not fingerprint or all(part is None for part in fingerprint):
+            return
+        self._fingerprint = fingerprint
+        self._packages = data.get("packages")
+        self._files = data.get("files", {})
+
+    def _save_to_disk(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            temp_file = f"{self.cache_file}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"fingerprint": self._fingerprint, "packages": self._packages, "files": self._files}, f)
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            print(f"Error saving Appx inventory: {e}")
+
+    def _ensure_fresh(self):
+        """Drops the cached data when the package repository has changed"""
+        if not self._loaded_from_disk:
+            self._load_from_disk()
+        fingerprint = self.fingerprint()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self._packages = None
+            self._files = {}
+
+    def invalidate(self):
+        """Forgets everything, e.g. after packages were removed"""
+        with self.lock:
+            self._fingerprint = None
+            self._packages = None
+            self._files = {}
+            self._loaded_from_disk = True
+
+    # --- запросы ---
+
+    def packages(self) -> List[Dict[str, str]]:
+        """[{Name, PackageFullName, InstallLocation}]; raises PowerShellError when the query fails"""
+        with self.lock:
+            self._ensure_fresh()
+            if self._packages is None:
+                result = run_powershell(_PACKAGES_SCRIPT, timeout=60.0)
+                if not result.ok:
+                    raise PowerShellError("; ".join(result.errors))
+                packages = json.loads(result.text) if result.text else []
+                # ConvertTo-Json разворачивает массив из одного элемента в объект
+                self._packages = [packages] if isinstance(packages, dict) else packages
+                self.enumerations += 1
+                self._save_to_disk()
+            return list(self._packages)
+
+    def find(self, pattern: str) -> List[Dict[str, str]]:
+        """Packages whose Name matches a Get-AppxPackage style wildcard pattern"""
+        pattern = pattern.lower()
+        return [package for package in self.packages()
+                if fnmatch.fnmatchcase((package.get("Name") or "").lower(), pattern)]
+
+    def first_match(self, patterns: List[str]) -> Optional[str]:
+        """The first pattern that matches an installed package, None when none does"""
+        for pattern in patterns:
+            if self.find(pattern):
+                return pattern
+        return None
+
+    def has_file(self, file_name: str) -> bool:
+        """Whether a file with this name exists anywhere under WindowsApps (cached walk)"""
+        key = file_name.lower()
+        with self.lock:
+            self._ensure_fresh()
+            if key not in self._files:
+                self._files[key] = self._walk_for(key)
+                self.walks += 1
+                self._save_to_disk()
+            return self._files[key]
+
+    @staticmethod
+    def _walk_for(file_name: str) -> bool:
+        windows_apps = _windows_apps_dir()
+        if not windows_apps or not os.path.exists(windows_apps):
+            return False
+        for root, dirs, files in os.walk(windows_apps):
+            if any(name.lower() == file_name for name in files):
+                return True
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "packages": len(self._packages or []),
+                "enumerations": self.enumerations,
+                "walks": self.walks,
+            }
+
+
+_inventory: Optional[AppxInventory] = None
+_inventory_lock = threading.Lock()
+
+
+def get_appx_inventory() -> AppxInventory:
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = AppxInventory()
+        return _inventory
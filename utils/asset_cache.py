@@ -0,0 +1,289 @@
+"""
+Кэш скачиваемых файлов твиков (профили Nvidia, план питания, hosts).
+
+Содержимое хранится по sha256 в %APPDATA%/ASX-Hub/Cache/Assets/blobs, манифест
+manifest.json связывает URL с хэшем, ETag, Last-Modified и размером. Повторная загрузка
+идёт условным запросом: на 304 отдаётся уже скачанная копия. Файлы пишутся во временный
+файл и переименовываются, хэш проверяется перед использованием. В офлайн-режиме
+(ASX_HUB_OFFLINE=1) и при ошибке сети отдаётся закэшированная копия.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+from dataclasses import dataclass, asdict
+from typing import Optional, Callable, Dict, Tuple
+
+from utils.lazy_import import lazy_import
+
+# requests импортируется при первой загрузке, а не при импорте твиков
+requests = lazy_import("requests")
+
+CHUNK_SIZE = 64 * 1024
+# Сколько секунд твики используют закэшированный файл без запроса к серверу
+ASSET_MAX_AGE = 24 * 60 * 60
+
+
+class AssetUnavailable(Exception):
+    """Raised when an asset can be neither downloaded nor served from the cache"""
+
+
+@dataclass
+class AssetRecord:
+    url: str
+    sha256: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0  # время последней проверки на сервере
+
+
+def _default_cache_dir() -> str:
+    app_data_dir = os.getenv('APPDATA') or os.path.expanduser("~")
+    return os.path.join(app_data_dir, "ASX-Hub", "Cache", "Assets")
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetCache:
+    """Content-addressed download cache with conditional revalidation and offline mode"""
+
+    def __init__(self, cache_dir: Optional[str] = None, offline: Optional[bool] = None, timeout: float = 30.0):
+        self.cache_dir = cache_dir or _default_cache_dir()
+        self.blob_dir = os.path.join(self.cache_dir, "blobs")
+        self.manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        if offline is None:
+            offline = os.getenv("ASX_HUB_OFFLINE", "") not in ("", "0")
+        self.offline = offline
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._url_locks: Dict[str, threading.Lock] = {}
+        self._records: Optional[Dict[str, AssetRecord]] = None
+        # (путь, mtime_ns, размер) блобов, хэш которых уже сверен
+        self._verified: Dict[str, Tuple[int, int]] = {}
+        self.hits = 0
+        self.revalidated = 0
+        self.downloads = 0
+        self.bytes_downloaded = 0
+        self.offline_hits = 0
+
+    # --- манифест ---
+
+    def _load_records(self) -> Dict[str, AssetRecord]:
+        if self._records is None:
+            records = {}
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    for url, data in json.load(f).items():
+                        records[url] = AssetRecord(url=url, **{k: v for k, v in data.items() if k != "url"})
+            except (OSError, ValueError, TypeError) as e:
+                if os.path.exists(self.manifest_path):
+                    print(f"Error reading asset manifest, starting empty: {e}")
+            self._records = records
+        return self._records
+
+    def _save_records(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data = {url: {k: v for k, v in asdict(record).items() if k != "url"}
+                for url, record in self._records.items()}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"Error writing asset manifest: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def record(self, url: str) -> Optional[AssetRecord]:
+        with self.lock:
+            return self._load_records().get(url)
+
+    def _url_lock(self, url: str) -> threading.Lock:
+        with self.lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    # --- блобы ---
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, sha256)
+
+    def _valid_blob(self, record: AssetRecord) -> Optional[str]:
+        """Path of the record's blob if it exists and matches its sha256"""
+        path = self.blob_path(record.sha256)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size != record.size:
+            return None
+        if self._verified.get(path) == (stat.st_mtime_ns, stat.st_size):
+            return path
+        if _sha256_file(path) != record.sha256:
+            print(f"Cached asset {record.url} is corrupted, dropping it")
+            os.remove(path)
+            return None
+        self._verified[path] = (stat.st_mtime_ns, stat.st_size)
+        return path
+
+    def _download(self, url: str, record: Optional[AssetRecord],
+                  progress: Optional[Callable[[int, int], None]]) -> Tuple[AssetRecord, bool]:
+        """Conditional GET; returns the (new or revalidated) record and whether a body was transferred"""
+        headers = {}
+        if record is not None:
+            if record.etag:
+                headers["If-None-Match"] = record.etag
+            if record.last_modified:
+                headers["If-Modified-Since"] = record.last_modified
+
+        with requests.get(url, headers=headers, stream=True, allow_redirects=True, timeout=self.timeout) as response:
+            if response.status_code == 304 and record is not None:
+                record.fetched_at = time.time()
+                return record, False
+            response.raise_for_status()
+            # При сжатии content-length - размер сжатого тела, сверять с ним нельзя
+            total = 0 if response.headers.get("content-encoding") else int(response.headers.get("content-length") or 0)
+            os.makedirs(self.blob_dir, exist_ok=True)
+            digest = hashlib.sha256()
+            received = 0
+            # Пишем во временный файл рядом с блобами, чтобы os.replace был атомарным
+            fd, tmp_path = tempfile.mkstemp(dir=self.blob_dir, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        received += len(chunk)
+                        if progress is not None:
+                            progress(received, total)
+                if total and received != total:
+                    raise AssetUnavailable(f"Incomplete download of {url}: {received} of {total} bytes")
+                sha256 = digest.hexdigest()
+                os.replace(tmp_path, self.blob_path(sha256))
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            new_record = AssetRecord(url=url, sha256=sha256, size=received,
+                                     etag=response.headers.get("ETag"),
+                                     last_modified=response.headers.get("Last-Modified"),
+                                     fetched_at=time.time())
+            self.bytes_downloaded += received
+            return new_record, True
+
+    # --- публичный интерфейс ---
+
+    def fetch(self, url: str, dest: Optional[str] = None, max_age: Optional[float] = None,
+              progress: Optional[Callable[[int, int], None]] = None) -> str:
+        """
+        Path of the verified asset (copied to dest when given).
+
+        max_age - seconds during which a cached copy is used without asking the server;
+        progress(received, total) is called per chunk and may raise to abort the download.
+        """
+        with self._url_lock(url):
+            record = self.record(url)
+            cached = self._valid_blob(record) if record is not None else None
+
+            if cached is not None and (self.offline or
+                                       (max_age is not None and time.time() - record.fetched_at < max_age)):
+                if self.offline:
+                    self.offline_hits += 1
+                else:
+                    self.hits += 1
+                return self._materialize(cached, dest)
+            if self.offline:
+                raise AssetUnavailable(f"{url} is not cached and offline mode is on")
+
+            try:
+                new_record, transferred = self._download(url, record if cached is not None else None, progress)
+            except (requests.exceptions.RequestException, OSError, AssetUnavailable) as e:
+                # Оборванная загрузка при перепроверке - та же сетевая ошибка, копия в кэше цела
+                if cached is None:
+                    raise AssetUnavailable(f"Failed to download {url}: {e}") from e
+                print(f"Error revalidating {url}, using cached copy: {e}")
+                self.offline_hits += 1
+                return self._materialize(cached, dest)
+
+            if transferred:
+                self.downloads += 1
+            else:
+                self.revalidated += 1
+            with self.lock:
+                self._load_records()[url] = new_record
+                self._save_records()
+            path = self._valid_blob(new_record)
+            if path is None:
+                raise AssetUnavailable(f"Downloaded asset {url} failed verification")
+            return self._materialize(path, dest)
+
+    def _materialize(self, blob: str, dest: Optional[str]) -> str:
+        if dest is None:
+            return blob
+        dest = os.path.abspath(dest)
+        # Копия уже на месте - не перезаписываем
+        if os.path.exists(dest) and os.path.getsize(dest) == os.path.getsize(blob) \
+                and _sha256_file(dest) == os.path.basename(blob):
+            return dest
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(dest), suffix=".part")
+        os.close(fd)
+        try:
+            shutil.copyfile(blob, tmp_path)
+            os.replace(tmp_path, dest)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return dest
+
+    def prune(self) -> int:
+        """Deletes blobs that no manifest entry points to; returns how many were removed"""
+        with self.lock:
+            referenced = {record.sha256 for record in self._load_records().values()}
+        removed = 0
+        try:
+            names = os.listdir(self.blob_dir)
+        except OSError:
+            return 0
+        for name in names:
+            if name not in referenced and not name.endswith(".part"):
+                try:
+                    os.remove(os.path.join(self.blob_dir, name))
+                    removed += 1
+                except OSError as e:
+                    print(f"Error removing cached asset {name}: {e}")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            entries = len(self._load_records())
+        return {"entries": entries, "hits": self.hits, "revalidated": self.revalidated,
+                "downloads": self.downloads, "bytes_downloaded": self.bytes_downloaded,
+                "offline_hits": self.offline_hits}
+
+
+_cache: Optional[AssetCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_asset_cache() -> AssetCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AssetCache()
+        return _cache
+
+
+def fetch_asset(url: str, dest: Optional[str] = None, max_age: Optional[float] = None,
+                progress: Optional[Callable[[int, int], None]] = None) -> str:
+    """Shortcut for get_asset_cache().fetch(...)"""
+    return get_asset_cache().fetch(url, dest, max_age, progress)
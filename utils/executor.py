@@ -0,0 +1,216 @@
+"""
+Общий исполнитель фоновых задач приложения.
+
+Один цикл asyncio в отдельном потоке, ограниченный пул потоков и (по требованию) пул
+процессов. Вкладки работают через именованные группы задач: группу можно отменить при
+закрытии вкладки или окна, а по группам собирается статистика - глубина очереди и
+задержки. Ничего не запускается при импорте: потоки создаются при первой задаче.
+"""
+import os
+import time
+import atexit
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Optional, Any, Callable, Dict, Set, Coroutine
+
+
+class TaskGroup:
+    """Named set of tasks that can be cancelled together and has its own metrics"""
+
+    def __init__(self, name: str, executor: "AppExecutor"):
+        self.name = name
+        self.executor = executor
+        self.lock = threading.Lock()
+        self._futures: Set[Future] = set()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.running = 0
+        self.runs = 0  # задачи пула потоков, для которых измерены задержки
+        self._wait_ms_total = 0.0
+        self._run_ms_total = 0.0
+        self.max_run_ms = 0.0
+
+    def _track(self, future: Future) -> Future:
+        with self.lock:
+            self._futures.add(future)
+            self.submitted += 1
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future):
+        with self.lock:
+            self._futures.discard(future)
+            if future.cancelled():
+                self.cancelled += 1
+            elif future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def _measured(self, fn: Callable, submitted_at: float, *args, **kwargs):
+        started = time.perf_counter()
+        with self.lock:
+            self.running += 1
+            self._wait_ms_total += (started - submitted_at) * 1000
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            print(f"Error in {self.name} task {getattr(fn, '__name__', fn)}: {e}")
+            raise
+        finally:
+            run_ms = (time.perf_counter() - started) * 1000
+            with self.lock:
+                self.running -= 1
+                self.runs += 1
+                self._run_ms_total += run_ms
+                self.max_run_ms = max(self.max_run_ms, run_ms)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Runs fn(*args, **kwargs) on the shared thread pool"""
+        pool = self.executor.thread_pool()
+        return self._track(pool.submit(self._measured, fn, time.perf_counter(), *args, **kwargs))
+
+    def run_coroutine(self, coro: Coroutine) -> Future:
+        """Schedules a coroutine on the shared asyncio loop"""
+        return self._track(asyncio.run_coroutine_threadsafe(coro, self.executor.loop()))
+
+    def submit_process(self, fn: Callable, *args) -> Future:
+        """Runs a picklable fn(*args) on the process pool (created on first use)"""
+        return self._track(self.executor.process_pool().submit(fn, *args))
+
+    def cancel(self) -> int:
+        """Cancels every task of the group that has not finished; returns how many were cancelled"""
+        with self.lock:
+            futures = list(self._futures)
+        return sum(1 for future in futures if future.cancel())
+
+    @property
+    def pending(self) -> int:
+        with self.lock:
+            return len(self._futures) - self.running
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            started = self.runs + self.running
+            return {
+                "submitted": self.submitted,
+                "pending": len(self._futures) - self.running,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "avg_wait_ms": round(self._wait_ms_total / started, 3) if started else 0.0,
+                "avg_run_ms": round(self._run_ms_total / self.runs, 3) if self.runs else 0.0,
+                "max_run_ms": round(self.max_run_ms, 3),
+            }
+
+
+class AppExecutor:
+    """Application-wide asyncio loop, bounded thread pool and optional process pool"""
+
+    def __init__(self, max_workers: Optional[int] = None, max_processes: int = 2):
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 1) + 4)
+        self.max_processes = max_processes
+        self.lock = threading.Lock()
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._groups: Dict[str, TaskGroup] = {}
+        self.closed = False
+
+    def thread_pool(self) -> ThreadPoolExecutor:
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("Executor is shut down")
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asx-worker")
+            return self._threads
+
+    def process_pool(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("Executor is shut down")
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(max_workers=self.max_processes)
+            return self._processes
+
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("Executor is shut down")
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._run_loop, name="asx-asyncio", daemon=True)
+                self._loop_thread.start()
+            return self._loop
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def group(self, name: str) -> TaskGroup:
+        """The task group with this name, created on first use"""
+        with self.lock:
+            group = self._groups.get(name)
+            if group is None:
+                group = TaskGroup(name, self)
+                self._groups[name] = group
+            return group
+
+    def cancel_group(self, name: str) -> int:
+        with self.lock:
+            group = self._groups.get(name)
+        return group.cancel() if group is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            groups = dict(self._groups)
+            pools = {
+                "max_workers": self.max_workers,
+                "thread_pool": self._threads is not None,
+                "process_pool": self._processes is not None,
+                "loop": self._loop is not None,
+            }
+        group_stats = {name: group.stats() for name, group in groups.items()}
+        pools["queue_depth"] = sum(stats["pending"] for stats in group_stats.values())
+        pools["running"] = sum(stats["running"] for stats in group_stats.values())
+        pools["groups"] = group_stats
+        return pools
+
+    def shutdown(self):
+        """Cancels all groups and stops the loop and the pools without waiting for running tasks"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            groups = list(self._groups.values())
+        for group in groups:
+            group.cancel()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[AppExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> AppExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = AppExecutor()
+            atexit.register(_executor.shutdown)
+        return _executor
+
+
+def task_group(name: str) -> TaskGroup:
+    """Shortcut for get_executor().group(name)"""
+    return get_executor().group(name)
@@ -1,5 +1,8 @@
-import requests
 import os
+from utils.lazy_import import lazy_import
+
+requests = lazy_import("requests")
+
 
 class GitHubHandler:
     def __init__(self, github_token=None): # Добавили параметр github_token
@@ -0,0 +1,122 @@
+"""
+Бюджет времени импорта при холодном старте и рейтинг самых медленных импортов:
+
+    python -m utils.import_budget --module main --budget-ms 600 --top 20 --json imports.json
+
+Модуль импортируется в новом интерпретаторе с -X importtime несколько раз, для каждого
+импорта берётся медиана. Код возврата 1 - импорт модуля вышел за бюджет, 2 - модуль не
+импортировался; проверку можно ставить в сборку рядом с utils.tweak_matrix.
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from dataclasses import dataclass, asdict
+from typing import Optional, Any, Dict, List
+
+# Бюджет импорта main по умолчанию, мс: всё, что тяжелее, должно грузиться лениво
+DEFAULT_BUDGET_MS = 600.0
+
+# import time:       584 |     195594 | config
+_LINE = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportTiming:
+    name: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int  # вложенность: 0 - импортирован напрямую
+
+
+def _repo_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parses -X importtime stderr into per-module timings (first occurrence of each module)"""
+    timings: Dict[str, ImportTiming] = {}
+    for line in output.splitlines():
+        match = _LINE.match(line)
+        if match is None:
+            continue  # заголовок и посторонний вывод
+        self_us, cumulative_us, indent, name = match.groups()
+        if name not in timings:
+            timings[name] = ImportTiming(name, int(self_us) / 1000, int(cumulative_us) / 1000, (len(indent) - 1) // 2)
+    return list(timings.values())
+
+
+def measure_once(module: str, cwd: Optional[str] = None) -> List[ImportTiming]:
+    """Imports the module in a fresh interpreter and returns its -X importtime report"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=cwd or _repo_root(), capture_output=True, text=True, timeout=120)
+    if result.returncode != 0:
+        last_lines = [line for line in result.stderr.splitlines() if not line.startswith("import time:")][-5:]
+        raise RuntimeError(f"import {module} failed: " + " | ".join(last_lines))
+    return parse_importtime(result.stderr)
+
+
+def measure(module: str, runs: int = 3, cwd: Optional[str] = None) -> Dict[str, Any]:
+    """Median timings over several cold imports of the module"""
+    samples: Dict[str, List[ImportTiming]] = {}
+    totals = []
+    for _ in range(max(1, runs)):
+        timings = measure_once(module, cwd)
+        for timing in timings:
+            samples.setdefault(timing.name, []).append(timing)
+        target = next((timing for timing in timings if timing.name == module), None)
+        totals.append(target.cumulative_ms if target is not None else 0.0)
+
+    imports = [ImportTiming(name, round(statistics.median(t.self_ms for t in items), 2),
+                            round(statistics.median(t.cumulative_ms for t in items), 2), items[0].depth)
+               for name, items in samples.items()]
+    return {
+        "module": module,
+        "runs": len(totals),
+        "total_ms": round(statistics.median(totals), 2),
+        "imports": imports,
+    }
+
+
+def slowest(imports: List[ImportTiming], top: int = 20, key: str = "self") -> List[ImportTiming]:
+    """The slowest imports by own time (key="self") or including their dependencies ("cumulative")"""
+    attribute = "self_ms" if key == "self" else "cumulative_ms"
+    return sorted(imports, key=lambda timing: getattr(timing, attribute), reverse=True)[:top]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the cold import time of a module against a budget")
+    parser.add_argument("--module", default="main", help="module to import (default: main)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="allowed cumulative import time")
+    parser.add_argument("--runs", type=int, default=3, help="cold imports to take the median of")
+    parser.add_argument("--top", type=int, default=20, help="how many of the slowest imports to list")
+    parser.add_argument("--sort", choices=("self", "cumulative"), default="self", help="rank imports by")
+    parser.add_argument("--json", dest="json_path", help="write the full report to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        report = measure(args.module, runs=args.runs)
+    except (RuntimeError, OSError, subprocess.TimeoutExpired) as e:
+        print(f"Error measuring imports: {e}")
+        return 2
+
+    print(f"{'self ms':>10} {'cumul ms':>10}  module")
+    for timing in slowest(report["imports"], args.top, args.sort):
+        print(f"{timing.self_ms:>10.1f} {timing.cumulative_ms:>10.1f}  {'  ' * timing.depth}{timing.name}")
+    over = report["total_ms"] > args.budget_ms
+    print(f"import {args.module}: {report['total_ms']} ms (median of {report['runs']}), "
+          f"budget {args.budget_ms} ms - {'OVER BUDGET' if over else 'ok'}")
+
+    if args.json_path:
+        data = dict(report, budget_ms=args.budget_ms, imports=[asdict(timing) for timing in report["imports"]])
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
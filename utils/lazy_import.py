@@ -0,0 +1,66 @@
+"""
+Отложенный импорт тяжёлых зависимостей (requests, GPUtil, модули вкладок).
+
+lazy_import("requests") сразу возвращает заглушку модуля, а сам импорт происходит при
+первом обращении к её атрибуту - когда зависимость действительно понадобилась, а не до
+первой отрисовки окна. Время отложенных импортов копится в lazy_import_stats().
+"""
+import time
+import importlib
+import importlib.util
+import threading
+from typing import Any, Dict
+
+_stats: Dict[str, float] = {}
+_stats_lock = threading.Lock()
+
+
+class LazyModule:
+    """Module stand-in that imports the real module on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            # Блокировку на время импорта не держим: import_module потокобезопасен сам,
+            # а вложенный отложенный импорт из другого потока иначе мог бы зависнуть
+            start = time.perf_counter()
+            module = importlib.import_module(self._name)
+            elapsed = round((time.perf_counter() - start) * 1000, 1)
+            with _stats_lock:
+                _stats.setdefault(self._name, elapsed)
+            self._module = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Returns a stand-in for the module; the import happens on first use"""
+    return LazyModule(name)
+
+
+def module_available(name: str) -> bool:
+    """Whether the module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_import_stats() -> Dict[str, float]:
+    """module name -> milliseconds its deferred import took"""
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,301 @@
+"""
+Долгоживущий процесс PowerShell для запросов твиков и вкладок.
+
+Процессы (не больше max_workers) запускаются по мере надобности и читают построчные
+JSON-запросы ({"id", "script"}) из stdin: перед выполнением запроса процесс пишет строку
+"<маркер>{"id", "started"}", после - "<маркер>{"id", "ok", "stdout", "errors"}". Запросы
+из разных потоков расходятся по свободным процессам, так что холодный старт PowerShell
+оплачивается раз за сеанс, а медленный запрос не задерживает остальные. Зависший запрос
+убивает только свой процесс; ждавшие за ним запросы переходят в другой процесс.
+"""
+import json
+import time
+import atexit
+import base64
+import itertools
+import subprocess
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List
+
+# Строки ответов начинаются с маркера: всё остальное (Write-Host и т.п.) пропускается
+RESPONSE_MARKER = "@@ASX-PS@@"
+
+_WORKER_SCRIPT = r"""
+$ErrorActionPreference = 'Continue'
+$ProgressPreference = 'SilentlyContinue'
+$utf8 = New-Object System.Text.UTF8Encoding $false
+[Console]::InputEncoding = $utf8
+[Console]::OutputEncoding = $utf8
+$reader = [Console]::In
+$writer = [Console]::Out
+while ($true) {
+    $line = $reader.ReadLine()
+    if ($line -eq $null) { break }
+    if (-not $line.Trim()) { continue }
+    $request = $line | ConvertFrom-Json
+    # Отметка начала: таймаут запроса отсчитывается с этого момента, а не с постановки в очередь
+    $writer.WriteLine('@@ASX-PS@@' + (@{ id = $request.id; started = $true } | ConvertTo-Json -Compress))
+    $writer.Flush()
+    $errors = @()
+    $ok = $true
+    $output = ''
+    try {
+        $output = & ([ScriptBlock]::Create($request.script)) 2>&1 | ForEach-Object {
+            if ($_ -is [System.Management.Automation.ErrorRecord]) { $errors += $_.ToString() } else { $_ }
+        } | Out-String -Width 4096
+    } catch {
+        $ok = $false
+        $errors += $_.ToString()
+    }
+    $response = @{ id = $request.id; ok = $ok; stdout = "$output"; errors = @($errors) } | ConvertTo-Json -Compress
+    $writer.WriteLine('@@ASX-PS@@' + $response)
+    $writer.Flush()
+}
+"""
+
+
+class PowerShellError(RuntimeError):
+    """The worker could not be started, died, or did not answer in time"""
+
+
+@dataclass
+class PowerShellResult:
+    stdout: str
+    errors: List[str] = field(default_factory=list)
+    ok: bool = True  # False - скрипт завершился прерывающей ошибкой
+    elapsed_ms: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.ok and not self.errors
+
+    @property
+    def text(self) -> str:
+        return self.stdout.strip()
+
+
+@dataclass
+class _Request:
+    id: int
+    script: str
+    future: Future = field(default_factory=Future)
+    started_event: threading.Event = field(default_factory=threading.Event)
+    started: Optional[float] = None  # time.monotonic(), когда процесс начал выполнять запрос
+
+
+class _Worker:
+    """One PowerShell process; runs the requests sent to it one after another"""
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self.pending: Dict[int, _Request] = {}  # отправлены и ещё не получили ответа, по порядку
+        self.current: Optional[int] = None  # запрос, который выполняется сейчас
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+
+class PowerShellHost:
+    """
+    A small pool of lazily started PowerShell processes shared by concurrent callers.
+    A request's timeout counts from the moment a process starts running it, not from
+    the time spent queued behind other requests.
+    """
+
+    def __init__(self, executable: str = "powershell.exe", max_workers: int = 2, queue_timeout: float = 120.0):
+        self.executable = executable
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        self.lock = threading.Lock()
+        self._workers: List[_Worker] = []
+        self._ids = itertools.count(1)
+        self.requests = 0
+        self.starts = 0
+        self.timeouts = 0
+        self.requeued = 0
+
+    def _command(self) -> List[str]:
+        encoded = base64.b64encode(_WORKER_SCRIPT.encode("utf-16-le")).decode("ascii")
+        return [self.executable, "-NoLogo", "-NoProfile", "-NonInteractive",
+                "-ExecutionPolicy", "Bypass", "-EncodedCommand", encoded]
+
+    def _start_worker(self) -> _Worker:
+        # Вызывается под self.lock
+        try:
+            process = subprocess.Popen(
+                self._command(), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                encoding="utf-8", errors="replace", bufsize=1,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+            )
+        except OSError as e:
+            raise PowerShellError(f"Failed to start PowerShell: {e}") from e
+        worker = _Worker(process)
+        self._workers.append(worker)
+        threading.Thread(target=self._read_responses, args=(worker,),
+                         name="powershell-host-reader", daemon=True).start()
+        self.starts += 1
+        return worker
+
+    def _pick_worker(self) -> _Worker:
+        # Свободный процесс, иначе новый (пока пул не заполнен), иначе наименее загруженный
+        self._workers = [worker for worker in self._workers if worker.alive]
+        idle = [worker for worker in self._workers if not worker.pending]
+        if idle:
+            return idle[0]
+        if len(self._workers) < self.max_workers:
+            return self._start_worker()
+        return min(self._workers, key=lambda worker: len(worker.pending))
+
+    def _dispatch(self, request: _Request):
+        """Sends the request to a worker (under self.lock)"""
+        line = json.dumps({"id": request.id, "script": request.script}) + "\n"
+        for attempt in (0, 1):
+            worker = self._pick_worker()
+            worker.pending[request.id] = request
+            try:
+                worker.process.stdin.write(line)
+                worker.process.stdin.flush()
+                return
+            except OSError as e:
+                worker.pending.pop(request.id, None)
+                if attempt:
+                    raise PowerShellError(f"PowerShell worker is not accepting requests: {e}") from e
+                # Сломанный процесс больше не выбираем; его очередь переразошлёт читающий поток
+                self._workers.remove(worker)
+                try:
+                    worker.process.kill()
+                except OSError:
+                    pass
+
+    def _read_responses(self, worker: _Worker):
+        for line in worker.process.stdout:
+            line = line.lstrip("\ufeff")
+            if not line.startswith(RESPONSE_MARKER):
+                continue
+            try:
+                response = json.loads(line[len(RESPONSE_MARKER):])
+            except ValueError:
+                continue
+            with self.lock:
+                if response.get("started"):
+                    request = worker.pending.get(response.get("id"))
+                    if request is not None:
+                        worker.current = request.id
+                        request.started = time.monotonic()
+                        request.started_event.set()
+                    continue
+                request = worker.pending.pop(response.get("id"), None)
+                worker.current = None
+            if request is not None:
+                errors = response.get("errors") or []
+                request.future.set_result(PowerShellResult(
+                    stdout=response.get("stdout") or "",
+                    errors=[errors] if isinstance(errors, str) else list(errors),
+                    ok=bool(response.get("ok", True)),
+                ))
+                request.started_event.set()
+        # Процесс завершился - выполнявшийся запрос ответа не получит
+        self._retire(worker, "PowerShell worker exited")
+
+    def _retire(self, worker: _Worker, message: str):
+        """Removes a dead or killed worker: the running request fails, queued ones move to another worker"""
+        with self.lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            pending, worker.pending = worker.pending, {}
+            failed = []
+            for request in pending.values():
+                if request.started is not None:
+                    failed.append(request)
+                    continue
+                try:
+                    self._dispatch(request)
+                    self.requeued += 1
+                except PowerShellError:
+                    failed.append(request)
+        for request in failed:
+            if not request.future.done():
+                request.future.set_exception(PowerShellError(message))
+            request.started_event.set()
+
+    def run(self, script: str, timeout: float = 30.0) -> PowerShellResult:
+        """Runs a script in a worker; raises PowerShellError when it cannot be answered"""
+        start = time.perf_counter()
+        request = _Request(next(self._ids), script)
+        with self.lock:
+            self.requests += 1
+            self._dispatch(request)
+
+        if not request.started_event.wait(self.queue_timeout):
+            self._drop(request)
+            raise PowerShellError(f"PowerShell request was not started within {self.queue_timeout:g}s")
+        try:
+            remaining = timeout if request.started is None else request.started + timeout - time.monotonic()
+            result = request.future.result(timeout=max(0.0, remaining))
+        except FutureTimeoutError:
+            self._timed_out(request)
+            raise PowerShellError(f"PowerShell request timed out after {timeout:g}s")
+        result.elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        return result
+
+    def _drop(self, request: _Request):
+        # Запрос уже передан процессу: он выполнится, но ответ никто не ждёт
+        with self.lock:
+            for worker in self._workers:
+                worker.pending.pop(request.id, None)
+
+    def _timed_out(self, request: _Request):
+        """Kills the worker only if it is still running this request; other callers are unaffected"""
+        with self.lock:
+            self.timeouts += 1
+            worker = next((worker for worker in self._workers
+                           if worker.current == request.id and request.id in worker.pending), None)
+        if worker is None:
+            self._drop(request)
+            return
+        try:
+            worker.process.kill()
+        except OSError:
+            pass
+        self._retire(worker, "PowerShell request timed out")
+
+    def close(self):
+        with self.lock:
+            workers, self._workers = list(self._workers), []
+        for worker in workers:
+            try:
+                worker.process.stdin.close()
+                worker.process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                try:
+                    worker.process.kill()
+                except OSError:
+                    pass
+            self._retire(worker, "PowerShell worker closed")
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"requests": self.requests, "starts": self.starts, "workers": len(self._workers),
+                    "pending": sum(len(worker.pending) for worker in self._workers),
+                    "timeouts": self.timeouts, "requeued": self.requeued}
+
+
+_host: Optional[PowerShellHost] = None
+_host_lock = threading.Lock()
+
+
+def get_powershell_host() -> PowerShellHost:
+    global _host
+    with _host_lock:
+        if _host is None:
+            _host = PowerShellHost()
+            atexit.register(_host.close)
+        return _host
+
+
+def run_powershell(script: str, timeout: float = 30.0) -> PowerShellResult:
+    """Runs a PowerShell script in the shared worker process"""
+    return get_powershell_host().run(script, timeout=timeout)
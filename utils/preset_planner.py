@@ -0,0 +1,326 @@
+"""
+Пресеты твиков: желаемое состояние (ключ твика -> включён) и планировщик, который
+применяет только разницу с текущим состоянием.
+
+Текущее состояние читается одним проходом анализатора, план упорядочен так: сначала
+декларативные твики реестра (одной транзакцией), затем службы (одним пакетом через
+ServiceBatchExecutor), затем твики с внешними процессами, а твики, требующие
+перезагрузки, - в самом конце. После применения затронутые твики проверяются заново:
+шаг, после которого статус не стал нужным, считается неудачным. Повторное применение
+уже применённого пресета сводится к проверке статусов.
+"""
+import os
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Any, Dict, List, Callable
+
+from utils.analysis_store import get_analysis_store
+from utils.registry_handler import RegistryHandler, RegistryTransactionError
+from utils.service_executor import ServiceBatchExecutor
+from utils.service_tweak import ServiceTweak
+from utils.tweak_registry import TweakRegistry, get_tweak_registry
+from utils.tweak_specs import get_spec
+
+# Однонаправленные или интерактивные действия (удаление OneDrive и виджетов, правка hosts):
+# у них нет enable/disable, пресеты их не применяют
+MANUAL_TWEAKS = {"onedrive", "widgets_uninstall", "data_domains"}
+
+# Порядок групп шагов в плане
+STEP_REGISTRY = "registry"
+STEP_REGISTRY_TWEAK = "registry_tweak"  # написанный вручную твик с registry_only = True
+STEP_SERVICE = "service"
+STEP_PROCESS = "process"
+_STEP_ORDER = {STEP_REGISTRY: 0, STEP_REGISTRY_TWEAK: 1, STEP_SERVICE: 2, STEP_PROCESS: 3}
+
+
+def _presets_dir() -> str:
+    app_data_dir = os.getenv('APPDATA') or os.path.expanduser("~")
+    return os.path.join(app_data_dir, "ASX-Hub", "Presets")
+
+
+@dataclass
+class Preset:
+    name: str
+    tweaks: Dict[str, bool]  # ключ твика -> должен быть включён
+    description: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "description": self.description, "tweaks": dict(self.tweaks)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Preset":
+        return cls(name=data.get("name", ""), description=data.get("description", ""),
+                   tweaks={key: bool(state) for key, state in data.get("tweaks", {}).items()})
+
+
+def optimized_preset(tweaks: Optional[List[Dict[str, Any]]] = None) -> Preset:
+    """Every tweak from config.TWEAKS in its optimized_state"""
+    if tweaks is None:
+        from config import TWEAKS
+        tweaks = TWEAKS
+    return Preset(
+        name="optimized",
+        description="Рекомендуемое состояние всех твиков",
+        tweaks={tweak["key"]: tweak.get("optimized_state", True) for tweak in tweaks
+                if tweak.get("class_name") and tweak["key"] not in MANUAL_TWEAKS}
+    )
+
+
+def preset_path(name: str) -> str:
+    """Where a preset with this name is saved: %APPDATA%/ASX-Hub/Presets/<name>.json"""
+    return os.path.join(_presets_dir(), f"{name}.json")
+
+
+def load_preset(path: str) -> Preset:
+    """Reads a preset JSON file ({"name", "description", "tweaks": {key: bool}})"""
+    with open(path, "r", encoding="utf-8") as f:
+        return Preset.from_dict(json.load(f))
+
+
+def resolve_preset(profile: str) -> Preset:
+    """'optimized', a path to a preset JSON file or the name of a saved preset"""
+    if profile == "optimized":
+        return optimized_preset()
+    for path in (profile, preset_path(profile)):
+        if os.path.isfile(path):
+            return load_preset(path)
+    raise ValueError(f"Preset not found: {profile}")
+
+
+def save_preset(preset: Preset, path: Optional[str] = None) -> str:
+    """Writes a preset to the given path or to %APPDATA%/ASX-Hub/Presets/<name>.json"""
+    path = path or preset_path(preset.name)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(preset.to_dict(), f, indent=4, ensure_ascii=False)
+    return path
+
+
+@dataclass
+class PresetStep:
+    key: str
+    enable: bool
+    kind: str  # STEP_REGISTRY / STEP_REGISTRY_TWEAK / STEP_SERVICE / STEP_PROCESS
+    requires_reboot: bool = False
+    success: Optional[bool] = None  # None - шаг ещё не выполнялся
+    error: Optional[str] = None
+
+
+@dataclass
+class PresetPlan:
+    preset: Preset
+    steps: List[PresetStep] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)  # уже в нужном состоянии
+    skipped: Dict[str, str] = field(default_factory=dict)  # ключ -> причина
+    probe_ms: float = 0.0
+
+    @property
+    def is_noop(self) -> bool:
+        return not self.steps
+
+    @property
+    def requires_reboot(self) -> bool:
+        return any(step.requires_reboot and step.success for step in self.steps)
+
+    def changes(self) -> List[Dict[str, Any]]:
+        """The steps as JSON-friendly dicts (current and desired state of each tweak)"""
+        return [{"key": step.key, "current": not step.enable, "desired": step.enable, "kind": step.kind,
+                 "requires_reboot": step.requires_reboot} for step in self.steps]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "preset": self.preset.name,
+            "steps": len(self.steps),
+            "applied": sum(1 for step in self.steps if step.success),
+            "failed": [step.key for step in self.steps if step.success is False],
+            "unchanged": len(self.unchanged),
+            "skipped": dict(self.skipped),
+            "requires_reboot": self.requires_reboot,
+            "probe_ms": self.probe_ms,
+        }
+
+
+@dataclass
+class PresetProgress:
+    stage: str  # "probe", "apply", "verify", "done"
+    done: int
+    total: int
+    key: Optional[str] = None
+    success: Optional[bool] = None
+    message: str = ""
+
+
+class PresetPlanner:
+    """Computes and applies the minimal set of changes that brings tweaks to a preset"""
+
+    def __init__(self, registry: Optional[TweakRegistry] = None,
+                 progress: Optional[Callable[[PresetProgress], None]] = None):
+        self.tweaks = registry or get_tweak_registry()
+        self.progress = progress
+        self.reg = RegistryHandler()
+
+    def _notify(self, stage: str, done: int, total: int, key: Optional[str] = None,
+                success: Optional[bool] = None, message: str = ""):
+        if self.progress is None:
+            return
+        try:
+            self.progress(PresetProgress(stage, done, total, key, success, message))
+        except Exception as e:
+            print(f"Error in preset progress callback: {e}")
+
+    def _step_kind(self, key: str) -> str:
+        if get_spec(key) is not None:
+            return STEP_REGISTRY
+        tweak = self.tweaks.get(key)
+        if getattr(tweak, "registry_only", False):
+            # Пишут только реестр, но своей логикой (чтение-проверка, несколько веток) - в общую
+            # транзакцию не входят, а выполняются по одному сразу за декларативными
+            return STEP_REGISTRY_TWEAK
+        if isinstance(getattr(tweak, "instance", tweak), ServiceTweak):
+            return STEP_SERVICE
+        return STEP_PROCESS
+
+    def tweak_keys(self, include_manual: bool = True) -> List[str]:
+        """Keys of every tweak that has a class (without MANUAL_TWEAKS unless include_manual)"""
+        return [key for key, tweak_config in self.tweaks.configs.items()
+                if tweak_config.get("class_name") and (include_manual or key not in MANUAL_TWEAKS)]
+
+    def analyze(self, keys: List[str], incremental: bool = True) -> Dict[str, Any]:
+        """Full analyzer pass (statuses, timings, fingerprints) over the given tweaks"""
+        from utils.tweak_analyzer import TweakAnalyzer
+        tweak_data = {}
+        for key in keys:
+            tweak = self.tweaks.get(key)
+            tweak_data[key] = {"instance": tweak, "check_status_func": tweak.check_status,
+                               "category": self.tweaks.configs[key].get("category")}
+        return TweakAnalyzer().collect_tweak_statuses(tweak_data, incremental=incremental)
+
+    def probe(self, keys: List[str], incremental: bool = True) -> Dict[str, bool]:
+        """Current statuses of the given tweaks in one analyzer pass"""
+        analysis = self.analyze(keys, incremental=incremental)
+        return {key: status["enabled"] for key, status in analysis["tweaks"].items()}
+
+    def plan(self, preset: Preset) -> PresetPlan:
+        """Probes the preset's tweaks and lists the steps needed to reach it"""
+        plan = PresetPlan(preset)
+        keys = []
+        for key in preset.tweaks:
+            tweak_config = self.tweaks.configs.get(key)
+            if tweak_config is None or not tweak_config.get("class_name"):
+                plan.skipped[key] = "unknown tweak"
+            elif key in MANUAL_TWEAKS:
+                plan.skipped[key] = "manual action"
+            else:
+                keys.append(key)
+
+        self._notify("probe", 0, len(keys))
+        start = time.perf_counter()
+        statuses = self.probe(keys)
+        plan.probe_ms = round((time.perf_counter() - start) * 1000, 3)
+        self._notify("probe", len(keys), len(keys))
+
+        for key in keys:
+            current = statuses.get(key)
+            if current is None:
+                plan.skipped[key] = "status unknown"
+            elif current == preset.tweaks[key]:
+                plan.unchanged.append(key)
+            else:
+                plan.steps.append(PresetStep(key, preset.tweaks[key], self._step_kind(key),
+                                             bool(self.tweaks.configs[key].get("requires_reboot"))))
+        # Перезагрузочные шаги последними, внутри групп - реестр, службы, процессы
+        plan.steps.sort(key=lambda step: (step.requires_reboot, _STEP_ORDER[step.kind]))
+        return plan
+
+    def execute(self, plan: PresetPlan) -> PresetPlan:
+        """Applies the plan's steps, reporting progress after each one"""
+        total = len(plan.steps)
+        done = 0
+        index = 0
+        while index < total:
+            # Подряд идущие шаги одного вида с одинаковым requires_reboot выполняются пачкой
+            step = plan.steps[index]
+            end = index + 1
+            while end < total and (plan.steps[end].kind, plan.steps[end].requires_reboot) == \
+                    (step.kind, step.requires_reboot):
+                end += 1
+            group = plan.steps[index:end]
+            if step.kind == STEP_REGISTRY:
+                self._apply_registry(group)
+            elif step.kind == STEP_SERVICE:
+                self._apply_services(group)
+            for group_step in group:
+                if step.kind in (STEP_REGISTRY_TWEAK, STEP_PROCESS):
+                    self._apply_process(group_step)
+                done += 1
+                self._notify("apply", done, total, group_step.key, group_step.success, group_step.error or "")
+            index = end
+        if plan.steps:
+            self._verify(plan)
+        self._notify("done", done, total, message=json.dumps(plan.summary(), ensure_ascii=False))
+        return plan
+
+    def _verify(self, plan: PresetPlan):
+        """Re-probes the applied tweaks: enable() returning True does not mean the state changed"""
+        keys = [step.key for step in plan.steps]
+        self._notify("verify", 0, len(keys))
+        # Без отпечатков: после записей прошлые статусы переиспользовать нельзя
+        statuses = self.probe(keys, incremental=False)
+        store = get_analysis_store()
+        for step in plan.steps:
+            current = statuses.get(step.key)
+            if current is None:
+                continue
+            # Главная вкладка и переключатели узнают о новом статусе через хранилище анализа
+            store.set_status(step.key, current)
+            if step.success and current != step.enable:
+                step.success = False
+                step.error = "state did not change"
+        self._notify("verify", len(keys), len(keys))
+
+    def apply(self, preset: Preset) -> PresetPlan:
+        """plan() + execute(); a preset that is already applied costs only the probe"""
+        return self.execute(self.plan(preset))
+
+    def _apply_registry(self, steps: List[PresetStep]):
+        # Записи всех декларативных твиков присоединяются к одной транзакции; в журнал
+        # твики пишутся только после её фиксации, иначе откат оставил бы ложные "успехи"
+        start = time.perf_counter()
+        try:
+            with self.reg.transaction():
+                for step in steps:
+                    tweak = self.tweaks.get(step.key)
+                    tweak = getattr(tweak, "instance", tweak)  # LazyTweak.enable() без аргументов
+                    step.success = tweak.enable(log=False) if step.enable else tweak.disable(log=False)
+        except RegistryTransactionError as e:
+            for step in steps:
+                step.success = False
+                step.error = str(e)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for step in steps:
+            tweak = self.tweaks.get(step.key)
+            if step.enable:
+                tweak.log_action("enable", "Enabled", step.success, elapsed_ms)
+            else:
+                tweak.log_action("disable", "Disabled", step.success, elapsed_ms)
+
+    def _apply_services(self, steps: List[PresetStep]):
+        changes = []
+        for step in steps:
+            changes.extend(self.tweaks.get(step.key).service_changes(step.enable))
+        results = ServiceBatchExecutor().apply(changes)
+        for step in steps:
+            step.success = self.tweaks.get(step.key).report_results("enable" if step.enable else "disable", results)
+
+    def _apply_process(self, step: PresetStep):
+        tweak = self.tweaks.get(step.key)
+        try:
+            step.success = bool(tweak.enable() if step.enable else tweak.disable())
+        except Exception as e:
+            step.success = False
+            step.error = str(e)
+
+
+def apply_preset(preset: Preset, progress: Optional[Callable[[PresetProgress], None]] = None) -> PresetPlan:
+    return PresetPlanner(progress=progress).apply(preset)
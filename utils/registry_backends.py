@@ -0,0 +1,931 @@
+import os
+import re
+import struct
+import ctypes
+import ntpath
+import atexit
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Any, Tuple, Dict, List, Iterable
+
+try:
+    import winreg
+    WINREG_AVAILABLE = True
+except ImportError:
+    WINREG_AVAILABLE = False
+
+    class _WinregStub:
+        """Constants of the winreg module for platforms where it does not exist"""
+        HKEY_CLASSES_ROOT = 0x80000000
+        HKEY_CURRENT_USER = 0x80000001
+        HKEY_LOCAL_MACHINE = 0x80000002
+        HKEY_USERS = 0x80000003
+
+        KEY_QUERY_VALUE = 0x0001
+        KEY_SET_VALUE = 0x0002
+        KEY_CREATE_SUB_KEY = 0x0004
+        KEY_ENUMERATE_SUB_KEYS = 0x0008
+        KEY_NOTIFY = 0x0010
+        KEY_READ = 0x20019
+        KEY_WRITE = 0x20006
+        KEY_ALL_ACCESS = 0xF003F
+        KEY_WOW64_64KEY = 0x0100
+        KEY_WOW64_32KEY = 0x0200
+
+        REG_NONE = 0
+        REG_SZ = 1
+        REG_EXPAND_SZ = 2
+        REG_BINARY = 3
+        REG_DWORD = 4
+        REG_DWORD_BIG_ENDIAN = 5
+        REG_LINK = 6
+        REG_MULTI_SZ = 7
+        REG_QWORD = 11
+
+        def __getattr__(self, name):
+            # Любая функция winreg ведёт себя так, будто ключа нет
+            def _unavailable(*args, **kwargs):
+                raise FileNotFoundError(f"winreg.{name} is not available on this platform")
+            return _unavailable
+
+    winreg = _WinregStub()
+
+# Канонические имена кустов и их сокращения
+HIVE_ALIASES = {
+    'HKEY_LOCAL_MACHINE': 'HKEY_LOCAL_MACHINE',
+    'HKLM': 'HKEY_LOCAL_MACHINE',
+    'HKEY_CURRENT_USER': 'HKEY_CURRENT_USER',
+    'HKCU': 'HKEY_CURRENT_USER',
+    'HKEY_CLASSES_ROOT': 'HKEY_CLASSES_ROOT',
+    'HKCR': 'HKEY_CLASSES_ROOT',
+    'HKEY_USERS': 'HKEY_USERS',
+    'HKU': 'HKEY_USERS',
+}
+
+# Начиная с какого числа значений одного ключа выгоднее один проход EnumValue
+ENUM_SWEEP_THRESHOLD = 4
+
+# Группа записей одного ключа: (куст, путь, [(действие, имя, данные, тип), ...]).
+# Действия: 'set', 'delete_value', 'delete_key' (последнее всегда одно в своей группе)
+WriteGroup = Tuple[str, str, List[Tuple[str, Optional[str], Any, Optional[int]]]]
+
+
+class RegistryTransactionError(Exception):
+    """A batch of registry writes failed; rolled_back tells whether the prior state was restored"""
+
+    def __init__(self, message: str, rolled_back: bool = True):
+        super().__init__(message)
+        self.rolled_back = rolled_back
+
+
+class RegistryBackend(ABC):
+    """
+    Storage behind RegistryHandler. Hives are canonical names ('HKEY_LOCAL_MACHINE', ...),
+    value names are matched case-insensitively. Missing keys/values raise FileNotFoundError.
+    """
+
+    @abstractmethod
+    def get_value(self, hive: str, subpath: str, value_name: str) -> Tuple[Any, int]:
+        """Returns (data, type) of a value"""
+        pass
+
+    @abstractmethod
+    def get_values(self, hive: str, subpath: str, value_names: Iterable[str]) -> Dict[str, Any]:
+        """Returns data of the found values, keyed by lower-cased value name"""
+        pass
+
+    @abstractmethod
+    def set_value(self, hive: str, subpath: str, value_name: str, value_data: Any, value_type: int):
+        """Creates the key if needed and writes the value"""
+        pass
+
+    @abstractmethod
+    def delete_value(self, hive: str, subpath: str, value_name: str):
+        pass
+
+    @abstractmethod
+    def delete_key(self, hive: str, subpath: str):
+        """Deletes a key that has no subkeys"""
+        pass
+
+    @abstractmethod
+    def enum_subkeys(self, hive: str, subpath: str) -> List[str]:
+        pass
+
+    def key_exists(self, hive: str, subpath: str) -> bool:
+        try:
+            self.enum_subkeys(hive, subpath)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def key_fingerprint(self, hive: str, subpath: str) -> Any:
+        """
+        Cheap token that changes whenever the values of the key change. Backends that
+        cannot provide one return a fresh object, i.e. "always changed".
+        """
+        return object()
+
+    def open_notification_key(self, hive: str, subpath: str) -> Any:
+        """Opens the key for RegNotifyChangeKeyValue; only the live registry supports this"""
+        raise NotImplementedError
+
+    def get_key_values(self, hive: str, subpath: str) -> List[Tuple[str, Any, int]]:
+        """Returns every (name, data, type) of the key; used by the rollback journal"""
+        raise NotImplementedError
+
+    def create_key(self, hive: str, subpath: str):
+        """Creates the key (and missing parents) without writing any value"""
+        raise NotImplementedError
+
+    def apply_batch(self, groups: List[WriteGroup]):
+        """
+        Applies the groups one key at a time. Prior values of every touched key are
+        journaled first; if any write fails the journal is replayed backwards and
+        RegistryTransactionError is raised.
+        """
+        journal = _WriteJournal(self)
+        try:
+            for hive, subpath, operations in groups:
+                journal.record(hive, subpath, operations)
+                _apply_group(self, hive, subpath, operations)
+        except Exception as e:
+            rolled_back = journal.rollback()
+            raise RegistryTransactionError(f"Registry batch failed at {hive}\\{subpath}: {e}", rolled_back) from e
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+    def close(self):
+        pass
+
+
+def _apply_group(backend: RegistryBackend, hive: str, subpath: str,
+                 operations: List[Tuple[str, Optional[str], Any, Optional[int]]]):
+    for action, value_name, value_data, value_type in operations:
+        try:
+            if action == "set":
+                backend.set_value(hive, subpath, value_name, value_data, value_type)
+            elif action == "delete_value":
+                backend.delete_value(hive, subpath, value_name)
+            elif action == "delete_key":
+                backend.delete_key(hive, subpath)
+        except FileNotFoundError:
+            if action == "set":
+                raise
+            # Удалять уже нечего - результат тот же
+
+
+class _WriteJournal:
+    """Prior state of the keys touched by apply_batch, replayed backwards on failure"""
+
+    def __init__(self, backend: RegistryBackend):
+        self.backend = backend
+        # (куст, путь, созданные ключи, {имя: (имя, данные, тип) или None}, значения удалённого ключа)
+        self.entries: List[Tuple[str, str, List[str], Dict[str, Optional[Tuple[str, Any, int]]], Optional[List]]] = []
+
+    def record(self, hive: str, subpath: str, operations: List[Tuple[str, Optional[str], Any, Optional[int]]]):
+        try:
+            existing = {name.lower(): (name, data, value_type)
+                        for name, data, value_type in self.backend.get_key_values(hive, subpath)}
+            key_exists = True
+        except FileNotFoundError:
+            existing, key_exists = {}, False
+
+        if any(action == "delete_key" for action, _, _, _ in operations):
+            if key_exists:
+                self.entries.append((hive, subpath, [], {}, list(existing.values())))
+            return
+
+        created = []
+        if not key_exists:
+            # Запоминаем все ключи, которые создаст CreateKeyEx, от самого глубокого
+            path = subpath
+            while path and not self.backend.key_exists(hive, path):
+                created.append(path)
+                path = path.rsplit("\\", 1)[0] if "\\" in path else ""
+        prior = {value_name.lower(): existing.get(value_name.lower()) for _, value_name, _, _ in operations}
+        self.entries.append((hive, subpath, created, prior, None))
+
+    def rollback(self) -> bool:
+        """Restores the journaled state; returns False if some of it could not be restored"""
+        restored = True
+        for hive, subpath, created, prior, deleted_values in reversed(self.entries):
+            try:
+                if deleted_values is not None:
+                    self.backend.create_key(hive, subpath)
+                    for name, data, value_type in deleted_values:
+                        self.backend.set_value(hive, subpath, name, data, value_type)
+                    continue
+                for value_name, entry in prior.items():
+                    if entry is not None:
+                        self.backend.set_value(hive, subpath, entry[0], entry[1], entry[2])
+                    else:
+                        try:
+                            self.backend.delete_value(hive, subpath, value_name)
+                        except FileNotFoundError:
+                            pass
+                for path in created:
+                    try:
+                        self.backend.delete_key(hive, path)
+                    except FileNotFoundError:
+                        pass  # Сбой случился раньше, чем ключ был создан
+            except Exception as e:
+                print(f"Error rolling back registry key {hive}\\{subpath}: {e}")
+                restored = False
+        return restored
+
+
+class _KeyHandlePool:
+    """LRU pool of open registry key handles"""
+
+    def __init__(self, max_size: int = 64):
+        self.max_size = max_size
+        self.lock = threading.RLock()
+        self._handles: "OrderedDict[Tuple[Any, str, int], Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, hkey: Any, subpath: str, access: int, full_access: int, create: bool = False) -> Any:
+        """
+        Returns an open handle for the key, reusing a pooled one when possible.
+        The caller must hold self.lock while using the handle.
+        """
+        norm_path = subpath.lower()
+        # Ключ, открытый с KEY_ALL_ACCESS, подходит и для чтения, и для записи
+        candidates = (access,) if access == full_access else (access, full_access)
+        for candidate in candidates:
+            pool_key = (hkey, norm_path, candidate)
+            handle = self._handles.get(pool_key)
+            if handle is not None:
+                self._handles.move_to_end(pool_key)
+                self.hits += 1
+                return handle
+
+        self.misses += 1
+        if create:
+            handle = winreg.CreateKeyEx(hkey, subpath, 0, access)
+        else:
+            handle = winreg.OpenKey(hkey, subpath, 0, access)
+
+        self._handles[(hkey, norm_path, access)] = handle
+        while len(self._handles) > self.max_size:
+            _, old_handle = self._handles.popitem(last=False)
+            self._close(old_handle)
+            self.evictions += 1
+        return handle
+
+    def discard(self, hkey: Any, subpath: str, include_subkeys: bool = False):
+        """Closes pooled handles of the key (and optionally of all its subkeys)"""
+        norm_path = subpath.lower()
+        prefix = norm_path + "\\"
+        with self.lock:
+            for pool_key in list(self._handles):
+                pool_hkey, pool_path, _ = pool_key
+                if pool_hkey != hkey:
+                    continue
+                if pool_path == norm_path or (include_subkeys and pool_path.startswith(prefix)):
+                    self._close(self._handles.pop(pool_key))
+
+    def close_all(self):
+        """Closes every pooled handle"""
+        with self.lock:
+            while self._handles:
+                _, handle = self._handles.popitem(last=False)
+                self._close(handle)
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "size": len(self._handles),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    @staticmethod
+    def _close(handle: Any):
+        try:
+            winreg.CloseKey(handle)
+        except Exception:
+            pass
+
+
+class WinregBackend(RegistryBackend):
+    """The live Windows registry, accessed through pooled winreg handles"""
+
+    def __init__(self, pool_size: int = 64):
+        self.read_access = winreg.KEY_READ | winreg.KEY_WOW64_64KEY
+        self.write_access = winreg.KEY_WRITE | winreg.KEY_WOW64_64KEY
+        self.full_access = winreg.KEY_ALL_ACCESS | winreg.KEY_WOW64_64KEY
+        self.hkeys = {
+            'HKEY_LOCAL_MACHINE': winreg.HKEY_LOCAL_MACHINE,
+            'HKEY_CURRENT_USER': winreg.HKEY_CURRENT_USER,
+            'HKEY_CLASSES_ROOT': winreg.HKEY_CLASSES_ROOT,
+            'HKEY_USERS': winreg.HKEY_USERS,
+        }
+        self.pool = _KeyHandlePool(pool_size)
+
+    def _with_key(self, hive: str, subpath: str, access: int, operation, create: bool = False):
+        """
+        Runs operation(key) on a pooled handle. A handle that went stale (the key was
+        deleted or recreated by someone else) is dropped and the operation is retried once.
+        """
+        hkey = self.hkeys[hive]
+        with self.pool.lock:
+            key = self.pool.acquire(hkey, subpath, access, self.full_access, create=create)
+            try:
+                return operation(key)
+            except FileNotFoundError:
+                raise
+            except OSError:
+                self.pool.discard(hkey, subpath)
+                key = self.pool.acquire(hkey, subpath, access, self.full_access, create=create)
+                return operation(key)
+
+    def get_value(self, hive: str, subpath: str, value_name: str) -> Tuple[Any, int]:
+        return self._with_key(hive, subpath, self.read_access,
+                              lambda key: winreg.QueryValueEx(key, value_name))
+
+    def get_values(self, hive: str, subpath: str, value_names: Iterable[str]) -> Dict[str, Any]:
+        wanted = {name.lower() for name in value_names}
+        return self._with_key(hive, subpath, self.read_access,
+                              lambda key: self._read_values(key, wanted))
+
+    @staticmethod
+    def _read_values(key: Any, wanted: set) -> Dict[str, Any]:
+        values: Dict[str, Any] = {}
+
+        if len(wanted) >= ENUM_SWEEP_THRESHOLD:
+            index = 0
+            while True:
+                try:
+                    name, data, _ = winreg.EnumValue(key, index)
+                except OSError:
+                    break  # ERROR_NO_MORE_ITEMS
+                if name.lower() in wanted:
+                    values[name.lower()] = data
+                index += 1
+            return values
+
+        for name in wanted:
+            try:
+                values[name], _ = winreg.QueryValueEx(key, name)
+            except FileNotFoundError:
+                pass
+        return values
+
+    def set_value(self, hive: str, subpath: str, value_name: str, value_data: Any, value_type: int):
+        self._with_key(hive, subpath, self.write_access,
+                       lambda key: winreg.SetValueEx(key, value_name, 0, value_type, value_data),
+                       create=True)
+
+    def delete_value(self, hive: str, subpath: str, value_name: str):
+        self._with_key(hive, subpath, self.write_access,
+                       lambda key: winreg.DeleteValue(key, value_name))
+
+    def delete_key(self, hive: str, subpath: str):
+        hkey = self.hkeys[hive]
+        # Разделяем подключ на родительский ключ и имя подключа
+        parent_path, subkey_name = ntpath.split(subpath)
+        with self.pool.lock:
+            # Пул не должен хранить дескрипторы удаляемого ключа
+            self.pool.discard(hkey, subpath, include_subkeys=True)
+            parent_key = winreg.OpenKey(hkey, parent_path, 0, self.full_access)
+            try:
+                winreg.DeleteKey(parent_key, subkey_name)
+            finally:
+                winreg.CloseKey(parent_key)
+
+    def enum_subkeys(self, hive: str, subpath: str) -> List[str]:
+        def _enum(key):
+            names = []
+            index = 0
+            while True:
+                try:
+                    names.append(winreg.EnumKey(key, index))
+                except OSError:
+                    return names
+                index += 1
+        return self._with_key(hive, subpath, self.read_access, _enum)
+
+    def key_fingerprint(self, hive: str, subpath: str) -> Any:
+        # Время последней записи ключа из QueryInfoKey
+        try:
+            return self._with_key(hive, subpath, self.read_access, lambda key: winreg.QueryInfoKey(key)[2])
+        except FileNotFoundError:
+            return None
+
+    def open_notification_key(self, hive: str, subpath: str) -> Any:
+        return winreg.OpenKey(self.hkeys[hive], subpath, 0, winreg.KEY_NOTIFY | winreg.KEY_WOW64_64KEY)
+
+    def get_key_values(self, hive: str, subpath: str) -> List[Tuple[str, Any, int]]:
+        def _enum(key):
+            values = []
+            index = 0
+            while True:
+                try:
+                    values.append(winreg.EnumValue(key, index))
+                except OSError:
+                    return values
+                index += 1
+        return self._with_key(hive, subpath, self.read_access, _enum)
+
+    def create_key(self, hive: str, subpath: str):
+        self._with_key(hive, subpath, self.write_access, lambda key: None, create=True)
+
+    def apply_batch(self, groups: List[WriteGroup]):
+        # Kernel Transaction Manager: всё или ничего силами самой системы
+        ktm = _KtmTransaction.begin(self.write_access)
+        if ktm is None:
+            return super().apply_batch(groups)
+
+        try:
+            with self.pool.lock:
+                for hive, subpath, operations in groups:
+                    ktm.apply_group(self.hkeys[hive], subpath, operations)
+                ktm.commit()
+        except Exception as e:
+            # Не только OSError: _value_bytes бросает ValueError/TypeError на неверных данных
+            ktm.rollback()
+            raise RegistryTransactionError(f"Transacted registry batch failed: {e}", rolled_back=True) from e
+        finally:
+            ktm.close()
+            # Удалённые ключи не должны оставаться в пуле
+            for hive, subpath, operations in groups:
+                if any(action == "delete_key" for action, _, _, _ in operations):
+                    self.pool.discard(self.hkeys[hive], subpath, include_subkeys=True)
+
+    def stats(self) -> Dict[str, int]:
+        return self.pool.stats()
+
+    def close(self):
+        self.pool.close_all()
+
+
+def _value_bytes(value_data: Any, value_type: int) -> bytes:
+    """Raw REG_* representation of a value, as RegSetValueExW expects it"""
+    if value_type == winreg.REG_DWORD:
+        return struct.pack("<I", int(value_data) & 0xFFFFFFFF)
+    if value_type == winreg.REG_QWORD:
+        return struct.pack("<Q", int(value_data) & 0xFFFFFFFFFFFFFFFF)
+    if value_type in (winreg.REG_SZ, winreg.REG_EXPAND_SZ):
+        return (str(value_data) + "\0").encode("utf-16-le")
+    if value_type == winreg.REG_MULTI_SZ:
+        return ("".join(item + "\0" for item in value_data) + "\0").encode("utf-16-le")
+    if value_data is None:
+        return b""
+    return bytes(value_data)
+
+
+class _KtmTransaction:
+    """Registry writes inside one Kernel Transaction Manager transaction (RegCreateKeyTransactedW)"""
+
+    INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+    def __init__(self, handle: int, write_access: int):
+        self.handle = handle
+        self.write_access = write_access
+        self.advapi32 = ctypes.WinDLL("advapi32")
+        self.ktmw32 = ctypes.WinDLL("ktmw32")
+        self.kernel32 = ctypes.WinDLL("kernel32")
+        self.advapi32.RegCloseKey.argtypes = [ctypes.c_void_p]
+
+    @classmethod
+    def begin(cls, write_access: int) -> Optional["_KtmTransaction"]:
+        """Starts a transaction, or returns None where KTM is unavailable"""
+        if not WINREG_AVAILABLE or not hasattr(ctypes, "WinDLL"):
+            return None
+        try:
+            ktmw32 = ctypes.WinDLL("ktmw32")
+            ktmw32.CreateTransaction.restype = ctypes.c_void_p
+            handle = ktmw32.CreateTransaction(None, None, 0, 0, 0, 0, ctypes.c_wchar_p("ASX Hub registry batch"))
+        except (OSError, AttributeError):
+            return None
+        if not handle or handle == cls.INVALID_HANDLE_VALUE:
+            return None
+        return cls(handle, write_access)
+
+    @staticmethod
+    def _hkey(hkey: int) -> ctypes.c_void_p:
+        # Предопределённые HKEY - знаковые 32-битные значения, расширенные до указателя
+        return ctypes.c_void_p(ctypes.c_long(hkey).value)
+
+    @staticmethod
+    def _check(status: int):
+        if status != 0:
+            raise ctypes.WinError(status)
+
+    def apply_group(self, hkey: int, subpath: str, operations: List[Tuple[str, Optional[str], Any, Optional[int]]]):
+        transaction = ctypes.c_void_p(self.handle)
+        if operations and operations[0][0] == "delete_key":
+            status = self.advapi32.RegDeleteKeyTransactedW(
+                self._hkey(hkey), ctypes.c_wchar_p(subpath), winreg.KEY_WOW64_64KEY, 0, transaction, None)
+            if status != 2:  # ERROR_FILE_NOT_FOUND - удалять нечего
+                self._check(status)
+            return
+
+        key = ctypes.c_void_p()
+        if any(action == "set" for action, _, _, _ in operations):
+            status = self.advapi32.RegCreateKeyTransactedW(
+                self._hkey(hkey), ctypes.c_wchar_p(subpath), 0, None, 0, self.write_access, None,
+                ctypes.byref(key), None, transaction, None)
+        else:
+            status = self.advapi32.RegOpenKeyTransactedW(
+                self._hkey(hkey), ctypes.c_wchar_p(subpath), 0, self.write_access,
+                ctypes.byref(key), transaction, None)
+            if status == 2:
+                return
+        self._check(status)
+
+        try:
+            for action, value_name, value_data, value_type in operations:
+                if action == "set":
+                    data = _value_bytes(value_data, value_type)
+                    status = self.advapi32.RegSetValueExW(
+                        key, ctypes.c_wchar_p(value_name), 0, value_type, ctypes.c_char_p(data), len(data))
+                    self._check(status)
+                elif action == "delete_value":
+                    status = self.advapi32.RegDeleteValueW(key, ctypes.c_wchar_p(value_name))
+                    if status != 2:
+                        self._check(status)
+        finally:
+            self.advapi32.RegCloseKey(key)
+
+    def commit(self):
+        if not self.ktmw32.CommitTransaction(ctypes.c_void_p(self.handle)):
+            raise ctypes.WinError()
+
+    def rollback(self):
+        self.ktmw32.RollbackTransaction(ctypes.c_void_p(self.handle))
+
+    def close(self):
+        self.kernel32.CloseHandle(ctypes.c_void_p(self.handle))
+
+
+class _MemoryKey:
+    __slots__ = ("path", "values")
+
+    def __init__(self, path: str):
+        self.path = path
+        # имя в нижнем регистре -> (имя, данные, тип)
+        self.values: Dict[str, Tuple[str, Any, int]] = {}
+
+
+class MemoryBackend(RegistryBackend):
+    """In-memory registry, optionally seeded from a .reg export"""
+
+    def __init__(self, reg_text: Optional[str] = None):
+        self.lock = threading.RLock()
+        self._keys: Dict[Tuple[str, str], _MemoryKey] = {}
+        self.reads = 0
+        self.writes = 0
+        self.version = 0
+        self._in_batch = False
+        if reg_text:
+            self.load_reg(reg_text)
+
+    @classmethod
+    def from_reg_file(cls, path: str) -> "MemoryBackend":
+        backend = cls()
+        backend.load_reg(read_reg_file(path)[0])
+        return backend
+
+    def _find(self, hive: str, subpath: str) -> _MemoryKey:
+        key = self._keys.get((hive, subpath.lower()))
+        if key is None:
+            raise FileNotFoundError(f"{hive}\\{subpath}")
+        return key
+
+    def _create(self, hive: str, subpath: str) -> _MemoryKey:
+        # Как и CreateKeyEx, создаём все недостающие родительские ключи
+        parts = [part for part in subpath.split("\\") if part]
+        key = None
+        for depth in range(1, len(parts) + 1):
+            path = "\\".join(parts[:depth])
+            key = self._keys.get((hive, path.lower()))
+            if key is None:
+                key = _MemoryKey(path)
+                self._keys[(hive, path.lower())] = key
+        return key
+
+    def get_value(self, hive: str, subpath: str, value_name: str) -> Tuple[Any, int]:
+        with self.lock:
+            self.reads += 1
+            entry = self._find(hive, subpath).values.get(value_name.lower())
+            if entry is None:
+                raise FileNotFoundError(value_name)
+            return entry[1], entry[2]
+
+    def get_values(self, hive: str, subpath: str, value_names: Iterable[str]) -> Dict[str, Any]:
+        with self.lock:
+            self.reads += 1
+            key = self._find(hive, subpath)
+            values = {}
+            for name in value_names:
+                entry = key.values.get(name.lower())
+                if entry is not None:
+                    values[name.lower()] = entry[1]
+            return values
+
+    def set_value(self, hive: str, subpath: str, value_name: str, value_data: Any, value_type: int):
+        with self.lock:
+            self.writes += 1
+            self._create(hive, subpath).values[value_name.lower()] = (value_name, value_data, value_type)
+            self._changed()
+
+    def delete_value(self, hive: str, subpath: str, value_name: str):
+        with self.lock:
+            key = self._find(hive, subpath)
+            if key.values.pop(value_name.lower(), None) is None:
+                raise FileNotFoundError(value_name)
+            self.writes += 1
+            self._changed()
+
+    def delete_key(self, hive: str, subpath: str):
+        with self.lock:
+            self._find(hive, subpath)
+            if self.enum_subkeys(hive, subpath):
+                # winreg.DeleteKey тоже не удаляет ключи с подключами
+                raise OSError(5, "Key has subkeys", subpath)
+            del self._keys[(hive, subpath.lower())]
+            self.writes += 1
+            self._changed()
+
+    def delete_tree(self, hive: str, subpath: str):
+        with self.lock:
+            prefix = subpath.lower() + "\\"
+            for key_id in list(self._keys):
+                if key_id[0] == hive and (key_id[1] == subpath.lower() or key_id[1].startswith(prefix)):
+                    del self._keys[key_id]
+            self._changed()
+
+    def enum_subkeys(self, hive: str, subpath: str) -> List[str]:
+        with self.lock:
+            parent = self._find(hive, subpath)
+            prefix = parent.path.lower() + "\\"
+            names = []
+            for (key_hive, key_path), key in self._keys.items():
+                if key_hive == hive and key_path.startswith(prefix) and "\\" not in key_path[len(prefix):]:
+                    names.append(key.path.rsplit("\\", 1)[-1])
+            return sorted(names, key=str.lower)
+
+    def get_key_values(self, hive: str, subpath: str) -> List[Tuple[str, Any, int]]:
+        with self.lock:
+            self.reads += 1
+            return list(self._find(hive, subpath).values.values())
+
+    def create_key(self, hive: str, subpath: str):
+        with self.lock:
+            self._create(hive, subpath)
+            self._changed()
+
+    def apply_batch(self, groups: List[WriteGroup]):
+        # Под общей блокировкой пакет атомарен для читателей; файл сохраняется один раз
+        with self.lock:
+            self._in_batch = True
+            try:
+                super().apply_batch(groups)
+            finally:
+                self._in_batch = False
+                self._changed()
+
+    def key_fingerprint(self, hive: str, subpath: str) -> Any:
+        # Общий счётчик изменений: грубо, но для подменного реестра достаточно
+        with self.lock:
+            return self.version if (hive, subpath.lower()) in self._keys else None
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"keys": len(self._keys), "reads": self.reads, "writes": self.writes}
+
+    def _changed(self):
+        """Called after every mutation; subclasses extend it"""
+        self.version += 1
+
+    def load_reg(self, text: str):
+        """Applies the contents of a .reg file"""
+        with self.lock:
+            for action, hive, subpath, value_name, value_data, value_type in parse_reg(text):
+                if action == "key":
+                    self._create(hive, subpath)
+                elif action == "delete_key":
+                    self.delete_tree(hive, subpath)
+                elif action == "set":
+                    self._create(hive, subpath).values[value_name.lower()] = (value_name, value_data, value_type)
+                elif action == "delete_value":
+                    key = self._keys.get((hive, subpath.lower()))
+                    if key is not None:
+                        key.values.pop(value_name.lower(), None)
+            self.version += 1
+
+    def export_reg(self) -> str:
+        """Serialises the whole store in regedit's 'Version 5.00' format"""
+        with self.lock:
+            lines = ["Windows Registry Editor Version 5.00", ""]
+            for (hive, _), key in sorted(self._keys.items(), key=lambda item: (item[0][0], item[0][1])):
+                lines.append(f"[{hive}\\{key.path}]")
+                for name, data, value_type in sorted(key.values.values(), key=lambda entry: entry[0].lower()):
+                    lines.append(format_reg_value(name, data, value_type))
+                lines.append("")
+            return "\r\n".join(lines) + "\r\n"
+
+
+class RegFileBackend(MemoryBackend):
+    """MemoryBackend persisted to a .reg file; every mutation is written back atomically"""
+
+    def __init__(self, path: str, autosave: bool = True):
+        self.path = path
+        self.autosave = autosave
+        self.encoding = "utf-16"
+        self._loading = True
+        super().__init__()
+        if os.path.exists(path):
+            text, self.encoding = read_reg_file(path)
+            self.load_reg(text)
+        self._loading = False
+
+    def _changed(self):
+        super()._changed()
+        if self.autosave and not self._loading and not self._in_batch:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding=self.encoding, newline="") as f:
+                f.write(self.export_reg())
+            os.replace(temp_path, self.path)
+
+
+# --- .reg format ---
+
+_KEY_LINE = re.compile(r"^\[(-?)([^\]]+)\]$")
+_VALUE_LINE = re.compile(r'^(@|"(?:[^"\\]|\\.)*")\s*=\s*(.*)$')
+
+
+def read_reg_file(path: str) -> Tuple[str, str]:
+    """Reads a .reg file, returns (text, encoding). regedit exports are UTF-16 LE"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if raw.startswith(b"\xff\xfe") or raw.startswith(b"\xfe\xff"):
+        return raw.decode("utf-16"), "utf-16"
+    if raw.startswith(b"\xef\xbb\xbf"):
+        return raw.decode("utf-8-sig"), "utf-8-sig"
+    try:
+        return raw.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return raw.decode("cp1251"), "cp1251"
+
+
+def _split_key_path(full_path: str) -> Tuple[str, str]:
+    parts = full_path.split("\\", 1)
+    hive = HIVE_ALIASES.get(parts[0].upper(), parts[0].upper())
+    return hive, parts[1] if len(parts) > 1 else ""
+
+
+def _unescape(quoted: str) -> str:
+    return re.sub(r'\\(.)', r'\1', quoted[1:-1])
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _parse_reg_data(raw: str) -> Tuple[Any, int]:
+    if raw.startswith('"'):
+        return _unescape(raw), winreg.REG_SZ
+    if raw.lower().startswith("dword:"):
+        return int(raw[6:], 16), winreg.REG_DWORD
+    match = re.match(r"^hex(?:\(([0-9a-fA-F]+)\))?:(.*)$", raw, re.S)
+    if not match:
+        raise ValueError(f"Unsupported .reg value: {raw[:40]}")
+    value_type = int(match.group(1), 16) if match.group(1) else winreg.REG_BINARY
+    hex_bytes = [part for part in re.split(r"[,\s\\]+", match.group(2)) if part]
+    data = bytes(int(part, 16) for part in hex_bytes)
+
+    if value_type in (winreg.REG_SZ, winreg.REG_EXPAND_SZ):
+        return data.decode("utf-16-le").rstrip("\0"), value_type
+    if value_type == winreg.REG_MULTI_SZ:
+        return [item for item in data.decode("utf-16-le").rstrip("\0").split("\0") if item], value_type
+    if value_type == winreg.REG_DWORD:
+        return int.from_bytes(data[:4].ljust(4, b"\0"), "little"), value_type
+    if value_type == winreg.REG_QWORD:
+        return int.from_bytes(data[:8].ljust(8, b"\0"), "little"), value_type
+    return data, value_type
+
+
+def parse_reg(text: str) -> List[Tuple[str, str, str, Optional[str], Any, Optional[int]]]:
+    """
+    Parses .reg text into (action, hive, subpath, value_name, data, type) tuples.
+    Actions: 'key', 'delete_key', 'set', 'delete_value'.
+    """
+    # Склеиваем строки-продолжения (длинные hex-значения)
+    logical_lines = []
+    buffer = ""
+    for line in text.splitlines():
+        stripped = line.strip()
+        if buffer:
+            stripped = buffer + stripped
+            buffer = ""
+        if stripped.endswith("\\") and not stripped.startswith("["):
+            buffer = stripped[:-1]
+            continue
+        logical_lines.append(stripped)
+    if buffer:
+        logical_lines.append(buffer)
+
+    operations = []
+    hive, subpath = None, None
+    for line in logical_lines:
+        if not line or line.startswith(";") or line.startswith("Windows Registry Editor") or line == "REGEDIT4":
+            continue
+
+        key_match = _KEY_LINE.match(line)
+        if key_match:
+            hive, subpath = _split_key_path(key_match.group(2))
+            operations.append(("delete_key" if key_match.group(1) else "key", hive, subpath, None, None, None))
+            if key_match.group(1):
+                hive, subpath = None, None
+            continue
+
+        value_match = _VALUE_LINE.match(line)
+        if not value_match or hive is None:
+            continue
+        raw_name, raw_data = value_match.groups()
+        value_name = "" if raw_name == "@" else _unescape(raw_name)
+        if raw_data.strip() == "-":
+            operations.append(("delete_value", hive, subpath, value_name, None, None))
+        else:
+            data, value_type = _parse_reg_data(raw_data.strip())
+            operations.append(("set", hive, subpath, value_name, data, value_type))
+    return operations
+
+
+def format_reg_value(value_name: str, value_data: Any, value_type: int) -> str:
+    name = "@" if value_name == "" else f'"{_escape(value_name)}"'
+    if value_type == winreg.REG_SZ:
+        return f'{name}="{_escape(str(value_data))}"'
+    if value_type == winreg.REG_DWORD:
+        return f"{name}=dword:{int(value_data) & 0xFFFFFFFF:08x}"
+
+    if value_type == winreg.REG_QWORD:
+        data = int(value_data).to_bytes(8, "little")
+    elif value_type == winreg.REG_EXPAND_SZ:
+        data = (str(value_data) + "\0").encode("utf-16-le")
+    elif value_type == winreg.REG_MULTI_SZ:
+        data = ("".join(item + "\0" for item in value_data) + "\0").encode("utf-16-le")
+    elif isinstance(value_data, (bytes, bytearray)):
+        data = bytes(value_data)
+    else:
+        data = str(value_data).encode("utf-16-le")
+
+    prefix = "hex" if value_type == winreg.REG_BINARY else f"hex({value_type:x})"
+    return f"{name}={prefix}:" + ",".join(f"{byte:02x}" for byte in data)
+
+
+# --- Выбор бэкенда по умолчанию ---
+
+_default_backend: Optional[RegistryBackend] = None
+_default_lock = threading.Lock()
+
+
+def create_backend(spec: str) -> Optional[RegistryBackend]:
+    """
+    Builds a backend from a spec string:
+    'winreg', 'memory', 'memory:<seed.reg>' or 'regfile:<path.reg>'.
+    """
+    kind, _, argument = spec.partition(":")
+    kind = kind.strip().lower()
+    if kind == "winreg":
+        return WinregBackend() if WINREG_AVAILABLE else None
+    if kind == "memory":
+        return MemoryBackend.from_reg_file(argument) if argument else MemoryBackend()
+    if kind == "regfile":
+        return RegFileBackend(argument)
+    raise ValueError(f"Unknown registry backend: {spec}")
+
+
+def get_default_backend() -> Optional[RegistryBackend]:
+    """
+    Backend used by RegistryHandler() when none is passed: the ASX_REGISTRY_BACKEND
+    environment variable, otherwise the live registry (None where winreg is missing).
+    """
+    global _default_backend
+    with _default_lock:
+        if _default_backend is None:
+            spec = os.environ.get("ASX_REGISTRY_BACKEND")
+            _default_backend = create_backend(spec) if spec else create_backend("winreg")
+            if _default_backend is not None:
+                atexit.register(_default_backend.close)
+        return _default_backend
+
+
+def set_default_backend(backend: Optional[RegistryBackend]):
+    """Replaces the backend shared by all RegistryHandler instances created without one"""
+    global _default_backend
+    with _default_lock:
+        _default_backend = backend
@@ -0,0 +1,270 @@
+import time
+import threading
+import ctypes
+from typing import Optional, Any, Tuple, Dict, List
+
+from utils.registry_backends import RegistryBackend
+
+# Флаги RegNotifyChangeKeyValue
+REG_NOTIFY_CHANGE_NAME = 0x00000001
+REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+INFINITE = 0xFFFFFFFF
+WAIT_FAILED = 0xFFFFFFFF
+# WaitForMultipleObjects ждёт не более 64 объектов, один из них - событие пробуждения
+MAX_WATCHED_ROOTS = 63
+
+
+def _watch_root(subpath: str) -> str:
+    """Parent key watched (with its subtree) on behalf of a cached key"""
+    norm_path = subpath.lower()
+    return norm_path.rsplit("\\", 1)[0] if "\\" in norm_path else norm_path
+
+
+class _ChangeNotifier(threading.Thread):
+    """Background thread that arms RegNotifyChangeKeyValue on watched roots"""
+
+    def __init__(self, cache: "RegistryReadCache"):
+        super().__init__(name="registry-change-notifier", daemon=True)
+        self.cache = cache
+        self.advapi32 = ctypes.WinDLL("advapi32")
+        self.kernel32 = ctypes.WinDLL("kernel32")
+        self.kernel32.CreateEventW.restype = ctypes.c_void_p
+        self.kernel32.WaitForMultipleObjects.restype = ctypes.c_uint32
+        self.wake_event = self.kernel32.CreateEventW(None, False, False, None)
+        self.lock = threading.Lock()
+        self.pending: List[Tuple[str, str]] = []
+        # (куст, корень) -> (ключ winreg, событие)
+        self.armed: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+        self.running = True
+
+    def watch(self, hive: str, root: str) -> bool:
+        """Queues a root for watching. Returns False when the handle limit is reached"""
+        with self.lock:
+            if len(self.armed) + len(self.pending) >= MAX_WATCHED_ROOTS:
+                return False
+            self.pending.append((hive, root))
+        self.kernel32.SetEvent(ctypes.c_void_p(self.wake_event))
+        return True
+
+    def stop(self):
+        self.running = False
+        self.kernel32.SetEvent(ctypes.c_void_p(self.wake_event))
+
+    def _arm(self, root_id: Tuple[str, str], key: Any, event: Any) -> bool:
+        # Уведомление привязано к вызывающему потоку, поэтому взводим его только здесь
+        result = self.advapi32.RegNotifyChangeKeyValue(
+            ctypes.c_void_p(int(key.handle)), True,
+            REG_NOTIFY_CHANGE_NAME | REG_NOTIFY_CHANGE_LAST_SET,
+            ctypes.c_void_p(event), True
+        )
+        return result == 0
+
+    def _add_pending(self):
+        with self.lock:
+            pending, self.pending = self.pending, []
+        for root_id in pending:
+            if root_id in self.armed:
+                continue
+            try:
+                key = self.cache.backend.open_notification_key(*root_id)
+            except Exception:
+                self.cache.mark_unwatched(root_id)
+                continue
+            event = self.kernel32.CreateEventW(None, False, False, None)
+            if event and self._arm(root_id, key, event):
+                self.armed[root_id] = (key, event)
+                self.cache.mark_watched(root_id)
+            else:
+                self.cache.mark_unwatched(root_id)
+
+    def run(self):
+        try:
+            while self.running:
+                self._add_pending()
+                root_ids = list(self.armed)
+                handles = (ctypes.c_void_p * (len(root_ids) + 1))(
+                    self.wake_event, *[self.armed[root_id][1] for root_id in root_ids]
+                )
+                index = self.kernel32.WaitForMultipleObjects(len(handles), handles, False, INFINITE)
+                if index == WAIT_FAILED or index > len(root_ids):
+                    break
+                if index == 0:
+                    continue  # Новые корни или остановка
+
+                root_id = root_ids[index - 1]
+                self.cache.invalidate_root(root_id)
+                key, event = self.armed[root_id]
+                if not self._arm(root_id, key, event):
+                    del self.armed[root_id]
+                    self.cache.mark_unwatched(root_id)
+        finally:
+            # Без уведомлений кэш переходит на проверку отпечатков
+            for root_id in list(self.armed):
+                self.cache.mark_unwatched(root_id)
+            self.armed.clear()
+
+
+class RegistryReadCache:
+    """
+    Read-through cache of registry values keyed by (hive, subpath, value name).
+    Entries are invalidated by RegNotifyChangeKeyValue watchers on the parent keys of
+    cached keys; where notifications are unavailable (other backends, too many roots,
+    a failed watcher) the key's fingerprint is re-checked at most every poll_interval.
+    """
+
+    def __init__(self, backend: RegistryBackend, poll_interval: float = 1.0, use_notifications: bool = True):
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.lock = threading.RLock()
+        self._values: Dict[Tuple[str, str, str], Any] = {}
+        # (куст, ключ) -> (отпечаток, время проверки)
+        self._fingerprints: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._root_generations: Dict[Tuple[str, str], int] = {}
+        self._watched_roots = set()
+        self._unwatched_roots = set()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self._notifier: Optional[_ChangeNotifier] = None
+        if use_notifications and _backend_supports_notifications(backend):
+            try:
+                self._notifier = _ChangeNotifier(self)
+                self._notifier.start()
+            except (AttributeError, OSError):
+                self._notifier = None
+
+    # --- уведомления ---
+
+    def mark_watched(self, root_id: Tuple[str, str]):
+        with self.lock:
+            self._watched_roots.add(root_id)
+            self._unwatched_roots.discard(root_id)
+            # Пока уведомление не было взведено, кэш мог пропустить изменения
+            self._drop_root(root_id)
+
+    def mark_unwatched(self, root_id: Tuple[str, str]):
+        with self.lock:
+            self._watched_roots.discard(root_id)
+            self._unwatched_roots.add(root_id)
+
+    def invalidate_root(self, root_id: Tuple[str, str]):
+        with self.lock:
+            self._drop_root(root_id)
+
+    def _drop_root(self, root_id: Tuple[str, str]):
+        hive, root = root_id
+        prefix = root + "\\"
+        for value_key in [k for k in self._values if k[0] == hive and (k[1] == root or k[1].startswith(prefix))]:
+            del self._values[value_key]
+        self._root_generations[root_id] = self._root_generations.get(root_id, 0) + 1
+        self.generation += 1
+        self.invalidations += 1
+
+    def _ensure_watched(self, hive: str, subpath: str):
+        root_id = (hive, _watch_root(subpath))
+        if root_id in self._watched_roots or root_id in self._unwatched_roots:
+            return
+        # Пока уведомление не взведено, корень проверяется по отпечаткам
+        self._unwatched_roots.add(root_id)
+        if self._notifier is not None and self._notifier.is_alive():
+            self._notifier.watch(*root_id)
+
+    # --- чтение ---
+
+    def _is_fresh(self, hive: str, norm_path: str) -> bool:
+        """Fingerprint check for keys that no watcher covers"""
+        root_id = (hive, _watch_root(norm_path))
+        if root_id in self._watched_roots:
+            return True
+
+        now = time.monotonic()
+        known = self._fingerprints.get((hive, norm_path))
+        if known is not None and now - known[1] < self.poll_interval:
+            return True
+
+        fingerprint = self.backend.key_fingerprint(hive, norm_path)
+        if known is not None and known[0] == fingerprint:
+            self._fingerprints[(hive, norm_path)] = (fingerprint, now)
+            return True
+
+        # Ключ изменился (или ещё не проверялся) - сбрасываем его значения
+        for value_key in [k for k in self._values if k[0] == hive and k[1] == norm_path]:
+            del self._values[value_key]
+        if known is not None:
+            self.generation += 1
+            self.invalidations += 1
+        self._fingerprints[(hive, norm_path)] = (fingerprint, now)
+        return False
+
+    def lookup(self, hive: str, subpath: str, value_name: str) -> Tuple[bool, Any]:
+        norm_path = subpath.lower()
+        value_key = (hive, norm_path, value_name.lower())
+        with self.lock:
+            # _is_fresh() сам выбрасывает значения изменившегося ключа
+            if value_key in self._values and self._is_fresh(hive, norm_path) and value_key in self._values:
+                self.hits += 1
+                return True, self._values[value_key]
+            self.misses += 1
+            return False, None
+
+    def begin_read(self, hive: str, subpath: str) -> int:
+        """Returns a token to pass to store(); a change seen meanwhile makes the store a no-op"""
+        with self.lock:
+            self._ensure_watched(hive, subpath)
+            if (hive, _watch_root(subpath)) not in self._watched_roots:
+                self._is_fresh(hive, subpath.lower())
+            return self._root_generations.get((hive, _watch_root(subpath)), 0)
+
+    def store(self, hive: str, subpath: str, values: Dict[str, Any], token: int):
+        with self.lock:
+            if self._root_generations.get((hive, _watch_root(subpath)), 0) != token:
+                return
+            norm_path = subpath.lower()
+            for value_name, value in values.items():
+                self._values[(hive, norm_path, value_name.lower())] = value
+
+    # --- собственные записи ---
+
+    def record_write(self, hive: str, subpath: str, value_name: Optional[str] = None, value: Any = None,
+                     deleted_key: bool = False):
+        """Keeps the cache coherent with writes made through RegistryHandler"""
+        norm_path = subpath.lower()
+        with self.lock:
+            if deleted_key:
+                prefix = norm_path + "\\"
+                for value_key in [k for k in self._values if k[0] == hive and (k[1] == norm_path or k[1].startswith(prefix))]:
+                    del self._values[value_key]
+            elif value_name is not None:
+                self._values[(hive, norm_path, value_name.lower())] = value
+            self._fingerprints.pop((hive, norm_path), None)
+            self.generation += 1
+
+    def clear(self):
+        with self.lock:
+            self._values.clear()
+            self._fingerprints.clear()
+            self.generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "entries": len(self._values),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "watched_roots": len(self._watched_roots),
+                "polled_roots": len(self._unwatched_roots),
+                "generation": self.generation,
+            }
+
+    def close(self):
+        if self._notifier is not None:
+            self._notifier.stop()
+
+
+def _backend_supports_notifications(backend: RegistryBackend) -> bool:
+    if type(backend).open_notification_key is RegistryBackend.open_notification_key:
+        return False
+    return hasattr(ctypes, "WinDLL")
@@ -1,113 +1,398 @@
-import os
-import platform
-import winreg
-from typing import Optional, Any, Tuple
+import threading
+from contextlib import contextmanager
+from typing import Optional, Any, Tuple, Dict, Iterable, List
+
+from utils.registry_backends import RegistryBackend, HIVE_ALIASES, get_default_backend, winreg
+from utils.registry_cache import RegistryReadCache
+from utils.registry_transaction import RegistryTransaction, RegistryTransactionError
+
+
+class _PrefetchedValues:
+    """Values read in bulk by RegistryHandler.prefetch() and served to get_registry_value"""
 
-class RegistryHandler:
     def __init__(self):
-        self.hkey_map = {
-            'HKEY_LOCAL_MACHINE': winreg.HKEY_LOCAL_MACHINE,
-            'HKLM': winreg.HKEY_LOCAL_MACHINE,
-            'HKEY_CURRENT_USER': winreg.HKEY_CURRENT_USER,
-            'HKCU': winreg.HKEY_CURRENT_USER
-        }
-
-    def _parse_key_path(self, key_path: str) -> Tuple[Any, str]:
-        """Parse registry path and return hkey and subpath"""
+        self.lock = threading.Lock()
+        self._scopes: List[Dict[Tuple[str, str, str], Any]] = []
+
+    def push(self, values: Dict[Tuple[str, str, str], Any]):
+        with self.lock:
+            self._scopes.append(values)
+
+    def pop(self, values: Dict[Tuple[str, str, str], Any]):
+        with self.lock:
+            for i in range(len(self._scopes) - 1, -1, -1):
+                if self._scopes[i] is values:
+                    del self._scopes[i]
+                    break
+
+    def lookup(self, value_key: Tuple[str, str, str]) -> Tuple[bool, Any]:
+        with self.lock:
+            for values in reversed(self._scopes):
+                if value_key in values:
+                    return True, values[value_key]
+        return False, None
+
+    def forget(self, hive: str, subpath: str, value_name: Optional[str] = None):
+        """Drops prefetched values that a write made outdated"""
+        norm_path = subpath.lower()
+        with self.lock:
+            for values in self._scopes:
+                for value_key in list(values):
+                    if value_key[0] != hive:
+                        continue
+                    if value_name is None:
+                        if value_key[1] == norm_path or value_key[1].startswith(norm_path + "\\"):
+                            del values[value_key]
+                    elif value_key[1] == norm_path and value_key[2] == value_name.lower():
+                        del values[value_key]
+
+
+_prefetched = _PrefetchedValues()
+
+# Все значения, которые когда-либо читались через get_registry_value: (куст, путь, имя) -> (key_path, value_name)
+_observed_reads: Dict[Tuple[str, str, str], Tuple[str, str]] = {}
+_observed_lock = threading.Lock()
+
+# Записи чтений текущего потока (RegistryHandler.record_reads())
+_recorders = threading.local()
+
+# Кэши чтения, по одному на бэкенд: id(бэкенда) -> (бэкенд, кэш)
+_read_caches: Dict[int, Tuple[RegistryBackend, RegistryReadCache]] = {}
+_read_caches_lock = threading.Lock()
+
+
+# Открытые транзакции текущего потока (RegistryHandler.transaction())
+_transactions = threading.local()
+
+
+def _active_transaction(backend: RegistryBackend) -> Optional[RegistryTransaction]:
+    transaction = getattr(_transactions, "current", None)
+    if transaction is not None and transaction.backend is backend:
+        return transaction
+    return None
+
+
+def _read_cache_for(backend: RegistryBackend) -> RegistryReadCache:
+    with _read_caches_lock:
+        entry = _read_caches.get(id(backend))
+        if entry is None or entry[0] is not backend:
+            entry = (backend, RegistryReadCache(backend))
+            _read_caches[id(backend)] = entry
+        return entry[1]
+
+
+class RegistryHandler:
+    def __init__(self, backend: Optional[RegistryBackend] = None, use_cache: bool = True):
+        # Без явного бэкенда используется общий (живой реестр или ASX_REGISTRY_BACKEND)
+        self._backend = backend
+        self.use_cache = use_cache
+
+    @property
+    def backend(self) -> Optional[RegistryBackend]:
+        return self._backend if self._backend is not None else get_default_backend()
+
+    @property
+    def cache(self) -> Optional[RegistryReadCache]:
+        backend = self.backend
+        if backend is None or not self.use_cache:
+            return None
+        return _read_cache_for(backend)
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Returns backend counters (hit/miss counts of the key handle pool for the live registry)"""
+        backend = self.backend
+        return backend.stats() if backend is not None else {}
+
+    def cache_stats(self) -> Dict[str, int]:
+        cache = self.cache
+        return cache.stats() if cache is not None else {}
+
+    def cache_generation(self) -> int:
+        """Counter that grows whenever a cached registry value may have changed"""
+        cache = self.cache
+        return cache.generation if cache is not None else 0
+
+    def close_pooled_handles(self):
+        """Closes all pooled key handles"""
+        backend = self.backend
+        if backend is not None:
+            backend.close()
+
+    @staticmethod
+    def observed_reads() -> List[Tuple[str, str]]:
+        """Returns every (key_path, value_name) read so far, suitable for prefetch()"""
+        with _observed_lock:
+            return list(_observed_reads.values())
+
+    def _value_key(self, key_path: str, value_name: str) -> Tuple[str, str, str]:
+        hive, subpath = self._parse_key_path(key_path)
+        return hive, subpath.lower(), value_name.lower()
+
+    def _parse_key_path(self, key_path: str) -> Tuple[str, str]:
+        """Parse registry path and return hive name and subpath"""
         parts = key_path.split('\\', 1)
 
         if len(parts) == 1:
-            return winreg.HKEY_LOCAL_MACHINE, key_path
+            return 'HKEY_LOCAL_MACHINE', key_path
 
-        hkey_str = parts[0].upper()
-        hkey = self.hkey_map.get(hkey_str, winreg.HKEY_LOCAL_MACHINE)
+        hive = HIVE_ALIASES.get(parts[0].upper(), 'HKEY_LOCAL_MACHINE')
 
-        return hkey, parts[1] if len(parts) > 1 else ""
+        return hive, parts[1] if len(parts) > 1 else ""
 
     def set_registry_value(self, key_path: str, value_name: str, value_data: Any,
                            value_type: int = winreg.REG_DWORD) -> bool:
         """Set registry value with better error handling"""
-        if platform.system() != "Windows":
+        backend = self.backend
+        if backend is None:
             return False
 
         try:
-            hkey, subpath = self._parse_key_path(key_path)
-
-            try:
-                key = winreg.CreateKeyEx(hkey, subpath, 0, winreg.KEY_WRITE | winreg.KEY_WOW64_64KEY)
-            except Exception:
-                return False
-
-            try:
-                winreg.SetValueEx(key, value_name, 0, value_type, value_data)
+            hive, subpath = self._parse_key_path(key_path)
+            transaction = _active_transaction(backend)
+            if transaction is not None:
+                transaction.set_value(hive, subpath, value_name, value_data, value_type)
                 return True
-            except Exception:
-                return False
-            finally:
-                winreg.CloseKey(key)
-
+            _prefetched.forget(hive, subpath, value_name)
+            backend.set_value(hive, subpath, value_name, value_data, value_type)
+            self._record_write(hive, subpath, value_name, value_data)
+            return True
         except Exception:
             return False
 
+    @staticmethod
+    @contextmanager
+    def record_reads():
+        """
+        Collects {(key_path, value_name): value} for every get_registry_value() call
+        made on this thread inside the block (nested blocks see the reads too).
+        """
+        stack = getattr(_recorders, "stack", None)
+        if stack is None:
+            stack = _recorders.stack = []
+        reads: Dict[Tuple[str, str], Any] = {}
+        stack.append(reads)
+        try:
+            yield reads
+        finally:
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i] is reads:
+                    del stack[i]
+                    break
+
     def get_registry_value(self, key_path: str, value_name: str) -> Optional[Any]:
         """Get registry value with better error handling"""
-        if platform.system() != "Windows":
+        value = self._read_value(key_path, value_name)
+        for reads in getattr(_recorders, "stack", ()):
+            reads.setdefault((key_path, value_name), value)
+        return value
+
+    def _read_value(self, key_path: str, value_name: str) -> Optional[Any]:
+        backend = self.backend
+        if backend is None:
             return None
 
         try:
-            hkey, subpath = self._parse_key_path(key_path)
+            value_key = self._value_key(key_path, value_name)
+            with _observed_lock:
+                _observed_reads.setdefault(value_key, (key_path, value_name))
 
-            try:
-                key = winreg.OpenKey(hkey, subpath, 0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY)
-            except FileNotFoundError:
-                return None
-            except Exception:
-                return None
+            hive, subpath = self._parse_key_path(key_path)
+            transaction = _active_transaction(backend)
+            if transaction is not None:
+                found, value = transaction.lookup(hive, subpath, value_name)
+                if found:
+                    return value
 
-            try:
-                value, _ = winreg.QueryValueEx(key, value_name)
+            found, value = _prefetched.lookup(value_key)
+            if found:
                 return value
+
+            cache = self.cache
+            if cache is None:
+                return backend.get_value(hive, subpath, value_name)[0]
+
+            found, value = cache.lookup(hive, subpath, value_name)
+            if found:
+                return value
+            token = cache.begin_read(hive, subpath)
+            try:
+                value = backend.get_value(hive, subpath, value_name)[0]
             except FileNotFoundError:
-                return None
-            except Exception:
-                return None
-            finally:
-                winreg.CloseKey(key)
+                value = None
+            cache.store(hive, subpath, {value_name: value}, token)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception:
+            return None
+
+    def get_many(self, requests: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Any]:
+        """
+        Reads several values at once. Requests are grouped by key, every distinct key
+        is opened once and, when many of its values are wanted, read in a single
+        EnumValue sweep. Missing keys/values map to None.
+        """
+        requests = list(requests)
+        results: Dict[Tuple[str, str], Any] = {request: None for request in requests}
+        backend = self.backend
+        if backend is None:
+            return results
+
+        transaction = _active_transaction(backend)
+        groups: Dict[Tuple[str, str], Tuple[str, List[Tuple[str, str]]]] = {}
+        for key_path, value_name in requests:
+            hive, subpath = self._parse_key_path(key_path)
+            if transaction is not None:
+                found, value = transaction.lookup(hive, subpath, value_name)
+                if found:
+                    results[(key_path, value_name)] = value
+                    continue
+            group = groups.setdefault((hive, subpath.lower()), (subpath, []))
+            group[1].append((key_path, value_name))
+
+        cache = self.cache
+        for (hive, _), (subpath, group_requests) in groups.items():
+            values: Dict[str, Any] = {}
+            missing = []
+            for _, value_name in group_requests:
+                found, value = cache.lookup(hive, subpath, value_name) if cache is not None else (False, None)
+                if found:
+                    values[value_name.lower()] = value
+                else:
+                    missing.append(value_name)
+
+            if missing:
+                token = cache.begin_read(hive, subpath) if cache is not None else 0
+                try:
+                    read = backend.get_values(hive, subpath, missing)
+                except FileNotFoundError:
+                    read = {}
+                except Exception:
+                    continue
+                read = {name.lower(): read.get(name.lower()) for name in missing}
+                values.update(read)
+                if cache is not None:
+                    cache.store(hive, subpath, read, token)
+
+            for key_path, value_name in group_requests:
+                results[(key_path, value_name)] = values.get(value_name.lower())
+
+        return results
+
+    def enum_subkeys(self, key_path: str) -> List[str]:
+        """Names of the key's subkeys; an empty list when the key is missing"""
+        backend = self.backend
+        if backend is None:
+            return []
+
+        try:
+            hive, subpath = self._parse_key_path(key_path)
+            return backend.enum_subkeys(hive, subpath)
+        except Exception:
+            return []
+
+    def key_fingerprint(self, key_path: str) -> Optional[Any]:
+        """Token that changes with the key (last write time for the live registry), None if unknown"""
+        backend = self.backend
+        if backend is None:
+            return None
 
+        try:
+            hive, subpath = self._parse_key_path(key_path)
+            fingerprint = backend.key_fingerprint(hive, subpath)
         except Exception:
             return None
+        # Значения без устойчивого представления ("всегда изменился") сравнивать бессмысленно
+        return fingerprint if isinstance(fingerprint, (int, str)) else None
+
+    def _record_write(self, hive: str, subpath: str, value_name: Optional[str] = None, value: Any = None,
+                      deleted_key: bool = False):
+        cache = self.cache
+        if cache is not None:
+            cache.record_write(hive, subpath, value_name, value, deleted_key=deleted_key)
+
+    @contextmanager
+    def prefetch(self, requests: Iterable[Tuple[str, str]]):
+        """
+        Reads the values with get_many() and serves get_registry_value() calls from
+        any RegistryHandler (and any thread) from that snapshot until the block exits.
+        Writes made inside the block drop the affected values from the snapshot.
+        """
+        values: Dict[Tuple[str, str, str], Any] = {}
+        for (key_path, value_name), value in self.get_many(requests).items():
+            values[self._value_key(key_path, value_name)] = value
+
+        _prefetched.push(values)
+        try:
+            yield self
+        finally:
+            _prefetched.pop(values)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Buffers set/delete calls made through any RegistryHandler on this thread and
+        applies them on exit in one pass, grouped per key. Prior values are journaled
+        and restored if a write fails (on Windows the Kernel Transaction Manager is used
+        where available), after which RegistryTransactionError is raised. An exception
+        inside the block discards the buffered writes. Nested blocks join the outer one.
+        """
+        backend = self.backend
+        if backend is None or _active_transaction(backend) is not None:
+            yield self
+            return
+
+        transaction = RegistryTransaction(backend)
+        outer = getattr(_transactions, "current", None)
+        _transactions.current = transaction
+        try:
+            yield self
+        finally:
+            _transactions.current = outer
+
+        try:
+            transaction.commit()
+        except RegistryTransactionError:
+            # Состояние реестра после отката может отличаться от закэшированного
+            self._forget_transaction(transaction)
+            if self.cache is not None:
+                self.cache.clear()
+            raise
+        self._forget_transaction(transaction, record=True)
+
+    def _forget_transaction(self, transaction: RegistryTransaction, record: bool = False):
+        for action, hive, subpath, value_name, value_data, _ in transaction.operations:
+            _prefetched.forget(hive, subpath, value_name)
+            if not record:
+                continue
+            if action == "delete_key":
+                self._record_write(hive, subpath, deleted_key=True)
+            else:
+                self._record_write(hive, subpath, value_name, value_data)
 
     def delete_registry_value(self, key_path: str, value_name: str, ignore_not_found: bool = False) -> bool:
         """Delete registry value with better error handling and ignore_not_found option."""
-        if platform.system() != "Windows":
+        backend = self.backend
+        if backend is None:
             return False
 
         try:
-            hkey, subpath = self._parse_key_path(key_path)
-
-            try:
-                key = winreg.OpenKey(hkey, subpath, 0, winreg.KEY_WRITE | winreg.KEY_WOW64_64KEY)
-            except FileNotFoundError:
-                if ignore_not_found:
-                    return True  # Ключ не найден, но мы игнорируем
-                else:
-                    return False
-            except Exception:
-                return False
-
-            try:
-                winreg.DeleteValue(key, value_name)
+            hive, subpath = self._parse_key_path(key_path)
+            transaction = _active_transaction(backend)
+            if transaction is not None:
+                # Как и без транзакции, отсутствующее значение - это ignore_not_found
+                if self.get_registry_value(key_path, value_name) is None:
+                    return ignore_not_found
+                transaction.delete_value(hive, subpath, value_name)
                 return True
-            except FileNotFoundError:
-                if ignore_not_found:
-                    return True  # Значение не найдено, но мы игнорируем
-                else:
-                    return False
-            except Exception:
-                return False
-            finally:
-                winreg.CloseKey(key)
-
+            _prefetched.forget(hive, subpath, value_name)
+            backend.delete_value(hive, subpath, value_name)
+            self._record_write(hive, subpath, value_name, None)
+            return True
+        except FileNotFoundError:
+            # Ключ или значение не найдены
+            self._record_write(hive, subpath, value_name, None)
+            return ignore_not_found
         except Exception:
             return False
 
@@ -119,37 +404,26 @@ class RegistryHandler:
             key_path: Полный путь к удаляемому ключу.
             ignore_not_found: Если True, не вызывает исключение, если ключ не найден.
         """
-        if platform.system() != "Windows":
+        backend = self.backend
+        if backend is None:
             return False
 
         try:
-            hkey, subpath = self._parse_key_path(key_path)
-            # Разделяем подключ на родительский ключ и имя подключа
-            parent_path, subkey_name = os.path.split(subpath)
-
-            try:
-                # Открываем родительский ключ с правами KEY_ALL_ACCESS (запись + чтение)
-                parent_key = winreg.OpenKey(hkey, parent_path, 0, winreg.KEY_ALL_ACCESS | winreg.KEY_WOW64_64KEY)
-            except FileNotFoundError:
-                if ignore_not_found:
-                    return True  # Родительский ключ не найден, но мы игнорируем
-                else:
-                    return False
-            except Exception:
-                return False
-
-            try:
-                winreg.DeleteKey(parent_key, subkey_name)
-                return True  # Успешно удалили
-            except FileNotFoundError:
-                if ignore_not_found:
-                    return True  # Подключ не найден, но мы игнорируем
-                else:
-                    return False
-            except Exception:
-                return False  # Другая ошибка при удалении
-            finally:
-                winreg.CloseKey(parent_key)  # Закрываем родительский ключ
-
+            hive, subpath = self._parse_key_path(key_path)
+            transaction = _active_transaction(backend)
+            if transaction is not None:
+                key_state = transaction.key_state(hive, subpath)
+                if key_state is False or (key_state is None and not backend.key_exists(hive, subpath)):
+                    return ignore_not_found
+                transaction.delete_key(hive, subpath)
+                return True
+            _prefetched.forget(hive, subpath)
+            backend.delete_key(hive, subpath)
+            self._record_write(hive, subpath, deleted_key=True)
+            return True  # Успешно удалили
+        except FileNotFoundError:
+            # Ключ (или его родитель) не найден
+            self._record_write(hive, subpath, deleted_key=True)
+            return ignore_not_found
         except Exception:
-            return False
+            return False  # Другая ошибка при удалении
@@ -0,0 +1,105 @@
+from typing import Optional, Any, Tuple, Dict, List
+
+from utils.registry_backends import RegistryBackend, RegistryTransactionError, WriteGroup
+
+
+def _is_under(path: str, root: str) -> bool:
+    return path == root or path.startswith(root + "\\")
+
+
+class RegistryTransaction:
+    """
+    Writes and deletes buffered by RegistryHandler.transaction(). Reads made through
+    RegistryHandler inside the block see the buffered state; nothing reaches the
+    backend until commit(), which applies everything grouped per key.
+    """
+
+    def __init__(self, backend: RegistryBackend):
+        self.backend = backend
+        # (действие, куст, путь, имя, данные, тип) в порядке вызовов
+        self.operations: List[Tuple[str, str, str, Optional[str], Any, Optional[int]]] = []
+        # Буферизованные значения: (куст, путь, имя) в нижнем регистре -> данные (None - удалено)
+        self._values: Dict[Tuple[str, str, str], Any] = {}
+        self._created_keys = set()
+        self._deleted_keys = set()
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def set_value(self, hive: str, subpath: str, value_name: str, value_data: Any, value_type: int):
+        self.operations.append(("set", hive, subpath, value_name, value_data, value_type))
+        self._values[(hive, subpath.lower(), value_name.lower())] = value_data
+        # Как CreateKeyEx, запись создаёт ключ вместе с родителями
+        parts = subpath.lower().split("\\")
+        for depth in range(1, len(parts) + 1):
+            self._created_keys.add((hive, "\\".join(parts[:depth])))
+
+    def delete_value(self, hive: str, subpath: str, value_name: str):
+        self.operations.append(("delete_value", hive, subpath, value_name, None, None))
+        self._values[(hive, subpath.lower(), value_name.lower())] = None
+
+    def delete_key(self, hive: str, subpath: str):
+        norm_path = subpath.lower()
+        self.operations.append(("delete_key", hive, subpath, None, None, None))
+        for value_key in [k for k in self._values if k[0] == hive and _is_under(k[1], norm_path)]:
+            del self._values[value_key]
+        self._created_keys = {k for k in self._created_keys if not (k[0] == hive and _is_under(k[1], norm_path))}
+        self._deleted_keys.add((hive, norm_path))
+
+    def lookup(self, hive: str, subpath: str, value_name: str) -> Tuple[bool, Any]:
+        """(True, value) when the transaction decides what a read returns"""
+        norm_path = subpath.lower()
+        value_key = (hive, norm_path, value_name.lower())
+        if value_key in self._values:
+            return True, self._values[value_key]
+        if any(k[0] == hive and _is_under(norm_path, k[1]) for k in self._deleted_keys):
+            return True, None
+        return False, None
+
+    def key_state(self, hive: str, subpath: str) -> Optional[bool]:
+        """True/False when the buffered writes create/delete the key, None when they do not touch it"""
+        norm_path = subpath.lower()
+        if (hive, norm_path) in self._created_keys:
+            return True
+        if any(k[0] == hive and _is_under(norm_path, k[1]) for k in self._deleted_keys):
+            return False
+        return None
+
+    def groups(self) -> List[WriteGroup]:
+        """
+        Coalesces the buffered operations into one group per key, keeping only the last
+        write of every value. A key deletion starts a new group for that key and its
+        subkeys, so writes are never reordered across it.
+        """
+        groups: List[WriteGroup] = []
+        # (куст, путь) -> (индекс группы, {имя: индекс операции в группе})
+        open_groups: Dict[Tuple[str, str], Tuple[int, Dict[str, int]]] = {}
+
+        for action, hive, subpath, value_name, value_data, value_type in self.operations:
+            norm_path = subpath.lower()
+            if action == "delete_key":
+                for key_id in [k for k in open_groups if k[0] == hive and _is_under(k[1], norm_path)]:
+                    del open_groups[key_id]
+                groups.append((hive, subpath, [(action, None, None, None)]))
+                continue
+
+            entry = open_groups.get((hive, norm_path))
+            if entry is None:
+                groups.append((hive, subpath, []))
+                entry = (len(groups) - 1, {})
+                open_groups[(hive, norm_path)] = entry
+            operations = groups[entry[0]][2]
+            operation = (action, value_name, value_data, value_type)
+            index = entry[1].get(value_name.lower())
+            if index is None:
+                entry[1][value_name.lower()] = len(operations)
+                operations.append(operation)
+            else:
+                operations[index] = operation
+        return groups
+
+    def commit(self):
+        """Applies the buffered writes; raises RegistryTransactionError after a rollback"""
+        groups = self.groups()
+        if groups:
+            self.backend.apply_batch(groups)
@@ -0,0 +1,178 @@
+"""
+Пакетное изменение служб: типы запуска пишутся одной транзакцией реестра (если она не
+прошла - по одной службе), запуск и остановка выполняются параллельно в пуле потоков с
+учётом зависимостей и общим таймаутом.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Iterable, Set
+
+from utils.registry_backends import winreg
+from utils.registry_handler import RegistryTransactionError
+from utils.service_inventory import ServiceInventory, ServiceActionResult, get_service_inventory
+
+RUNNING = "running"
+STOPPED = "stopped"
+
+_START_TYPE_NAMES = {0: "boot", 1: "system", 2: "auto", 3: "manual", 4: "disabled"}
+
+
+@dataclass(frozen=True)
+class ServiceChange:
+    name: str
+    start_type: Optional[int] = None  # None - тип запуска не меняется
+    run_state: Optional[str] = None  # RUNNING / STOPPED / None - не запускать и не останавливать
+
+
+@dataclass
+class ServiceChangeResult:
+    change: ServiceChange
+    start_type_set: Optional[bool] = None  # None - тип запуска не менялся
+    control: Optional[ServiceActionResult] = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.change.name
+
+    @property
+    def success(self) -> bool:
+        return self.start_type_set is not False and (self.control is None or self.control.success)
+
+
+class ServiceBatchExecutor:
+    """
+    Applies a list of ServiceChange at once. Stops run concurrently, but a service is
+    stopped only after the services in the batch that depend on it; starts wait for
+    their dependencies in the batch. Whatever has not finished by the global timeout
+    is reported as timed out.
+    """
+
+    def __init__(self, inventory: Optional[ServiceInventory] = None, max_workers: int = 8, timeout: float = 60.0):
+        self.inventory = inventory or get_service_inventory()
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+    def apply(self, changes: Iterable[ServiceChange]) -> List[ServiceChangeResult]:
+        # Для одной службы действует последнее изменение
+        merged: Dict[str, ServiceChange] = {}
+        for change in changes:
+            merged.pop(change.name.lower(), None)
+            merged[change.name.lower()] = change
+        results = {key: ServiceChangeResult(change) for key, change in merged.items()}
+        if not results:
+            return []
+
+        deadline = time.monotonic() + self.timeout
+        self._write_start_types(results)
+        controls = {key: result for key, result in results.items()
+                    if result.change.run_state is not None and result.start_type_set is not False}
+        if controls:
+            self._run_controls(controls, deadline)
+        return list(results.values())
+
+    def _write_start_types(self, results: Dict[str, ServiceChangeResult]):
+        registry = self.inventory.registry
+        pending = [result for result in results.values() if result.change.start_type is not None]
+        start = time.perf_counter()
+        try:
+            with registry.transaction():
+                for result in pending:
+                    self._write_start_type(result)
+        except RegistryTransactionError as e:
+            # Одна защищённая служба (ключ TrustedInstaller) не должна отменять изменения
+            # остальных - повторяем запись по одной службе, каждая со своим результатом
+            print(f"Batched start type write failed, retrying per service: {e}")
+            for result in pending:
+                self._write_start_type(result)
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        for result in results.values():
+            result.elapsed_ms = elapsed_ms
+
+    def _write_start_type(self, result: ServiceChangeResult):
+        change = result.change
+        result.start_type_set = self.inventory.registry.set_registry_value(
+            self.inventory.key_path(change.name), "Start", change.start_type, winreg.REG_DWORD
+        )
+        result.error = None if result.start_type_set else "failed to set start type"
+
+    def _blockers(self, controls: Dict[str, ServiceChangeResult]) -> Dict[str, Set[str]]:
+        """Services of the batch that have to finish before each one is controlled"""
+        names = {key: result.change.name for key, result in controls.items()}
+        dependencies = self.inventory.depends_on(names.values())
+        blockers = {key: set() for key in controls}
+        for key, name in names.items():
+            for dependency in dependencies[name]:
+                dependency_key = dependency.lower()
+                if dependency_key not in controls:
+                    continue
+                own_state = controls[key].change.run_state
+                if own_state == STOPPED and controls[dependency_key].change.run_state == STOPPED:
+                    # Зависимая служба останавливается раньше той, от которой зависит
+                    blockers[dependency_key].add(key)
+                elif own_state == RUNNING and controls[dependency_key].change.run_state == RUNNING:
+                    blockers[key].add(dependency_key)
+        return blockers
+
+    def _run_controls(self, controls: Dict[str, ServiceChangeResult], deadline: float):
+        blockers = self._blockers(controls)
+        waiting = set(controls)
+        finished: Set[str] = set()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="service-control")
+        futures = {}
+        try:
+            while waiting or futures:
+                ready = [key for key in waiting if blockers[key] <= finished]
+                if not ready and not futures:
+                    # Цикл зависимостей - запускаем оставшееся без порядка
+                    ready = list(waiting)
+                for key in ready:
+                    waiting.discard(key)
+                    futures[executor.submit(self._control, controls[key], deadline)] = key
+
+                remaining = max(0.0, deadline - time.monotonic())
+                done, _ = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = futures.pop(future)
+                    controls[key].control = future.result()
+                    finished.add(key)
+                if time.monotonic() >= deadline:
+                    break
+        finally:
+            # Потоки не прервать: SCM-ожидание каждого и так ограничено дедлайном
+            executor.shutdown(wait=False)
+
+        for key in waiting | set(futures.values()):
+            result = controls[key]
+            action = "start" if result.change.run_state == RUNNING else "stop"
+            result.control = ServiceActionResult(result.name, action, False, error="timed out")
+
+    def _control(self, result: ServiceChangeResult, deadline: float) -> ServiceActionResult:
+        start = time.perf_counter()
+        timeout = max(0.0, deadline - time.monotonic())
+        if result.change.run_state == RUNNING:
+            action_result = self.inventory.start(result.name, timeout=timeout)
+        else:
+            action_result = self.inventory.stop(result.name, timeout=timeout)
+        result.elapsed_ms = round(result.elapsed_ms + (time.perf_counter() - start) * 1000, 3)
+        return action_result
+
+
+def apply_service_changes(changes: Iterable[ServiceChange], timeout: float = 60.0) -> List[ServiceChangeResult]:
+    return ServiceBatchExecutor(timeout=timeout).apply(changes)
+
+
+def format_results(results: Iterable[ServiceChangeResult]) -> str:
+    """Per-service result table"""
+    lines = [f"{'Service':<40} {'Start':<9} {'State':<8} {'Result':<7} {'ms':>9}  Details"]
+    for result in results:
+        change = result.change
+        start_type = "-" if change.start_type is None else _START_TYPE_NAMES.get(change.start_type, str(change.start_type))
+        details = result.error or (result.control.describe() if result.control is not None else "")
+        lines.append(
+            f"{result.name:<40} {start_type:<9} {change.run_state or '-':<8} "
+            f"{'ok' if result.success else 'FAILED':<7} {result.elapsed_ms:>9.1f}  {details}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,413 @@
+"""
+Общий снимок служб Windows для твиков служб.
+
+Типы запуска читаются одним перечислением SYSTEM\\CurrentControlSet\\Services (значения
+попадают в кэш чтения реестра и дальше отслеживаются им), состояния выполнения - одним
+запросом EnumServicesStatusExW к диспетчеру служб (SCM). После запуска/остановки
+перечитывается только состояние затронутой службы.
+"""
+import time
+import ctypes
+import threading
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Iterable, Tuple
+
+from utils.registry_backends import RegistryBackend
+from utils.registry_handler import RegistryHandler
+
+SERVICES_PATH = r"HKLM\SYSTEM\CurrentControlSet\Services"
+
+# Типы запуска (значение Start)
+START_AUTOMATIC = 2
+START_MANUAL = 3
+START_DISABLED = 4
+
+# Состояния службы (dwCurrentState)
+SERVICE_STOPPED = 1
+SERVICE_START_PENDING = 2
+SERVICE_STOP_PENDING = 3
+SERVICE_RUNNING = 4
+
+# Права и константы SCM
+SC_MANAGER_CONNECT = 0x0001
+SC_MANAGER_ENUMERATE_SERVICE = 0x0004
+SERVICE_QUERY_STATUS = 0x0004
+SERVICE_START = 0x0010
+SERVICE_STOP = 0x0020
+SERVICE_CONTROL_STOP = 0x00000001
+SC_ENUM_PROCESS_INFO = 0
+SC_STATUS_PROCESS_INFO = 0
+SERVICE_WIN32 = 0x00000030
+SERVICE_STATE_ALL = 0x00000003
+
+ERROR_MORE_DATA = 234
+ERROR_SERVICE_ALREADY_RUNNING = 1056
+ERROR_SERVICE_DOES_NOT_EXIST = 1060
+ERROR_SERVICE_NOT_ACTIVE = 1062
+
+
+class SERVICE_STATUS_PROCESS(ctypes.Structure):
+    _fields_ = [
+        ("dwServiceType", ctypes.c_uint32),
+        ("dwCurrentState", ctypes.c_uint32),
+        ("dwControlsAccepted", ctypes.c_uint32),
+        ("dwWin32ExitCode", ctypes.c_uint32),
+        ("dwServiceSpecificExitCode", ctypes.c_uint32),
+        ("dwCheckPoint", ctypes.c_uint32),
+        ("dwWaitHint", ctypes.c_uint32),
+        ("dwProcessId", ctypes.c_uint32),
+        ("dwServiceFlags", ctypes.c_uint32),
+    ]
+
+
+class ENUM_SERVICE_STATUS_PROCESSW(ctypes.Structure):
+    _fields_ = [
+        ("lpServiceName", ctypes.c_wchar_p),
+        ("lpDisplayName", ctypes.c_wchar_p),
+        ("ServiceStatusProcess", SERVICE_STATUS_PROCESS),
+    ]
+
+
+@dataclass
+class ServiceActionResult:
+    """Outcome of ServiceInventory.start()/stop()"""
+    name: str
+    action: str  # "start" / "stop"
+    success: bool
+    changed: bool = False  # False - служба уже была в нужном состоянии
+    error: Optional[str] = None
+
+    def describe(self) -> str:
+        if not self.success:
+            return f"failed to {self.action}: {self.error}"
+        if not self.changed:
+            return "already running" if self.action == "start" else "already stopped"
+        return "started" if self.action == "start" else "stopped"
+
+
+class _ServiceControlManager:
+    """Thin ctypes wrapper over the SCM functions of advapi32"""
+
+    def __init__(self):
+        advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+        c_uint32_p = ctypes.POINTER(ctypes.c_uint32)
+        advapi32.OpenSCManagerW.restype = ctypes.c_void_p
+        advapi32.OpenSCManagerW.argtypes = [ctypes.c_wchar_p, ctypes.c_wchar_p, ctypes.c_uint32]
+        advapi32.OpenServiceW.restype = ctypes.c_void_p
+        advapi32.OpenServiceW.argtypes = [ctypes.c_void_p, ctypes.c_wchar_p, ctypes.c_uint32]
+        advapi32.CloseServiceHandle.argtypes = [ctypes.c_void_p]
+        advapi32.EnumServicesStatusExW.argtypes = [
+            ctypes.c_void_p, ctypes.c_int, ctypes.c_uint32, ctypes.c_uint32, ctypes.c_void_p,
+            ctypes.c_uint32, c_uint32_p, c_uint32_p, c_uint32_p, ctypes.c_wchar_p
+        ]
+        advapi32.QueryServiceStatusEx.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p,
+                                                  ctypes.c_uint32, c_uint32_p]
+        advapi32.StartServiceW.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_void_p]
+        advapi32.ControlService.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_void_p]
+        self.advapi32 = advapi32
+
+    def _open_manager(self, access: int) -> int:
+        handle = self.advapi32.OpenSCManagerW(None, None, access)
+        if not handle:
+            raise ctypes.WinError(ctypes.get_last_error())
+        return handle
+
+    def enum_states(self) -> Dict[str, int]:
+        """{service name in lower case: dwCurrentState} for every Win32 service"""
+        manager = self._open_manager(SC_MANAGER_ENUMERATE_SERVICE)
+        try:
+            states = {}
+            size = 64 * 1024
+            needed = ctypes.c_uint32(0)
+            returned = ctypes.c_uint32(0)
+            resume = ctypes.c_uint32(0)
+            while True:
+                buffer = ctypes.create_string_buffer(size)
+                ok = self.advapi32.EnumServicesStatusExW(
+                    manager, SC_ENUM_PROCESS_INFO, SERVICE_WIN32, SERVICE_STATE_ALL, buffer, size,
+                    ctypes.byref(needed), ctypes.byref(returned), ctypes.byref(resume), None
+                )
+                error = 0 if ok else ctypes.get_last_error()
+                if not ok and error != ERROR_MORE_DATA:
+                    raise ctypes.WinError(error)
+                entries = ctypes.cast(buffer, ctypes.POINTER(ENUM_SERVICE_STATUS_PROCESSW))
+                for index in range(returned.value):
+                    entry = entries[index]
+                    states[entry.lpServiceName.lower()] = entry.ServiceStatusProcess.dwCurrentState
+                if ok:
+                    return states
+                # ERROR_MORE_DATA: продолжаем с resume handle
+                size = max(size, needed.value)
+        finally:
+            self.advapi32.CloseServiceHandle(manager)
+
+    def _query(self, service: int) -> int:
+        status = SERVICE_STATUS_PROCESS()
+        needed = ctypes.c_uint32(0)
+        if not self.advapi32.QueryServiceStatusEx(service, SC_STATUS_PROCESS_INFO, ctypes.byref(status),
+                                                  ctypes.sizeof(status), ctypes.byref(needed)):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return status.dwCurrentState
+
+    def query_state(self, name: str) -> Optional[int]:
+        """dwCurrentState of one service, None when it does not exist"""
+        manager = self._open_manager(SC_MANAGER_CONNECT)
+        try:
+            service = self.advapi32.OpenServiceW(manager, name, SERVICE_QUERY_STATUS)
+            if not service:
+                error = ctypes.get_last_error()
+                if error == ERROR_SERVICE_DOES_NOT_EXIST:
+                    return None
+                raise ctypes.WinError(error)
+            try:
+                return self._query(service)
+            finally:
+                self.advapi32.CloseServiceHandle(service)
+        finally:
+            self.advapi32.CloseServiceHandle(manager)
+
+    def control(self, name: str, action: str, timeout: float) -> Tuple[ServiceActionResult, Optional[int]]:
+        """Starts or stops a service and waits up to timeout seconds for it to settle"""
+        start = action == "start"
+        target = SERVICE_RUNNING if start else SERVICE_STOPPED
+        manager = self._open_manager(SC_MANAGER_CONNECT)
+        try:
+            service = self.advapi32.OpenServiceW(
+                manager, name, SERVICE_QUERY_STATUS | (SERVICE_START if start else SERVICE_STOP)
+            )
+            if not service:
+                error = ctypes.get_last_error()
+                return ServiceActionResult(name, action, False, error=ctypes.FormatError(error)), None
+            try:
+                if start:
+                    ok = self.advapi32.StartServiceW(service, 0, None)
+                    already = ERROR_SERVICE_ALREADY_RUNNING
+                else:
+                    status = SERVICE_STATUS_PROCESS()
+                    ok = self.advapi32.ControlService(service, SERVICE_CONTROL_STOP, ctypes.byref(status))
+                    already = ERROR_SERVICE_NOT_ACTIVE
+                if not ok:
+                    error = ctypes.get_last_error()
+                    if error == already:
+                        return ServiceActionResult(name, action, True), target
+                    return ServiceActionResult(name, action, False, error=ctypes.FormatError(error)), self._query(service)
+
+                # Как и net start/stop, ждём, пока служба выйдет из состояния *_PENDING
+                deadline = time.monotonic() + timeout
+                while True:
+                    state = self._query(service)
+                    if state == target:
+                        return ServiceActionResult(name, action, True, changed=True), state
+                    if time.monotonic() >= deadline:
+                        return ServiceActionResult(name, action, False, changed=True,
+                                                   error=f"timed out after {timeout:.0f}s"), state
+                    time.sleep(0.25)
+            finally:
+                self.advapi32.CloseServiceHandle(service)
+        finally:
+            self.advapi32.CloseServiceHandle(manager)
+
+
+class ServiceInventory:
+    """
+    Snapshot of service start types and run states shared by the service tweaks.
+    Start types are served by the registry read cache after one enumeration of the
+    Services key; run states come from a single SCM query, kept for state_ttl seconds
+    and updated per service after start()/stop().
+    """
+
+    def __init__(self, registry: Optional[RegistryHandler] = None, state_ttl: float = 30.0):
+        self.registry = registry or RegistryHandler()
+        self.state_ttl = state_ttl
+        self.lock = threading.RLock()
+        self._names: Dict[str, str] = {}  # имя в нижнем регистре -> имя ключа службы
+        self._loaded = False
+        self._states: Dict[str, int] = {}
+        self._states_time: Optional[float] = None
+        self._scm: Optional[_ServiceControlManager] = None
+        self._scm_checked = False
+        self.registry_passes = 0
+        self.scm_queries = 0
+
+    @property
+    def scm(self) -> Optional[_ServiceControlManager]:
+        """SCM wrapper, None outside Windows"""
+        if not self._scm_checked:
+            self._scm_checked = True
+            try:
+                self._scm = _ServiceControlManager()
+            except (AttributeError, OSError):
+                self._scm = None
+        return self._scm
+
+    @staticmethod
+    def key_path(name: str) -> str:
+        return f"{SERVICES_PATH}\\{name}"
+
+    # --- снимок ---
+
+    def refresh(self, names: Optional[Iterable[str]] = None):
+        """Re-reads everything, or only the given services"""
+        if names is None:
+            self._load_start_types()
+            self._load_states()
+            return
+
+        names = list(names)
+        self.registry.get_many([(self.key_path(name), "Start") for name in names])
+        scm = self.scm
+        if scm is None:
+            return
+        for name in names:
+            try:
+                state = scm.query_state(name)
+            except OSError:
+                continue
+            with self.lock:
+                if state is None:
+                    self._states.pop(name.lower(), None)
+                else:
+                    self._states[name.lower()] = state
+
+    def _load_start_types(self):
+        names = self.registry.enum_subkeys(SERVICES_PATH)
+        # Один проход get_many() прогревает кэш чтения значениями Start всех служб
+        self.registry.get_many([(self.key_path(name), "Start") for name in names])
+        with self.lock:
+            self._names = {name.lower(): name for name in names}
+            self._loaded = True
+            self.registry_passes += 1
+
+    def _load_states(self):
+        scm = self.scm
+        if scm is None:
+            return
+        try:
+            states = scm.enum_states()
+        except OSError as e:
+            print(f"Ошибка при опросе диспетчера служб: {e}")
+            return
+        with self.lock:
+            self._states = states
+            self._states_time = time.monotonic()
+            self.scm_queries += 1
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self.lock:
+                if not self._loaded:
+                    self._load_start_types()
+
+    def _ensure_states(self):
+        with self.lock:
+            if self._states_time is None or time.monotonic() - self._states_time >= self.state_ttl:
+                self._load_states()
+
+    # --- чтение ---
+
+    def services(self) -> List[str]:
+        self._ensure_loaded()
+        with self.lock:
+            return list(self._names.values())
+
+    def exists(self, name: str) -> bool:
+        self._ensure_loaded()
+        return name.lower() in self._names
+
+    def start_type(self, name: str) -> Optional[int]:
+        """Value of Start for the service, None when the service (or value) is missing"""
+        self._ensure_loaded()
+        return self.registry.get_registry_value(self.key_path(name), "Start")
+
+    def start_types(self, names: Iterable[str]) -> Dict[str, Optional[int]]:
+        self._ensure_loaded()
+        names = list(names)
+        values = self.registry.get_many([(self.key_path(name), "Start") for name in names])
+        return {name: values[(self.key_path(name), "Start")] for name in names}
+
+    def depends_on(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        """Services each of the given services depends on (DependOnService, groups skipped)"""
+        names = list(names)
+        values = self.registry.get_many([(self.key_path(name), "DependOnService") for name in names])
+        dependencies = {}
+        for name in names:
+            value = values[(self.key_path(name), "DependOnService")] or []
+            if isinstance(value, str):
+                value = [value]
+            # Записи "+Группа" ссылаются на группы загрузки, а не на службы
+            dependencies[name] = [dependency for dependency in value if dependency and not dependency.startswith("+")]
+        return dependencies
+
+    def state(self, name: str) -> Optional[int]:
+        """dwCurrentState of the service, None when unknown (no SCM or no such service)"""
+        if self.scm is None:
+            return None
+        self._ensure_states()
+        with self.lock:
+            return self._states.get(name.lower())
+
+    def is_running(self, name: str) -> Optional[bool]:
+        state = self.state(name)
+        return None if state is None else state == SERVICE_RUNNING
+
+    # --- управление ---
+
+    def start(self, name: str, timeout: float = 30.0) -> ServiceActionResult:
+        return self._control(name, "start", timeout)
+
+    def stop(self, name: str, timeout: float = 30.0) -> ServiceActionResult:
+        return self._control(name, "stop", timeout)
+
+    def _control(self, name: str, action: str, timeout: float) -> ServiceActionResult:
+        scm = self.scm
+        if scm is None:
+            return ServiceActionResult(name, action, False, error="Service Control Manager is unavailable")
+
+        # Служба уже в нужном состоянии - не запускаем и не останавливаем. Снимок может быть
+        # старше state_ttl секунд, поэтому решение принимается по текущему статусу службы
+        target = SERVICE_RUNNING if action == "start" else SERVICE_STOPPED
+        try:
+            current = scm.query_state(name)
+        except OSError:
+            current = None
+        if current is not None:
+            with self.lock:
+                self._states[name.lower()] = current
+        if current == target:
+            return ServiceActionResult(name, action, True)
+
+        try:
+            result, state = scm.control(name, action, timeout)
+        except OSError as e:
+            result, state = ServiceActionResult(name, action, False, error=str(e)), None
+        with self.lock:
+            if state is not None:
+                self._states[name.lower()] = state
+            else:
+                self._states.pop(name.lower(), None)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "services": len(self._names),
+                "running": sum(1 for state in self._states.values() if state == SERVICE_RUNNING),
+                "registry_passes": self.registry_passes,
+                "scm_queries": self.scm_queries,
+            }
+
+
+_inventories: Dict[int, Tuple[RegistryBackend, ServiceInventory]] = {}
+_inventories_lock = threading.Lock()
+
+
+def get_service_inventory(registry: Optional[RegistryHandler] = None) -> ServiceInventory:
+    """Shared inventory for the registry backend of the handler (the default backend if omitted)"""
+    registry = registry or RegistryHandler()
+    backend = registry.backend
+    with _inventories_lock:
+        entry = _inventories.get(id(backend))
+        if entry is None or entry[0] is not backend:
+            entry = (backend, ServiceInventory(RegistryHandler(backend)))
+            _inventories[id(backend)] = entry
+        return entry[1]
@@ -0,0 +1,87 @@
+from typing import Dict, Optional, Tuple, List, Iterable
+
+from utils.registry_handler import RegistryHandler
+from utils.service_executor import ServiceBatchExecutor, ServiceChange, ServiceChangeResult, RUNNING, STOPPED
+from utils.service_inventory import ServiceInventory, get_service_inventory, START_DISABLED
+from utils.tweak_fingerprint import StatusInputs
+from utils.tweaks.base_tweak import BaseTweak
+
+
+class ServiceTweak(BaseTweak):
+    """
+    BaseTweak that switches the start type of Windows services. Statuses are read from
+    the shared ServiceInventory, changes are applied by ServiceBatchExecutor.
+    """
+
+    services: Dict[str, int] = {}  # служба -> тип запуска при включении
+    match = "all"  # включён, если включены все ("all") или хотя бы одна ("any") служба
+    enabled_start_types: Optional[Tuple[int, ...]] = None  # None - любой тип, кроме Disabled
+    start_on_enable = True
+    stop_on_disable = True
+    strict = False  # ошибка запуска/остановки службы делает результат False
+
+    def __init__(self):
+        self.reg = RegistryHandler()
+
+    @property
+    def inventory(self) -> ServiceInventory:
+        return get_service_inventory(self.reg)
+
+    def is_service_enabled(self, start_type: Optional[int]) -> bool:
+        if self.enabled_start_types is None:
+            return start_type != START_DISABLED
+        return start_type in self.enabled_start_types
+
+    def status_inputs(self) -> Optional[StatusInputs]:
+        # Статус читается из снимка ServiceInventory, а не через get_registry_value
+        return StatusInputs(services=tuple(self.services))
+
+    def check_status(self) -> bool:
+        start_types = self.inventory.start_types(self.services)
+        results = (self.is_service_enabled(start_types[name]) for name in self.services)
+        return all(results) if self.match == "all" else any(results)
+
+    def toggle(self) -> bool:
+        current_status = self.check_status()
+        result = self.disable() if current_status else self.enable()
+        self.log_action("toggle", "Disabled" if current_status else "Enabled", result)
+        return result
+
+    def enable(self) -> bool:
+        return self._apply("enable", self.service_changes(True))
+
+    def disable(self) -> bool:
+        return self._apply("disable", self.service_changes(False))
+
+    def service_changes(self, enable: bool) -> List[ServiceChange]:
+        """Changes enable()/disable() apply, for batching several service tweaks together"""
+        if enable:
+            run_state = RUNNING if self.start_on_enable else None
+            return [ServiceChange(name, start_type, run_state) for name, start_type in self.services.items()]
+        run_state = STOPPED if self.stop_on_disable else None
+        return [ServiceChange(name, START_DISABLED, run_state) for name in self.services]
+
+    def _apply(self, action: str, changes: List[ServiceChange]) -> bool:
+        return self.report_results(action, ServiceBatchExecutor(self.inventory).apply(changes))
+
+    def report_results(self, action: str, results: Iterable[ServiceChangeResult]) -> bool:
+        """Logs executor results for this tweak's services and returns whether the action succeeded"""
+        state = "Enabled" if action == "enable" else "Disabled"
+        success = True
+        for result in results:
+            if result.name not in self.services:
+                continue
+            if result.start_type_set is False:
+                print(f"Error setting start type of {result.name}: {result.error}")
+                self.log_action(action, f"{result.name}: Failed to {action}", False)
+                success = False
+            elif result.control is None:
+                self.log_action(action, f"{result.name}: {state}", True, result.elapsed_ms)
+            else:
+                self.log_action(action, f"{result.name}: {state}, {result.control.describe()}", result.control.success,
+                                result.elapsed_ms)
+                if not result.control.success:
+                    print(f"Failed to {result.control.action} {result.name}: {result.control.error}")
+                    if self.strict:
+                        success = False
+        return success
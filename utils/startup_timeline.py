@@ -0,0 +1,73 @@
+"""
+Хронология запуска приложения.
+
+Этапы (окно создано, первая отрисовка, интерфейс готов, анализ завершён) отмечаются
+в миллисекундах от старта процесса и одной строкой пишутся в журнал приложения.
+"""
+import time
+import logging
+import threading
+from typing import Optional, Dict
+
+FIRST_PAINT = "first_paint"
+INTERACTIVE = "interactive"
+ANALYSIS_DONE = "analysis_done"
+
+
+def _process_start() -> float:
+    # Время создания процесса учитывает и запуск интерпретатора, и импорты
+    try:
+        import psutil
+        return psutil.Process().create_time()
+    except Exception:
+        return time.time()
+
+
+class StartupTimeline:
+    """Named startup milestones in milliseconds since the process started"""
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = origin if origin is not None else _process_start()
+        self.lock = threading.Lock()
+        self.marks: Dict[str, float] = {}
+        self.logged = False
+
+    def mark(self, name: str) -> float:
+        """Records the milestone once (later calls keep the first time) and returns it"""
+        elapsed = round((time.time() - self.origin) * 1000, 1)
+        with self.lock:
+            return self.marks.setdefault(name, elapsed)
+
+    def get(self, name: str) -> Optional[float]:
+        with self.lock:
+            return self.marks.get(name)
+
+    def has(self, *names: str) -> bool:
+        with self.lock:
+            return all(name in self.marks for name in names)
+
+    def summary(self) -> Dict[str, float]:
+        with self.lock:
+            return dict(sorted(self.marks.items(), key=lambda item: item[1]))
+
+    def log(self, force: bool = False):
+        """Writes the timeline to the application log (once unless force)"""
+        with self.lock:
+            if self.logged and not force:
+                return
+            self.logged = True
+        line = ", ".join(f"{name}={elapsed:.0f}ms" for name, elapsed in self.summary().items())
+        logging.info(f"Startup timeline: {line}")
+        print(f"Startup timeline: {line}")
+
+
+_timeline: Optional[StartupTimeline] = None
+_timeline_lock = threading.Lock()
+
+
+def get_startup_timeline() -> StartupTimeline:
+    global _timeline
+    with _timeline_lock:
+        if _timeline is None:
+            _timeline = StartupTimeline()
+        return _timeline
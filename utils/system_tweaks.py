@@ -1,9 +1,8 @@
 import os
 import platform
-import subprocess
 import zipfile
-import requests  # Добавляем импорт библиотеки requests для скачивания файлов
 from utils.registry_handler import RegistryHandler
+from utils.tweak_registry import get_tweak
 
 # Import winreg only on Windows
 if platform.system() == "Windows":
@@ -25,879 +24,752 @@ class SystemTweaks:
     def is_windows():
         return platform.system() == "Windows"
 
+    @staticmethod
+    def tweak(key):
+        """Shared tweak instance from the registry, created on first use"""
+        return get_tweak(key)
+
     # === Power Plan ===
     @staticmethod
     def check_powerplan():
-        from utils.tweaks.powerplan import PowerPlanTweak
-        tweak = PowerPlanTweak()
+        tweak = SystemTweaks.tweak("power_plan")
         return tweak.check_status()
 
     @staticmethod
     def toggle_powerplan():
-        from utils.tweaks.powerplan import PowerPlanTweak
-        tweak = PowerPlanTweak()
+        tweak = SystemTweaks.tweak("power_plan")
         return tweak.toggle()
 
 
     # === Fso и GameBar ===
     @staticmethod
     def check_FsoGameBar():
-        from utils.tweaks.fso_gamebar import FsoGameBarTweak
-        tweak = FsoGameBarTweak()
+        tweak = SystemTweaks.tweak("FsoGameBar")
         return tweak.check_status()
 
     @staticmethod
     def toggle_FsoGameBar():
-        from utils.tweaks.fso_gamebar import FsoGameBarTweak
-        tweak = FsoGameBarTweak()
+        tweak = SystemTweaks.tweak("FsoGameBar")
         return tweak.toggle()
 
 
     @staticmethod
     def disable_services(service_name):
-        """Disable a Windows service"""
+        """Disable a Windows service (or a list of services in one batch)"""
         if not SystemTweaks.is_windows():
             print("Service control is only available on Windows")
             return False
 
-        try:
-            subprocess.run(['sc', 'config', service_name, 'start=disabled'])
-            subprocess.run(['sc', 'stop', service_name])
-            return True
-        except Exception:
-            return False
+        from utils.service_executor import ServiceChange, STOPPED, apply_service_changes, format_results
+        from utils.service_inventory import START_DISABLED
+        names = [service_name] if isinstance(service_name, str) else list(service_name)
+        results = apply_service_changes([ServiceChange(name, START_DISABLED, STOPPED) for name in names])
+        print(format_results(results))
+        return all(result.success for result in results)
 
     # === Spectre, Meltdown, DownFall Mitigations ===
     @staticmethod
     def check_spectre_meltdown_status():
-        from utils.tweaks.spectre_meltdown import SpectreMeltdownTweak
-        tweak = SpectreMeltdownTweak()
+        tweak = SystemTweaks.tweak("spectre_meltdown")
         return tweak.check_status()
 
     @staticmethod
     def toggle_spectre_meltdown():
-        from utils.tweaks.spectre_meltdown import SpectreMeltdownTweak
-        tweak = SpectreMeltdownTweak()
+        tweak = SystemTweaks.tweak("spectre_meltdown")
         return tweak.toggle()
 
 
     # === Оптимизация настроек Nvidia ===
     @staticmethod
     def check_nvidia_optimization_status():
-        from utils.tweaks.nvidia_optimization import NvidiaOptimizationTweak
-        tweak = NvidiaOptimizationTweak()
+        tweak = SystemTweaks.tweak("nvidia_optimization")
         return tweak.check_status()
 
     @staticmethod
     def toggle_nvidia_optimization():
-        from utils.tweaks.nvidia_optimization import NvidiaOptimizationTweak
-        tweak = NvidiaOptimizationTweak()
+        tweak = SystemTweaks.tweak("nvidia_optimization")
         return tweak.toggle()
 
 
     # === HDCP ===
     @staticmethod
     def check_hdcp_status():
-        from utils.tweaks.hdcp import HdcpTweak
-        tweak = HdcpTweak()
+        tweak = SystemTweaks.tweak("hdcp")
         return tweak.check_status()
 
     @staticmethod
     def toggle_hdcp():
-        from utils.tweaks.hdcp import HdcpTweak
-        tweak = HdcpTweak()
+        tweak = SystemTweaks.tweak("hdcp")
         return tweak.toggle()
 
 
     # === Power Throttling ===
     @staticmethod
     def check_power_throttling_status():
-        from utils.tweaks.power_throttling import PowerThrottlingTweak
-        tweak = PowerThrottlingTweak()
+        tweak = SystemTweaks.tweak("power_throttling")
         return tweak.check_status()
 
     @staticmethod
     def toggle_power_throttling():
-        from utils.tweaks.power_throttling import PowerThrottlingTweak
-        tweak = PowerThrottlingTweak()
+        tweak = SystemTweaks.tweak("power_throttling")
         return tweak.toggle()
 
 
     @staticmethod
     def check_uwp_background_status():
-        from utils.tweaks.uwp_background import UWPBackgroundTweak
-        tweak = UWPBackgroundTweak()
+        tweak = SystemTweaks.tweak("uwp_background")
         return tweak.check_status()
 
     @staticmethod
     def toggle_uwp_background():
-        from utils.tweaks.uwp_background import UWPBackgroundTweak
-        tweak = UWPBackgroundTweak()
+        tweak = SystemTweaks.tweak("uwp_background")
         return tweak.toggle()
 
 
     # === Уведомления ===
     @staticmethod
     def check_notifications_status():
-        from utils.tweaks.notifications import NotificationsTweak
-        tweak = NotificationsTweak()
+        tweak = SystemTweaks.tweak("notifications")
         return tweak.check_status()
 
     @staticmethod
     def toggle_notifications():
-        from utils.tweaks.notifications import NotificationsTweak
-        tweak = NotificationsTweak()
+        tweak = SystemTweaks.tweak("notifications")
         return tweak.toggle()
 
 
     # === Cortana ===
     @staticmethod
     def check_cortana_status():
-        from utils.tweaks.cortana import CortanaTweak
-        tweak = CortanaTweak()
+        tweak = SystemTweaks.tweak("cortana")
         return tweak.check_status()
 
     @staticmethod
     def toggle_cortana():
-        from utils.tweaks.cortana import CortanaTweak
-        tweak = CortanaTweak()
+        tweak = SystemTweaks.tweak("cortana")
         return tweak.toggle()
 
     # === FastBoot ===
     @staticmethod
     def check_fastboot_status():
-        from utils.tweaks.fastboot import FastBootTweak
-        tweak = FastBootTweak()
+        tweak = SystemTweaks.tweak("fastboot")
         return tweak.check_status()
 
     @staticmethod
     def toggle_fastboot():
-        from utils.tweaks.fastboot import FastBootTweak
-        tweak = FastBootTweak()
+        tweak = SystemTweaks.tweak("fastboot")
         return tweak.toggle()
 
     # === Hibernation ===
     @staticmethod
     def check_hibernation_status():
-        from utils.tweaks.hibernation import HibernationTweak
-        tweak = HibernationTweak()
+        tweak = SystemTweaks.tweak("hibernation")
         return tweak.check_status()
 
     @staticmethod
     def toggle_hibernation():
-        from utils.tweaks.hibernation import HibernationTweak
-        tweak = HibernationTweak()
+        tweak = SystemTweaks.tweak("hibernation")
         return tweak.toggle()
 
     # === Indexing ===
     @staticmethod
     def check_indexing_status():
-        from utils.tweaks.indexing import IndexingTweak
-        tweak = IndexingTweak()
+        tweak = SystemTweaks.tweak("indexing")
         return tweak.check_status()
 
     @staticmethod
     def toggle_indexing():
-        from utils.tweaks.indexing import IndexingTweak
-        tweak = IndexingTweak()
+        tweak = SystemTweaks.tweak("indexing")
         return tweak.toggle()
 
     # === Windows Defender ===
     @staticmethod
     def check_windows_defender_status():
-        from utils.tweaks.windows_defender import WindowsDefenderTweak
-        tweak = WindowsDefenderTweak()
+        tweak = SystemTweaks.tweak("windows_defender")
         return tweak.check_status()
 
     @staticmethod
     def toggle_windows_defender():
-        from utils.tweaks.windows_defender import WindowsDefenderTweak
-        tweak = WindowsDefenderTweak()
+        tweak = SystemTweaks.tweak("windows_defender")
         return tweak.toggle()
 
     # === OneDrive ===
     @staticmethod
     def check_onedrive_status():
-        from utils.tweaks.onedrive import OneDriveTweak
-        tweak = OneDriveTweak()
+        tweak = SystemTweaks.tweak("onedrive")
         return tweak.check_status()
 
     @staticmethod
     def remove_onedrive():  # Изменено на remove
-        from utils.tweaks.onedrive import OneDriveTweak
-        tweak = OneDriveTweak()
+        tweak = SystemTweaks.tweak("onedrive")
         return tweak.remove()  # Изменено на remove
 
     # === Wallpaper Compression ===
     @staticmethod
     def check_wallpaper_compression_status():
-        from utils.tweaks.wallpaper_compression import WallpaperCompressionTweak
-        tweak = WallpaperCompressionTweak()
+        tweak = SystemTweaks.tweak("wallpaper_compression")
         return tweak.check_status()
 
     @staticmethod
     def toggle_wallpaper_compression():
-        from utils.tweaks.wallpaper_compression import WallpaperCompressionTweak
-        tweak = WallpaperCompressionTweak()
+        tweak = SystemTweaks.tweak("wallpaper_compression")
         return tweak.toggle()
 
     # === Sticky Keys ===
     @staticmethod
     def check_sticky_keys_status():
-        from utils.tweaks.sticky_keys import StickyKeysTweak
-        tweak = StickyKeysTweak()
+        tweak = SystemTweaks.tweak("sticky_keys")
         return tweak.check_status()
 
     @staticmethod
     def toggle_sticky_keys():
-        from utils.tweaks.sticky_keys import StickyKeysTweak
-        tweak = StickyKeysTweak()
+        tweak = SystemTweaks.tweak("sticky_keys")
         return tweak.toggle()
 
     # === Mouse Acceleration ===
     @staticmethod
     def check_mouse_acceleration_status():
-        from utils.tweaks.mouse_acceleration import MouseAccelerationTweak
-        tweak = MouseAccelerationTweak()
+        tweak = SystemTweaks.tweak("mouse_acceleration")
         return tweak.check_status()
 
     @staticmethod
     def toggle_mouse_acceleration():
-        from utils.tweaks.mouse_acceleration import MouseAccelerationTweak
-        tweak = MouseAccelerationTweak()
+        tweak = SystemTweaks.tweak("mouse_acceleration")
         return tweak.toggle()
 
     # === Security Center Notifications ===
     @staticmethod
     def check_security_center_notifications_status():
-        from utils.tweaks.security_center_notifications import SecurityCenterNotificationsTweak
-        tweak = SecurityCenterNotificationsTweak()
+        tweak = SystemTweaks.tweak("security_center_notifications")
         return tweak.check_status()
 
     @staticmethod
     def toggle_security_center_notifications():
-        from utils.tweaks.security_center_notifications import SecurityCenterNotificationsTweak
-        tweak = SecurityCenterNotificationsTweak()
+        tweak = SystemTweaks.tweak("security_center_notifications")
         return tweak.toggle()
 
     # === App Start Notify ===
     @staticmethod
     def check_app_start_notify_status():
-        from utils.tweaks.app_start_notify import AppStartNotifyTweak
-        tweak = AppStartNotifyTweak()
+        tweak = SystemTweaks.tweak("app_start_notify")
         return tweak.check_status()
 
     @staticmethod
     def toggle_app_start_notify():
-        from utils.tweaks.app_start_notify import AppStartNotifyTweak
-        tweak = AppStartNotifyTweak()
+        tweak = SystemTweaks.tweak("app_start_notify")
         return tweak.toggle()
 
     # === Prioritize Gaming Tasks ===
     @staticmethod
     def check_prioritize_gaming_tasks_status():
-        from utils.tweaks.prioritize_gaming_tasks import PrioritizeGamingTasksTweak
-        tweak = PrioritizeGamingTasksTweak()
+        tweak = SystemTweaks.tweak("prioritize_gaming_tasks")
         return tweak.check_status()
 
     @staticmethod
     def toggle_prioritize_gaming_tasks():
-        from utils.tweaks.prioritize_gaming_tasks import PrioritizeGamingTasksTweak
-        tweak = PrioritizeGamingTasksTweak()
+        tweak = SystemTweaks.tweak("prioritize_gaming_tasks")
         return tweak.toggle()
 
     # === User Account Control (UAC) ===
     @staticmethod
     def check_uac_status():
-        from utils.tweaks.uac import UACTweak
-        tweak = UACTweak()
+        tweak = SystemTweaks.tweak("uac")
         return tweak.check_status()
 
     @staticmethod
     def toggle_uac():
-        from utils.tweaks.uac import UACTweak
-        tweak = UACTweak()
+        tweak = SystemTweaks.tweak("uac")
         return tweak.toggle()
 
     # === Hardware-accelerated GPU Scheduling ===
     @staticmethod
     def check_hw_sch_mode_status():
-        from utils.tweaks.hw_sch_mode import HwSchModeTweak
-        tweak = HwSchModeTweak()
+        tweak = SystemTweaks.tweak("hw_sch_mode")
         return tweak.check_status()
 
     @staticmethod
     def toggle_hw_sch_mode():
-        from utils.tweaks.hw_sch_mode import HwSchModeTweak
-        tweak = HwSchModeTweak()
+        tweak = SystemTweaks.tweak("hw_sch_mode")
         return tweak.toggle()
 
     # === Widgets Uninstall ===
     @staticmethod
     def check_widgets_uninstalled_status():
-        from utils.tweaks.widgets_uninstall import WidgetsUninstallTweak
-        tweak = WidgetsUninstallTweak()
+        tweak = SystemTweaks.tweak("widgets_uninstall")
         return tweak.check_status()
 
     @staticmethod
     def uninstall_widgets():
-        from utils.tweaks.widgets_uninstall import WidgetsUninstallTweak
-        tweak = WidgetsUninstallTweak()
+        tweak = SystemTweaks.tweak("widgets_uninstall")
         return tweak.uninstall()
 
     # === Clipboard History ===
     @staticmethod
     def check_clipboard_history_status():
-        from utils.tweaks.clipboard_history import ClipboardHistoryTweak
-        tweak = ClipboardHistoryTweak()
+        tweak = SystemTweaks.tweak("clipboard_history")
         return tweak.check_status()
 
     @staticmethod
     def toggle_clipboard_history():
-        from utils.tweaks.clipboard_history import ClipboardHistoryTweak
-        tweak = ClipboardHistoryTweak()
+        tweak = SystemTweaks.tweak("clipboard_history")
         return tweak.toggle()
 
     # === Core Isolation ===
     @staticmethod
     def check_core_isolation_status():
-        from utils.tweaks.core_isolation import CoreIsolationTweak
-        tweak = CoreIsolationTweak()
+        tweak = SystemTweaks.tweak("core_isolation")
         return tweak.check_status()
 
     @staticmethod
     def toggle_core_isolation():
-        from utils.tweaks.core_isolation import CoreIsolationTweak
-        tweak = CoreIsolationTweak()
+        tweak = SystemTweaks.tweak("core_isolation")
         return tweak.toggle()
 
     # === Auto Update Maps ===
     @staticmethod
     def check_auto_update_maps_status():
-        from utils.tweaks.auto_update_maps import AutoUpdateMapsTweak
-        tweak = AutoUpdateMapsTweak()
+        tweak = SystemTweaks.tweak("auto_update_maps")
         return tweak.check_status()
 
     @staticmethod
     def toggle_auto_update_maps():
-        from utils.tweaks.auto_update_maps import AutoUpdateMapsTweak
-        tweak = AutoUpdateMapsTweak()
+        tweak = SystemTweaks.tweak("auto_update_maps")
         return tweak.toggle()
 
     # === Auto Store Apps ===
     @staticmethod
     def check_auto_store_apps_status():
-        from utils.tweaks.auto_store_apps import AutoStoreAppsTweak
-        tweak = AutoStoreAppsTweak()
+        tweak = SystemTweaks.tweak("auto_store_apps")
         return tweak.check_status()
 
     @staticmethod
     def toggle_auto_store_apps():
-        from utils.tweaks.auto_store_apps import AutoStoreAppsTweak
-        tweak = AutoStoreAppsTweak()
+        tweak = SystemTweaks.tweak("auto_store_apps")
         return tweak.toggle()
 
     # === Background Task Edge Browser ===
     @staticmethod
     def check_background_task_edge_browser_status():
-        from utils.tweaks.background_task_edge_browser import BackgroundTaskEdgeBrowserTweak
-        tweak = BackgroundTaskEdgeBrowserTweak()
+        tweak = SystemTweaks.tweak("background_task_edge_browser")
         return tweak.check_status()
 
     @staticmethod
     def toggle_background_task_edge_browser():
-        from utils.tweaks.background_task_edge_browser import BackgroundTaskEdgeBrowserTweak
-        tweak = BackgroundTaskEdgeBrowserTweak()
+        tweak = SystemTweaks.tweak("background_task_edge_browser")
         return tweak.toggle()
 
     # === Windows Advertising ID ===
     @staticmethod
     def check_win_ad_status():
-        from utils.tweaks.win_ad import WinAdTweak
-        tweak = WinAdTweak()
+        tweak = SystemTweaks.tweak("win_ad")
         return tweak.check_status()
 
     @staticmethod
     def toggle_win_ad():
-        from utils.tweaks.win_ad import WinAdTweak
-        tweak = WinAdTweak()
+        tweak = SystemTweaks.tweak("win_ad")
         return tweak.toggle()
 
     # === Windows Sync ===
     @staticmethod
     def check_windows_sync_status():
-        from utils.tweaks.windows_sync import WindowsSyncTweak
-        tweak = WindowsSyncTweak()
+        tweak = SystemTweaks.tweak("windows_sync")
         return tweak.check_status()
 
     @staticmethod
     def toggle_windows_sync():
-        from utils.tweaks.windows_sync import WindowsSyncTweak
-        tweak = WindowsSyncTweak()
+        tweak = SystemTweaks.tweak("windows_sync")
         return tweak.toggle()
 
     # === Windows Telemetry ===
     @staticmethod
     def check_windows_telemetry_status():
-        from utils.tweaks.windows_telemetry import WindowsTelemetryTweak
-        tweak = WindowsTelemetryTweak()
+        tweak = SystemTweaks.tweak("windows_telemetry")
         return tweak.check_status()
 
     @staticmethod
     def toggle_windows_telemetry():
-        from utils.tweaks.windows_telemetry import WindowsTelemetryTweak
-        tweak = WindowsTelemetryTweak()
+        tweak = SystemTweaks.tweak("windows_telemetry")
         return tweak.toggle()
 
     # === NVIDIA Telemetry ===
     @staticmethod
     def check_nvidia_telemetry_status():
-        from utils.tweaks.nvidia_telemetry import NvidiaTelemetryTweak
-        tweak = NvidiaTelemetryTweak()
+        tweak = SystemTweaks.tweak("nvidia_telemetry")
         return tweak.check_status()
 
     @staticmethod
     def toggle_nvidia_telemetry():
-        from utils.tweaks.nvidia_telemetry import NvidiaTelemetryTweak
-        tweak = NvidiaTelemetryTweak()
+        tweak = SystemTweaks.tweak("nvidia_telemetry")
         return tweak.toggle()
 
     # === Installed App Data ===
     @staticmethod
     def check_installed_app_data_status():
-        from utils.tweaks.installed_app_data import InstalledAppDataTweak
-        tweak = InstalledAppDataTweak()
+        tweak = SystemTweaks.tweak("installed_app_data")
         return tweak.check_status()
 
     @staticmethod
     def toggle_installed_app_data():
-        from utils.tweaks.installed_app_data import InstalledAppDataTweak
-        tweak = InstalledAppDataTweak()
+        tweak = SystemTweaks.tweak("installed_app_data")
         return tweak.toggle()
 
     # === App Usage Stats ===
     @staticmethod
     def check_app_usage_stats_status():
-        from utils.tweaks.app_usage_stats import AppUsageStatsTweak
-        tweak = AppUsageStatsTweak()
+        tweak = SystemTweaks.tweak("app_usage_stats")
         return tweak.check_status()
 
     @staticmethod
     def toggle_app_usage_stats():
-        from utils.tweaks.app_usage_stats import AppUsageStatsTweak
-        tweak = AppUsageStatsTweak()
+        tweak = SystemTweaks.tweak("app_usage_stats")
         return tweak.toggle()
 
     # === Handwriting Data ===
     @staticmethod
     def check_handwriting_data_status():
-        from utils.tweaks.handwriting_data import HandwritingDataTweak
-        tweak = HandwritingDataTweak()
+        tweak = SystemTweaks.tweak("handwriting_data")
         return tweak.check_status()
 
     @staticmethod
     def toggle_handwriting_data():
-        from utils.tweaks.handwriting_data import HandwritingDataTweak
-        tweak = HandwritingDataTweak()
+        tweak = SystemTweaks.tweak("handwriting_data")
         return tweak.toggle()
 
     # === Data Domains (hosts file modification) ===
     @staticmethod
     def check_data_domains_status():
-        from utils.tweaks.data_domains import DataDomainsTweak
-        tweak = DataDomainsTweak()
+        tweak = SystemTweaks.tweak("data_domains")
         return tweak.check_status()
 
     @staticmethod
     def modify_hosts_file():
-        from utils.tweaks.data_domains import DataDomainsTweak
-        tweak = DataDomainsTweak()
+        tweak = SystemTweaks.tweak("data_domains")
         return tweak.modify() #  Более подходящее название метода
 
     # === User Behavior Logging ===
     @staticmethod
     def check_user_behavior_logging_status():
-        from utils.tweaks.user_behavior_logging import UserBehaviorLoggingTweak
-        tweak = UserBehaviorLoggingTweak()
+        tweak = SystemTweaks.tweak("user_behavior_logging")
         return tweak.check_status()
 
     @staticmethod
     def toggle_user_behavior_logging():
-        from utils.tweaks.user_behavior_logging import UserBehaviorLoggingTweak
-        tweak = UserBehaviorLoggingTweak()
+        tweak = SystemTweaks.tweak("user_behavior_logging")
         return tweak.toggle()
 
     # === Location Tracking ===
     @staticmethod
     def check_location_tracking_status():
-        from utils.tweaks.location_tracking import LocationTrackingTweak
-        tweak = LocationTrackingTweak()
+        tweak = SystemTweaks.tweak("location_tracking")
         return tweak.check_status()
 
     @staticmethod
     def toggle_location_tracking():
-        from utils.tweaks.location_tracking import LocationTrackingTweak
-        tweak = LocationTrackingTweak()
+        tweak = SystemTweaks.tweak("location_tracking")
         return tweak.toggle()
 
     # === Feedback Check ===
     @staticmethod
     def check_feedback_check_status():
-        from utils.tweaks.feedback_check import FeedbackCheckTweak
-        tweak = FeedbackCheckTweak()
+        tweak = SystemTweaks.tweak("feedback_check")
         return tweak.check_status()
 
     @staticmethod
     def toggle_feedback_check():
-        from utils.tweaks.feedback_check import FeedbackCheckTweak
-        tweak = FeedbackCheckTweak()
+        tweak = SystemTweaks.tweak("feedback_check")
         return tweak.toggle()
 
     # === Background Speech Synthesis ===
     @staticmethod
     def check_background_speech_synthesis_status():
-        from utils.tweaks.background_speech_synthesis import BackgroundSpeechSynthesisTweak
-        tweak = BackgroundSpeechSynthesisTweak()
+        tweak = SystemTweaks.tweak("background_speech_synthesis")
         return tweak.check_status()
 
     @staticmethod
     def toggle_background_speech_synthesis():
-        from utils.tweaks.background_speech_synthesis import BackgroundSpeechSynthesisTweak
-        tweak = BackgroundSpeechSynthesisTweak()
+        tweak = SystemTweaks.tweak("background_speech_synthesis")
         return tweak.toggle()
 
     # === System Monitoring ===
     @staticmethod
     def check_system_monitoring_status():
-        from utils.tweaks.system_monitoring import SystemMonitoringTweak
-        tweak = SystemMonitoringTweak()
+        tweak = SystemTweaks.tweak("system_monitoring")
         return tweak.check_status()
 
     @staticmethod
     def toggle_system_monitoring():
-        from utils.tweaks.system_monitoring import SystemMonitoringTweak
-        tweak = SystemMonitoringTweak()
+        tweak = SystemTweaks.tweak("system_monitoring")
         return tweak.toggle()
 
     # === Remote PC Experiments ===
     @staticmethod
     def check_remote_pc_experiments_status():
-        from utils.tweaks.remote_pc_experiments import RemotePCExperimentsTweak
-        tweak = RemotePCExperimentsTweak()
+        tweak = SystemTweaks.tweak("remote_pc_experiments")
         return tweak.check_status()
 
     @staticmethod
     def toggle_remote_pc_experiments():
-        from utils.tweaks.remote_pc_experiments import RemotePCExperimentsTweak
-        tweak = RemotePCExperimentsTweak()
+        tweak = SystemTweaks.tweak("remote_pc_experiments")
         return tweak.toggle()
 
     # === Microsoft Spy Modules ===
     @staticmethod
     def check_microsoft_spy_modules_status():
-        from utils.tweaks.microsoft_spy_modules import MicrosoftSpyModulesTweak
-        tweak = MicrosoftSpyModulesTweak()
+        tweak = SystemTweaks.tweak("microsoft_spy_modules")
         return tweak.check_status()
     @staticmethod
     def toggle_microsoft_spy_modules():
-        from utils.tweaks.microsoft_spy_modules import MicrosoftSpyModulesTweak
-        tweak = MicrosoftSpyModulesTweak()
+        tweak = SystemTweaks.tweak("microsoft_spy_modules")
         return tweak.toggle()
 
     # === Windows Event Logging ===
     @staticmethod
     def check_windows_event_logging_status():
-        from utils.tweaks.windows_event_logging import WindowsEventLoggingTweak
-        tweak = WindowsEventLoggingTweak()
+        tweak = SystemTweaks.tweak("windows_event_logging")
         return tweak.check_status()
 
     @staticmethod
     def toggle_windows_event_logging():
-        from utils.tweaks.windows_event_logging import WindowsEventLoggingTweak
-        tweak = WindowsEventLoggingTweak()
+        tweak = SystemTweaks.tweak("windows_event_logging")
         return tweak.toggle()
 
     # === App Start Tracking ===
     @staticmethod
     def check_app_start_tracking_status():
-        from utils.tweaks.app_start_tracking import AppStartTrackingTweak
-        tweak = AppStartTrackingTweak()
+        tweak = SystemTweaks.tweak("app_start_tracking")
         return tweak.check_status()
 
     @staticmethod
     def toggle_app_start_tracking():
-        from utils.tweaks.app_start_tracking import AppStartTrackingTweak
-        tweak = AppStartTrackingTweak()
+        tweak = SystemTweaks.tweak("app_start_tracking")
         return tweak.toggle()
 
     # === App Settings Sync ===
     @staticmethod
     def check_app_settings_sync_status():
-        from utils.tweaks.app_settings_sync import AppSettingsSyncTweak
-        tweak = AppSettingsSyncTweak()
+        tweak = SystemTweaks.tweak("app_settings_sync")
         return tweak.check_status()
 
     @staticmethod
     def toggle_app_settings_sync():
-        from utils.tweaks.app_settings_sync import AppSettingsSyncTweak
-        tweak = AppSettingsSyncTweak()
+        tweak = SystemTweaks.tweak("app_settings_sync")
         return tweak.toggle()
 
     # === Explorer Blur ===
     @staticmethod
     def check_explorer_blur_status():
-        from utils.tweaks.explorer_blur import ExplorerBlurTweak
-        tweak = ExplorerBlurTweak()
+        tweak = SystemTweaks.tweak("explorer_blur")
         return tweak.check_status()
 
     @staticmethod
     def toggle_explorer_blur():
-        from utils.tweaks.explorer_blur import ExplorerBlurTweak
-        tweak = ExplorerBlurTweak()
+        tweak = SystemTweaks.tweak("explorer_blur")
         return tweak.toggle()
 
     # === Show File Extensions ===
     @staticmethod
     def check_show_file_extensions_status():
-        from utils.tweaks.show_file_extensions import ShowFileExtensionsTweak
-        tweak = ShowFileExtensionsTweak()
+        tweak = SystemTweaks.tweak("show_file_extensions")
         return tweak.check_status()
 
     @staticmethod
     def toggle_show_file_extensions():
-        from utils.tweaks.show_file_extensions import ShowFileExtensionsTweak
-        tweak = ShowFileExtensionsTweak()
+        tweak = SystemTweaks.tweak("show_file_extensions")
         return tweak.toggle()
 
     # === Gallery Explorer ===
     @staticmethod
     def check_gallery_explorer_status():
-        from utils.tweaks.gallery_explorer import GalleryExplorerTweak
-        tweak = GalleryExplorerTweak()
+        tweak = SystemTweaks.tweak("gallery_explorer")
         return tweak.check_status()
 
     @staticmethod
     def toggle_gallery_explorer():
-        from utils.tweaks.gallery_explorer import GalleryExplorerTweak
-        tweak = GalleryExplorerTweak()
+        tweak = SystemTweaks.tweak("gallery_explorer")
         return tweak.toggle()
 
     # === Home Explorer ===
     @staticmethod
     def check_home_explorer_status():
-        from utils.tweaks.home_explorer import HomeExplorerTweak
-        tweak = HomeExplorerTweak()
+        tweak = SystemTweaks.tweak("home_explorer")
         return tweak.check_status()
 
     @staticmethod
     def toggle_home_explorer():
-        from utils.tweaks.home_explorer import HomeExplorerTweak
-        tweak = HomeExplorerTweak()
+        tweak = SystemTweaks.tweak("home_explorer")
         return tweak.toggle()
 
     # === Network Explorer ===
     @staticmethod
     def check_network_explorer_status():
-        from utils.tweaks.network_explorer import NetworkExplorerTweak
-        tweak = NetworkExplorerTweak()
+        tweak = SystemTweaks.tweak("network_explorer")
         return tweak.check_status()
 
     @staticmethod
     def toggle_network_explorer():
-        from utils.tweaks.network_explorer import NetworkExplorerTweak
-        tweak = NetworkExplorerTweak()
+        tweak = SystemTweaks.tweak("network_explorer")
         return tweak.toggle()
 
     # === Taskbar Date ===
     @staticmethod
     def check_taskbar_date_status():
-        from utils.tweaks.taskbar_date import TaskbarDateTweak
-        tweak = TaskbarDateTweak()
+        tweak = SystemTweaks.tweak("taskbar_date")
         return tweak.check_status()
 
     @staticmethod
     def toggle_taskbar_date():
-        from utils.tweaks.taskbar_date import TaskbarDateTweak
-        tweak = TaskbarDateTweak()
+        tweak = SystemTweaks.tweak("taskbar_date")
         return tweak.toggle()
 
     # === Icon Arrow On Shortcut ===
     @staticmethod
     def check_icon_arrow_on_shortcut_status():
-        from utils.tweaks.icon_arrow_on_shortcut import IconArrowOnShortcutTweak
-        tweak = IconArrowOnShortcutTweak()
+        tweak = SystemTweaks.tweak("icon_arrow_on_shortcut")
         return tweak.check_status()
 
     @staticmethod
     def toggle_icon_arrow_on_shortcut():
-        from utils.tweaks.icon_arrow_on_shortcut import IconArrowOnShortcutTweak
-        tweak = IconArrowOnShortcutTweak()
+        tweak = SystemTweaks.tweak("icon_arrow_on_shortcut")
         return tweak.toggle()
 
     # === PcaSvc Service ===
     @staticmethod
     def check_service_pcasvc_status():
-        from utils.tweaks.services_pcasvc import PcaSvcServiceTweak
-        tweak = PcaSvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_pcasvc")
         return tweak.check_status()
     @staticmethod
     def toggle_service_pcasvc():
-        from utils.tweaks.services_pcasvc import PcaSvcServiceTweak
-        tweak = PcaSvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_pcasvc")
         return tweak.toggle()
 
     # === Wecsvc Service ===
     @staticmethod
     def check_service_wecsvc_status():
-        from utils.tweaks.services_wecsvc import WecsvcServiceTweak
-        tweak = WecsvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_wecsvc")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_wecsvc():
-        from utils.tweaks.services_wecsvc import WecsvcServiceTweak
-        tweak = WecsvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_wecsvc")
         return tweak.toggle()
 
     # === WbioSrvc Service ===
     @staticmethod
     def check_service_wbiosrvc_status():
-        from utils.tweaks.services_wbiosrvc import WbioSrvcServiceTweak
-        tweak = WbioSrvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_wbiosrvc")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_wbiosrvc():
-        from utils.tweaks.services_wbiosrvc import WbioSrvcServiceTweak
-        tweak = WbioSrvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_wbiosrvc")
         return tweak.toggle()
 
     # === stisvc Service ===
     @staticmethod
     def check_service_stisvc_status():
-        from utils.tweaks.services_stisvc import StisvcServiceTweak
-        tweak = StisvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_stisvc")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_stisvc():
-        from utils.tweaks.services_stisvc import StisvcServiceTweak
-        tweak = StisvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_stisvc")
         return tweak.toggle()
 
     # === WSearch Service ===
     @staticmethod
     def check_service_wsearch_status():
-        from utils.tweaks.services_wsearch import WSearchServiceTweak
-        tweak = WSearchServiceTweak()
+        tweak = SystemTweaks.tweak("service_wsearch")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_wsearch():
-        from utils.tweaks.services_wsearch import WSearchServiceTweak
-        tweak = WSearchServiceTweak()
+        tweak = SystemTweaks.tweak("service_wsearch")
         return tweak.toggle()
 
     # === MapsBroker Service ===
     @staticmethod
     def check_service_mapsbroker_status():
-        from utils.tweaks.services_mapsbroker import MapsBrokerServiceTweak
-        tweak = MapsBrokerServiceTweak()
+        tweak = SystemTweaks.tweak("service_mapsbroker")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_mapsbroker():
-        from utils.tweaks.services_mapsbroker import MapsBrokerServiceTweak
-        tweak = MapsBrokerServiceTweak()
+        tweak = SystemTweaks.tweak("service_mapsbroker")
         return tweak.toggle()
 
     # === Sensor Services (SensorService, SensorDataService, SensrSvc) ===
     @staticmethod
     def check_service_sensorservice_status():
-        from utils.tweaks.services_sensorservice import SensorServicesTweak
-        tweak = SensorServicesTweak()
+        tweak = SystemTweaks.tweak("service_sensorservice")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_sensorservice():
-        from utils.tweaks.services_sensorservice import SensorServicesTweak
-        tweak = SensorServicesTweak()
+        tweak = SystemTweaks.tweak("service_sensorservice")
         return tweak.toggle()
 
     # === Hyper-V Services ===
     @staticmethod
     def check_service_hyperv_status():
-        from utils.tweaks.services_hyperv import HyperVServicesTweak
-        tweak = HyperVServicesTweak()
+        tweak = SystemTweaks.tweak("service_hyperv")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_hyperv():
-        from utils.tweaks.services_hyperv import HyperVServicesTweak
-        tweak = HyperVServicesTweak()
+        tweak = SystemTweaks.tweak("service_hyperv")
         return tweak.toggle()
 
     # === Xbox Services (XblGameSave, XboxNetApiSvc, XboxGipSvc, XblAuthManager) ===
     @staticmethod
     def check_service_xblgamesave_status():
-        from utils.tweaks.services_xblgamesave import XblGameSaveServicesTweak
-        tweak = XblGameSaveServicesTweak()
+        tweak = SystemTweaks.tweak("service_xblgamesave")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_xblgamesave():
-        from utils.tweaks.services_xblgamesave import XblGameSaveServicesTweak
-        tweak = XblGameSaveServicesTweak()
+        tweak = SystemTweaks.tweak("service_xblgamesave")
         return tweak.toggle()
 
 # === Printer Services ===
     @staticmethod
     def check_service_printer_status():
-        from utils.tweaks.services_printer import PrinterServicesTweak
-        tweak = PrinterServicesTweak()
+        tweak = SystemTweaks.tweak("services_printer")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_printer():
-        from utils.tweaks.services_printer import PrinterServicesTweak
-        tweak = PrinterServicesTweak()
+        tweak = SystemTweaks.tweak("services_printer")
         return tweak.toggle()
 
 # === SysMain Service ===
     @staticmethod
     def check_sysmain_service_status():
-        from utils.tweaks.service_sysmain import SysMainServiceTweak  # Изменен путь импорта
-        tweak = SysMainServiceTweak()
+        tweak = SystemTweaks.tweak("service_sysmain")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_sysmain():
-        from utils.tweaks.service_sysmain import SysMainServiceTweak  # Изменен путь импорта
-        tweak = SysMainServiceTweak()
+        tweak = SystemTweaks.tweak("service_sysmain")
         return tweak.toggle()
 
 # === wisvc Service ===
     @staticmethod
     def check_wisvc_service_status():
-        from utils.tweaks.service_wisvc import WisvcServiceTweak
-        tweak = WisvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_wisvc")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_wisvc():
-        from utils.tweaks.service_wisvc import WisvcServiceTweak
-        tweak = WisvcServiceTweak()
+        tweak = SystemTweaks.tweak("service_wisvc")
         return tweak.toggle()
 
 # === Diagnostics Services ===
     @staticmethod
     def check_diagnostics_services_status():
-        from utils.tweaks.service_diagnostics import DiagnosticsServicesTweak
-        tweak = DiagnosticsServicesTweak()
+        tweak = SystemTweaks.tweak("service_diagnostics")
         return tweak.check_status()
 
     @staticmethod
     def toggle_service_diagnostics():
-        from utils.tweaks.service_diagnostics import DiagnosticsServicesTweak
-        tweak = DiagnosticsServicesTweak()
+        tweak = SystemTweaks.tweak("service_diagnostics")
         return tweak.toggle()
\ No newline at end of file
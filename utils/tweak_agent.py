@@ -0,0 +1,492 @@
+"""
+Локальный агент ASX Hub: движок твиков, постоянно работающий в фоне.
+
+Агент держит в памяти реестр твиков, пул дескрипторов и кэш реестра, снимок служб и
+хранилище анализа, периодически обновляет анализ (инкрементально, по отпечаткам) и
+отвечает на запросы JSON-RPC 2.0 по TCP на 127.0.0.1 - по одному JSON-объекту на
+строку. Запрос status отдаётся из памяти, без нового прохода анализатора.
+
+Порт и токен пишутся в %APPDATA%/ASX-Hub/agent.json (профиль пользователя); токен
+передаётся в поле "token" каждого запроса. Методы: ping, status, analyze, check, diff,
+apply, stats, shutdown.
+
+Агент слушает только loopback-адреса. Агент с правами администратора закрывает
+agent.json для всех, кроме Administrators и SYSTEM, иначе apply из процесса без повышения
+прав обходил бы UAC; если права на файл выставить не удалось, apply отключается.
+
+    python -m utils.tweak_agent serve [--port N] [--refresh 60]
+    python -m utils.tweak_agent call status --params '{"keys": ["uac"]}'
+"""
+import os
+import sys
+import hmac
+import json
+import time
+import socket
+import inspect
+import ipaddress
+import subprocess
+import argparse
+import secrets
+import tempfile
+import threading
+import socketserver
+from dataclasses import asdict
+from typing import Optional, Any, Callable, Dict, List
+
+from utils.analysis_store import get_analysis_store
+from utils.preset_planner import PresetPlanner, resolve_preset
+from utils.registry_handler import RegistryHandler
+from utils.service_inventory import get_service_inventory
+
+DEFAULT_HOST = "127.0.0.1"
+MAX_REQUEST_BYTES = 1024 * 1024
+
+# Коды ошибок JSON-RPC 2.0 и свои (-32000..-32099)
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+UNAUTHORIZED = -32001
+
+
+class AgentError(Exception):
+    """JSON-RPC error returned by the agent (or raised by a method to report one)"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def is_loopback_host(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _is_elevated() -> bool:
+    if os.name == "nt":
+        try:
+            import ctypes
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except (AttributeError, OSError):
+            return False
+    return hasattr(os, "geteuid") and os.geteuid() == 0
+
+
+def _restrict_to_admins(path: str) -> bool:
+    """Leaves only Administrators and SYSTEM in the file's ACL (Windows)"""
+    # SID вместо имён групп - имена локализованы ("Администраторы")
+    try:
+        result = subprocess.run(["icacls", path, "/inheritance:r", "/grant:r", "*S-1-5-32-544:F", "*S-1-5-18:F"],
+                                capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"Error restricting access to {path}: {e}")
+        return False
+    if result.returncode != 0:
+        print(f"Error restricting access to {path}: {result.stderr.strip() or result.stdout.strip()}")
+    return result.returncode == 0
+
+
+def agent_info_path() -> str:
+    app_data_dir = os.getenv('APPDATA') or os.path.expanduser("~")
+    return os.path.join(app_data_dir, "ASX-Hub", "agent.json")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = False
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        agent: "TweakAgent" = self.server.agent
+        # Соединение держится открытым: клиент шлёт запросы один за другим без переподключения
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                break
+            if len(line) > MAX_REQUEST_BYTES:
+                self._send(agent.error_response(None, INVALID_REQUEST, "Request too large"))
+                break
+            if not line.strip():
+                continue
+            response = agent.handle_line(line)
+            if response is not None:
+                self._send(response)
+
+    def _send(self, response: Dict[str, Any]):
+        self.wfile.write(json.dumps(response, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class TweakAgent:
+    """Resident tweak engine answering JSON-RPC requests on a localhost socket"""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = 0, token: Optional[str] = None,
+                 refresh_interval: float = 60.0, info_path: Optional[str] = None):
+        if not is_loopback_host(host):
+            raise ValueError(f"Agent host must be a loopback address, got {host}")
+        self.host = host
+        self.port = port
+        self.token = token or secrets.token_hex(16)
+        self.refresh_interval = refresh_interval
+        self.info_path = info_path or agent_info_path()
+        self.elevated = _is_elevated()
+        # Сбрасывается, если токен агента с правами администратора мог утечь к обычным процессам
+        self.apply_allowed = True
+        self.planner = PresetPlanner()
+        self.store = get_analysis_store()
+        self.registry = RegistryHandler()
+        # Анализ и применение пресетов меняют общее состояние движка - по одному за раз
+        self.engine_lock = threading.Lock()
+        self.started = time.time()
+        self.last_analysis = 0.0
+        self.stats_lock = threading.Lock()
+        self.calls: Dict[str, Dict[str, float]] = {}
+        self._server: Optional[_Server] = None
+        self._stop = threading.Event()
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "ping": self.rpc_ping,
+            "status": self.rpc_status,
+            "analyze": self.rpc_analyze,
+            "check": self.rpc_check,
+            "diff": self.rpc_diff,
+            "apply": self.rpc_apply,
+            "stats": self.rpc_stats,
+            "shutdown": self.rpc_shutdown,
+        }
+
+    # --- движок ---
+
+    def analyze(self, incremental: bool = True) -> Dict[str, Any]:
+        """Analyzer pass over every tweak; the result goes to the shared analysis store"""
+        with self.engine_lock:
+            analysis = self.planner.analyze(self.planner.tweak_keys(), incremental=incremental)
+            self.store.replace(analysis, self.registry.cache_generation())
+            self.last_analysis = time.time()
+        return analysis
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.analyze()
+            except Exception as e:
+                print(f"Error refreshing tweak analysis: {e}")
+
+    def _known_keys(self, keys: Optional[List[str]]) -> List[str]:
+        if keys is None:
+            return self.planner.tweak_keys()
+        if not isinstance(keys, list):
+            raise AgentError(INVALID_PARAMS, "keys must be a list of tweak keys")
+        unknown = [key for key in keys if not self.planner.tweaks.configs.get(key, {}).get("class_name")]
+        if unknown:
+            raise AgentError(INVALID_PARAMS, f"Unknown tweaks: {', '.join(map(str, unknown))}")
+        return keys
+
+    # --- методы RPC ---
+
+    def rpc_ping(self) -> Dict[str, Any]:
+        from config import APP_VERSION
+        return {"version": APP_VERSION, "pid": os.getpid(), "uptime": round(time.time() - self.started, 1),
+                "elevated": self.elevated, "apply_allowed": self.apply_allowed}
+
+    def rpc_status(self, keys: Optional[List[str]] = None, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Statuses from memory; a new (incremental) analysis only when there is none or it is older than max_age"""
+        keys = self._known_keys(keys)
+        if not self.last_analysis or (max_age is not None and time.time() - self.last_analysis > max_age):
+            self.analyze()
+        statuses = self.store.statuses()
+        return {"age": round(time.time() - self.last_analysis, 3),
+                "tweaks": {key: statuses[key] for key in keys if key in statuses}}
+
+    def rpc_analyze(self, full: bool = False) -> Dict[str, Any]:
+        analysis = self.analyze(incremental=not full)
+        # Отпечатки и список чтений реестра нужны только самому агенту
+        return {name: value for name, value in analysis.items() if name not in ("fingerprints", "registry_reads")}
+
+    def rpc_check(self, keys: List[str]) -> Dict[str, Any]:
+        """Probes the given tweaks now, bypassing fingerprints, and updates the in-memory statuses"""
+        keys = self._known_keys(keys)
+        generation = self.registry.cache_generation()
+        with self.engine_lock:
+            analysis = self.planner.analyze(keys, incremental=False)
+        for tweak_key, status in analysis["tweaks"].items():
+            fields = {name: value for name, value in status.items() if name not in ("enabled", "optimized")}
+            self.store.set_status(tweak_key, status["enabled"], generation, **fields)
+        return {"tweaks": analysis["tweaks"], "probe_ms": analysis.get("probe_ms")}
+
+    def rpc_diff(self, profile: str) -> Dict[str, Any]:
+        preset = resolve_preset(profile)
+        with self.engine_lock:
+            plan = self.planner.plan(preset)
+        return {"preset": preset.name, "changes": plan.changes(), "unchanged": plan.unchanged,
+                "skipped": plan.skipped, "probe_ms": plan.probe_ms}
+
+    def rpc_apply(self, profile: str) -> Dict[str, Any]:
+        if not self.apply_allowed:
+            raise AgentError(UNAUTHORIZED, "apply is disabled: agent.json could not be restricted to administrators")
+        preset = resolve_preset(profile)
+        with self.engine_lock:
+            plan = self.planner.apply(preset)
+        return dict(plan.summary(), steps=[asdict(step) for step in plan.steps])
+
+    def rpc_stats(self) -> Dict[str, Any]:
+        with self.stats_lock:
+            calls = {method: dict(counters) for method, counters in self.calls.items()}
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "last_analysis_age": round(time.time() - self.last_analysis, 1) if self.last_analysis else None,
+            "calls": calls,
+            "store": self.store.stats(),
+            "tweaks": self.planner.tweaks.stats(),
+            "registry_pool": self.registry.pool_stats(),
+            "registry_cache": self.registry.cache_stats(),
+            "services": get_service_inventory(self.registry).stats(),
+        }
+
+    def rpc_shutdown(self) -> bool:
+        # Ответ уходит раньше, чем сервер остановится
+        threading.Thread(target=self.stop, daemon=True).start()
+        return True
+
+    # --- протокол ---
+
+    @staticmethod
+    def error_response(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+    def handle_line(self, line: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            request = json.loads(line)
+        except (ValueError, UnicodeDecodeError) as e:
+            return self.error_response(None, PARSE_ERROR, f"Parse error: {e}")
+        return self.handle(request)
+
+    def handle(self, request: Any) -> Optional[Dict[str, Any]]:
+        """Processes one JSON-RPC request; None for notifications (requests without an id)"""
+        if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" \
+                or not isinstance(request.get("method"), str):
+            return self.error_response(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        is_notification = "id" not in request
+        try:
+            if not hmac.compare_digest(str(request.get("token", "")), self.token):
+                raise AgentError(UNAUTHORIZED, "Invalid token")
+            result = self._call(request["method"], request.get("params"))
+        except AgentError as e:
+            return None if is_notification else self.error_response(request_id, e.code, str(e))
+        if is_notification:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def _call(self, method_name: str, params: Any) -> Any:
+        method = self._methods.get(method_name)
+        if method is None:
+            raise AgentError(METHOD_NOT_FOUND, f"Method not found: {method_name}")
+        if params is None:
+            params = {}
+        if not isinstance(params, dict):
+            raise AgentError(INVALID_PARAMS, "params must be an object")
+        try:
+            inspect.signature(method).bind(**params)
+        except TypeError as e:
+            raise AgentError(INVALID_PARAMS, str(e))
+
+        start = time.perf_counter()
+        try:
+            return method(**params)
+        except AgentError:
+            raise
+        except ValueError as e:  # неизвестный пресет и т.п.
+            raise AgentError(INVALID_PARAMS, str(e))
+        except Exception as e:
+            print(f"Error in agent method {method_name}: {e}")
+            raise AgentError(INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self.stats_lock:
+                counters = self.calls.setdefault(method_name, {"count": 0, "total_ms": 0.0})
+                counters["count"] += 1
+                counters["total_ms"] = round(counters["total_ms"] + elapsed, 3)
+
+    # --- запуск ---
+
+    def _write_info(self):
+        info = {"host": self.host, "port": self.port, "token": self.token, "pid": os.getpid(),
+                "started": self.started}
+        directory = os.path.dirname(self.info_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            # Права выставляются на ещё пустой файл, до записи токена; os.replace их сохраняет.
+            # На POSIX mkstemp и так создаёт файл 0600
+            if self.elevated and os.name == "nt" and not _restrict_to_admins(tmp_path):
+                print("agent.json is readable by non-elevated processes, apply is disabled")
+                self.apply_allowed = False
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(info, f)
+            os.replace(tmp_path, self.info_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _remove_info(self):
+        try:
+            with open(self.info_path, "r", encoding="utf-8") as f:
+                if json.load(f).get("pid") != os.getpid():
+                    return  # файл уже переписал другой агент
+            os.remove(self.info_path)
+        except (OSError, ValueError):
+            pass
+
+    def start(self):
+        """Binds the socket, publishes agent.json and runs the first analysis"""
+        self._server = _Server((self.host, self.port), _RequestHandler)
+        self._server.agent = self
+        self.port = self._server.server_address[1]
+        self.analyze()
+        self._write_info()
+        if self.refresh_interval > 0:
+            threading.Thread(target=self._refresh_loop, name="agent-refresh", daemon=True).start()
+
+    def serve_forever(self):
+        if self._server is None:
+            self.start()
+        print(f"ASX Hub agent listening on {self.host}:{self.port}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._remove_info()
+            self._server.server_close()
+            self.store.flush()
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class AgentClient:
+    """Persistent JSON-RPC connection to a running agent"""
+
+    def __init__(self, host: str, port: int, token: str, timeout: float = 120.0):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._ids = 0
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+
+    @classmethod
+    def discover(cls, info_path: Optional[str] = None, timeout: float = 120.0,
+                 connect_timeout: float = 2.0) -> Optional["AgentClient"]:
+        """Client for the agent described in agent.json, None if no agent answers ping within connect_timeout"""
+        client = None
+        try:
+            with open(info_path or agent_info_path(), "r", encoding="utf-8") as f:
+                info = json.load(f)
+            # Зависший агент не должен задерживать вызывающего на полный timeout
+            client = cls(info["host"], int(info["port"]), info["token"], connect_timeout)
+            client.call("ping")
+        except (OSError, ValueError, KeyError, AgentError):
+            if client is not None:
+                client.close()
+            return None
+        client.set_timeout(timeout)
+        return client
+
+    def set_timeout(self, timeout: float):
+        with self.lock:
+            self.timeout = timeout
+            if self._sock is not None:
+                self._sock.settimeout(timeout)
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._file = self._sock.makefile("rb")
+
+    def close(self):
+        with self.lock:
+            self._close()
+
+    def _close(self):
+        for resource in (self._file, self._sock):
+            if resource is not None:
+                try:
+                    resource.close()
+                except OSError:
+                    pass
+        self._sock = None
+        self._file = None
+
+    def call(self, method: str, **params) -> Any:
+        """Sends one request and returns its result; raises AgentError for RPC errors"""
+        with self.lock:
+            self._ids += 1
+            request = {"jsonrpc": "2.0", "id": self._ids, "method": method, "params": params, "token": self.token}
+            data = json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n"
+            # Агент мог закрыть простаивающее соединение - одна попытка переподключиться
+            for attempt in (0, 1):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(data)
+                    line = self._file.readline(MAX_REQUEST_BYTES * 64)
+                    if not line:
+                        raise ConnectionError("Agent closed the connection")
+                    break
+                except OSError:
+                    self._close()
+                    if attempt:
+                        raise
+            response = json.loads(line)
+        if "error" in response:
+            raise AgentError(response["error"].get("code", INTERNAL_ERROR), response["error"].get("message", ""))
+        return response.get("result")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ASX Hub tweak agent")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the agent")
+    serve.add_argument("--host", default=DEFAULT_HOST)
+    serve.add_argument("--port", type=int, default=0, help="TCP port (default: any free port)")
+    serve.add_argument("--refresh", type=float, default=60.0, help="seconds between background analyses (0 - off)")
+    call = commands.add_parser("call", help="call a method of the running agent")
+    call.add_argument("method")
+    call.add_argument("--params", default="{}", help="JSON object with the method parameters")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            agent = TweakAgent(args.host, args.port, refresh_interval=args.refresh)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        agent.serve_forever()
+        return 0
+
+    client = AgentClient.discover()
+    if client is None:
+        print("ASX Hub agent is not running", file=sys.stderr)
+        return 2
+    try:
+        result = client.call(args.method, **json.loads(args.params))
+    except AgentError as e:
+        print(json.dumps({"error": {"code": e.code, "message": str(e)}}, ensure_ascii=False))
+        return 1
+    finally:
+        client.close()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
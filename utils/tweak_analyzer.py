@@ -1,16 +1,24 @@
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from functools import lru_cache
-import os
+
+from utils.analysis_store import get_analysis_store
+from utils.registry_handler import RegistryHandler
+from utils.service_inventory import get_service_inventory
+from utils.tweak_fingerprint import TweakInputs, fingerprint_recorded, fingerprint_sweep
+from utils.tweak_specs import default_probe_plan
 
 
 class TweakAnalyzer:
     def __init__(self):
-        self.analysis_file = "tweak_analysis.json"
-        self._latest_analysis: Optional[Dict[str, Any]] = None
-        self._last_analysis_time = 0
-        self._analysis_cache_ttl = 300  # 5 minutes cache TTL
+        # Анализ хранится в общем хранилище в памяти, на диск его пишет хранилище
+        self.store = get_analysis_store()
+        self.registry = RegistryHandler()
+        # Медленные проверки (slow_check) выполняются параллельно в ограниченном пуле
+        self.max_probe_workers = 4
+        self.probe_timeout = 20.0
 
     @lru_cache(maxsize=32)
     def _get_tweak_configs(self) -> Dict[str, Any]:
@@ -18,13 +26,15 @@ class TweakAnalyzer:
         from config import TWEAKS
         return {t["key"]: t for t in TWEAKS}
 
-    def _get_tweak_status(self, tweak_key: str, tweak_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Get status for a single tweak with error handling"""
+    def _get_tweak_status(self, tweak_key: str, tweak_data: Dict[str, Any],
+                          is_enabled: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        """Get status for a single tweak with error handling (is_enabled: status already probed)"""
         try:
             if not tweak_data.get("check_status_func"):
                 return None
 
-            is_enabled = tweak_data["check_status_func"]()
+            if is_enabled is None:
+                is_enabled = tweak_data["check_status_func"]()
             tweak_instance = tweak_data.get("instance")
             config = self._get_tweak_configs().get(tweak_key, {})
             optimized_state = config.get("optimized_state", True)
@@ -41,90 +51,188 @@ class TweakAnalyzer:
             print(f"Error checking status for {tweak_key}: {e}")
             return None
 
-    def collect_tweak_statuses(self, tweaks: Dict[str, Any]) -> Dict[str, Any]:
-        """Collect current status of all tweaks with improved performance"""
+    def _timed_probe(self, tweak_key: str, tweak_data: Dict[str, Any], is_enabled: Optional[bool] = None,
+                     started: Optional[Dict[str, float]] = None,
+                     fingerprints: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """_get_tweak_status() with the probe latency added to the result (and the input fingerprint recorded)"""
+        start = time.perf_counter()
+        if started is not None:
+            started[tweak_key] = start
+        with RegistryHandler.record_reads() as reads:
+            status = self._get_tweak_status(tweak_key, tweak_data, is_enabled)
+        if status:
+            status["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            if fingerprints is not None and is_enabled is None:
+                fingerprint = self._fingerprint(tweak_key, tweak_data, reads)
+                if fingerprint is not None:
+                    fingerprints[tweak_key] = fingerprint
+        return status
+
+    def _fingerprint(self, tweak_key: str, tweak_data: Dict[str, Any],
+                     reads: Dict[Tuple[str, str], Any]) -> Optional[Dict[str, Any]]:
+        """Inputs and fingerprint of a probe that has just run; None when the tweak can't be fingerprinted"""
+        try:
+            status_inputs = getattr(tweak_data.get("instance"), "status_inputs", None)
+            declared = status_inputs() if status_inputs is not None else None
+            if declared is None:
+                return None
+            inputs = TweakInputs.combine(reads, declared)
+            # Проверка без входов ничего не читала через RegistryHandler - повторять её дёшево
+            if not inputs.registry and not inputs.files:
+                return None
+            return {"inputs": inputs.to_dict(), "hash": fingerprint_recorded(inputs, reads, self.registry)}
+        except Exception as e:
+            print(f"Error fingerprinting {tweak_key}: {e}")
+            return None
+
+    @staticmethod
+    def _fingerprint_version() -> str:
+        # Новая версия приложения могла изменить сами проверки - старые отпечатки не годятся
+        from config import APP_VERSION
+        return f"{APP_VERSION}/1"
+
+    def _reuse_unchanged(self, tweaks: Dict[str, Any], skip: Dict[str, Any],
+                         previous: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Statuses (and fingerprints) from the previous analysis for tweaks whose inputs did not change"""
+        if not previous or previous.get("fingerprint_version") != self._fingerprint_version():
+            return {}, {}
+        stored = previous.get("fingerprints", {})
+        previous_statuses = previous.get("tweaks", {})
+        candidates = {}
+        for tweak_key in tweaks:
+            if tweak_key in skip or tweak_key not in stored or tweak_key not in previous_statuses:
+                continue
+            try:
+                candidates[tweak_key] = TweakInputs.from_dict(stored[tweak_key]["inputs"])
+            except (KeyError, TypeError, ValueError):
+                continue
+
+        statuses, fingerprints = {}, {}
+        for tweak_key, fingerprint in fingerprint_sweep(candidates, self.registry).items():
+            if fingerprint == stored[tweak_key].get("hash"):
+                statuses[tweak_key] = dict(previous_statuses[tweak_key], reused=True)
+                fingerprints[tweak_key] = stored[tweak_key]
+        return statuses, fingerprints
+
+    def _probe_timeout(self, tweak_data: Dict[str, Any]) -> float:
+        return getattr(tweak_data.get("instance"), "check_timeout", self.probe_timeout)
+
+    def _registry_reads_to_prefetch(self):
+        """Registry values the tweaks read, from this session or from the last saved analysis"""
+        reads = RegistryHandler.observed_reads()
+        if reads:
+            return reads
+        previous = self.load_latest_analysis() or {}
+        return [tuple(read) for read in previous.get("registry_reads", [])]
+
+    def collect_tweak_statuses(self, tweaks: Dict[str, Any], incremental: bool = True,
+                               on_status: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Collect current status of all tweaks with improved performance. With incremental=True
+        tweaks whose input fingerprint matches the last saved analysis are not probed again.
+        on_status(key, status) is called as soon as each status is known (from this or a probe thread).
+        """
         analysis = {
             "timestamp": datetime.now().isoformat(),
             "tweaks": {}
         }
 
-        # Process tweaks in batches for better memory management
-        batch_size = 10
-        tweak_items = list(tweaks.items())
-
-        for i in range(0, len(tweak_items), batch_size):
-            batch = tweak_items[i:i + batch_size]
-            for tweak_key, tweak_data in batch:
-                status = self._get_tweak_status(tweak_key, tweak_data)
-                if status:
-                    analysis["tweaks"][tweak_key] = status
-
+        def add_status(tweak_key: str, status: Dict[str, Any]):
+            analysis["tweaks"][tweak_key] = status
+            if on_status is not None:
+                try:
+                    on_status(tweak_key, dict(status))
+                except Exception as e:
+                    print(f"Error in analysis status callback: {e}")
+
+        probe_start = time.perf_counter()
+        # Декларативные твики проверяются одним планом проб без вызова check_status
+        planned = default_probe_plan().evaluate(self.registry)
+
+        # Отпечатки всех остальных твиков сверяются одним сгруппированным чтением реестра
+        previous = self.load_latest_analysis() if incremental else None
+        reused, fingerprints = self._reuse_unchanged(tweaks, planned, previous)
+        for tweak_key, status in reused.items():
+            add_status(tweak_key, status)
+        analysis["fingerprint_ms"] = round((time.perf_counter() - probe_start) * 1000, 3)
+        tweaks = {tweak_key: tweak_data for tweak_key, tweak_data in tweaks.items() if tweak_key not in reused}
+
+        needs_probe = any(tweak_key not in planned for tweak_key in tweaks)
+        services = get_service_inventory(self.registry)
+        if needs_probe:
+            # Твики служб читают общий снимок: одно перечисление ключа Services и один запрос к SCM
+            services.refresh()
+
+        slow = {tweak_key: tweak_data for tweak_key, tweak_data in tweaks.items()
+                if tweak_key not in planned and getattr(tweak_data.get("instance"), "slow_check", False)}
+        timed_out: List[str] = []
+        # Момент, когда проверка фактически началась (в очереди пула таймаут не идёт)
+        started: Dict[str, float] = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_probe_workers, thread_name_prefix="tweak-probe")
+        try:
+            # Остальные значения реестра читаются заранее одним сгруппированным проходом по ключам
+            with self.registry.prefetch(self._registry_reads_to_prefetch() if needs_probe else []):
+                futures = {
+                    executor.submit(self._timed_probe, tweak_key, tweak_data, None, started, fingerprints): tweak_key
+                    for tweak_key, tweak_data in slow.items()
+                }
+
+                # Дешёвые проверки реестра выполняются здесь же, пока медленные идут в пуле
+                for tweak_key, tweak_data in tweaks.items():
+                    if tweak_key in slow:
+                        continue
+                    status = self._timed_probe(tweak_key, tweak_data, planned.get(tweak_key), None, fingerprints)
+                    if status:
+                        add_status(tweak_key, status)
+
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=0.1)
+                    for future in done:
+                        status = future.result()
+                        if status:
+                            add_status(futures[future], status)
+                    now = time.perf_counter()
+                    for future in list(pending):
+                        tweak_key = futures[future]
+                        if tweak_key in started and now - started[tweak_key] > self._probe_timeout(slow[tweak_key]):
+                            # Поток не прервать - результат просто больше не ждём
+                            pending.discard(future)
+                            timed_out.append(tweak_key)
+                            print(f"Status check for {tweak_key} timed out")
+        finally:
+            executor.shutdown(wait=False)
+
+        analysis["probe_ms"] = round((time.perf_counter() - probe_start) * 1000, 3)
+        analysis["probe_timeouts"] = timed_out
+        analysis["reused"] = len(reused)
+        analysis["fingerprint_version"] = self._fingerprint_version()
+        analysis["fingerprints"] = {tweak_key: fingerprints[tweak_key] for tweak_key in analysis["tweaks"]
+                                    if tweak_key in fingerprints}
+
+        # Чтения пропущенных проверок берутся из прошлого анализа, чтобы prefetch их не потерял
+        registry_reads = {tuple(read) for read in (previous or {}).get("registry_reads", [])} if reused else set()
+        registry_reads.update(RegistryHandler.observed_reads())
+        analysis["registry_reads"] = [list(read) for read in sorted(registry_reads)]
+        # Статистика пула дескрипторов реестра за проход анализа
+        analysis["registry_pool"] = self.registry.pool_stats()
+        analysis["registry_cache"] = self.registry.cache_stats()
+        analysis["services"] = services.stats()
         return analysis
 
     def save_analysis(self, analysis: Dict[str, Any]) -> bool:
-        """Save analysis to file with backup protection"""
-        backup_file = f"{self.analysis_file}.backup"
+        """Hands the analysis to the shared store; it is written to disk in the background"""
         try:
-            # Create backup of existing file if it exists
-            if os.path.exists(self.analysis_file):
-                try:
-                    os.replace(self.analysis_file, backup_file)
-                except OSError:
-                    pass
-
-            # Write new analysis
-            with open(self.analysis_file, "w", encoding='utf-8') as f:
-                json.dump(analysis, f, indent=4, ensure_ascii=False)
-
-            # Update cache
-            self._latest_analysis = analysis
-            self._last_analysis_time = datetime.now().timestamp()
-
-            # Remove backup if save was successful
-            if os.path.exists(backup_file):
-                os.remove(backup_file)
-
+            self.store.replace(analysis, self.registry.cache_generation())
             return True
-
         except Exception as e:
             print(f"Error saving analysis: {e}")
-            # Restore from backup if save failed
-            if os.path.exists(backup_file):
-                try:
-                    os.replace(backup_file, self.analysis_file)
-                except OSError:
-                    pass
             return False
 
     def load_latest_analysis(self) -> Optional[Dict[str, Any]]:
-        """Load the latest analysis with caching"""
-        current_time = datetime.now().timestamp()
-
-        # Return cached analysis if it's still valid
-        if (self._latest_analysis and
-                current_time - self._last_analysis_time < self._analysis_cache_ttl):
-            return self._latest_analysis
-
-        try:
-            # Check if file exists before attempting to open
-            if not os.path.exists(self.analysis_file):
-                return None
-
-            with open(self.analysis_file, "r", encoding='utf-8') as f:
-                analysis = json.load(f)
-
-            # Update cache
-            self._latest_analysis = analysis
-            self._last_analysis_time = current_time
-
-            return analysis
-
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading analysis: {e}")
-            return None
+        """The latest analysis; the file is read only once per process"""
+        return self.store.snapshot()
 
     def cleanup(self):
         """Cleanup resources"""
-        self._get_tweak_configs.cache_clear()
-        self._latest_analysis = None
-        self._last_analysis_time = 0
\ No newline at end of file
+        self._get_tweak_configs.cache_clear()
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Отпечатки входных данных проверок статуса твиков.
+
+При проверке статуса записываются значения реестра, которые прочитал твик, плюс входы,
+объявленные им в status_inputs() (службы, файлы, активная схема питания). Отпечаток -
+хэш текущих значений этих входов. При следующем анализе отпечатки всех твиков
+пересчитываются одним сгруппированным чтением реестра, и заново проверяются только
+твики, у которых отпечаток изменился.
+"""
+import os
+import json
+import hashlib
+from dataclasses import dataclass
+from typing import Optional, Any, Dict, List, Tuple, Iterable
+
+from utils.registry_handler import RegistryHandler
+from utils.service_inventory import ServiceInventory
+
+# GUID активной схемы питания (то же, что показывает powercfg /getactivescheme)
+ACTIVE_POWER_SCHEME = (r"HKLM\SYSTEM\CurrentControlSet\Control\Power\User\PowerSchemes", "ActivePowerScheme")
+
+
+@dataclass(frozen=True)
+class StatusInputs:
+    """Inputs of check_status() beyond the registry values it reads through RegistryHandler"""
+    registry: Tuple[Tuple[str, str], ...] = ()  # значения, которые проверка читает в обход RegistryHandler
+    services: Tuple[str, ...] = ()  # тип запуска служб
+    files: Tuple[str, ...] = ()  # время изменения и размер файлов
+    power_scheme: bool = False  # активная схема питания
+
+
+@dataclass
+class TweakInputs:
+    """Everything a recorded status check depended on, in a JSON-friendly form"""
+    registry: List[Tuple[str, str]]
+    files: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"registry": [list(read) for read in self.registry], "files": list(self.files)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TweakInputs":
+        return cls(registry=[tuple(read) for read in data.get("registry", [])], files=list(data.get("files", [])))
+
+    @classmethod
+    def combine(cls, reads: Iterable[Tuple[str, str]], declared: StatusInputs) -> "TweakInputs":
+        registry = list(reads) + list(declared.registry)
+        # Тип запуска службы - значение Start её ключа
+        registry += [(ServiceInventory.key_path(name), "Start") for name in declared.services]
+        if declared.power_scheme:
+            registry.append(ACTIVE_POWER_SCHEME)
+        unique = {}
+        for key_path, value_name in registry:
+            unique.setdefault((key_path.lower(), value_name.lower()), (key_path, value_name))
+        return cls(registry=sorted(unique.values(), key=lambda read: (read[0].lower(), read[1].lower())),
+                   files=sorted(set(declared.files)))
+
+
+def _file_stamp(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(os.path.expandvars(path))
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _digest(inputs: TweakInputs, values: Dict[Tuple[str, str], Any]) -> str:
+    payload = {
+        "registry": [[key_path.lower(), value_name.lower(), values.get((key_path, value_name))]
+                     for key_path, value_name in inputs.registry],
+        "files": [[path, _file_stamp(path)] for path in inputs.files],
+    }
+    # default=repr: REG_BINARY и прочие значения без JSON-представления
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=repr).encode("utf-8")).hexdigest()
+
+
+def fingerprint_recorded(inputs: TweakInputs, reads: Dict[Tuple[str, str], Any],
+                         registry: RegistryHandler) -> str:
+    """Fingerprint from the values a probe actually saw; declared inputs it did not read are read now"""
+    missing = [read for read in inputs.registry if read not in reads]
+    values = dict(reads)
+    if missing:
+        values.update(registry.get_many(missing))
+    return _digest(inputs, values)
+
+
+def fingerprint_sweep(inputs: Dict[str, TweakInputs], registry: RegistryHandler) -> Dict[str, str]:
+    """Current fingerprints of many tweaks with one grouped registry read"""
+    requests = {read for tweak_inputs in inputs.values() for read in tweak_inputs.registry}
+    values = registry.get_many(requests)
+    return {key: _digest(tweak_inputs, values) for key, tweak_inputs in inputs.items()}
@@ -0,0 +1,210 @@
+"""
+Очередь заданий для переключения твиков вне потока Tk.
+
+Задания выполняются в пуле потоков; задания одного и того же твика выполняются строго
+по очереди. События (поставлено, начато, прогресс, завершено) складываются в одну
+очередь, которую вкладка разбирает через `after` - виджеты трогаются только из потока
+интерфейса. Твик может сообщать прогресс и поддерживать отмену через report_progress()
+и check_cancelled(): вне задания обе функции ничего не делают.
+"""
+import queue
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Any, Callable, Dict, List, Deque
+
+from utils.executor import task_group
+
+JOB_QUEUED = "queued"
+JOB_STARTED = "started"
+JOB_PROGRESS = "progress"
+JOB_FINISHED = "finished"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised by check_cancelled() inside a job that was cancelled"""
+
+
+@dataclass
+class TweakJobEvent:
+    job_id: int
+    key: str
+    kind: str  # JOB_*
+    result: Any = None
+    message: str = ""
+    fraction: Optional[float] = None  # 0..1 для JOB_PROGRESS, если твик знает долю
+
+
+class TweakJob:
+    def __init__(self, job_id: int, key: str, func: Callable[[], Any], label: str = "",
+                 job_queue: Optional["TweakJobQueue"] = None):
+        self.id = job_id
+        self.key = key
+        self.func = func
+        self.label = label or key
+        self.queue = job_queue
+        self.state = JOB_QUEUED
+        self.result: Any = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def done(self) -> bool:
+        return self.state in (JOB_FINISHED, JOB_FAILED, JOB_CANCELLED)
+
+    def cancel(self):
+        """Stops a queued job; a running one stops only if its tweak calls check_cancelled()"""
+        self._cancel.set()
+
+
+_current = threading.local()
+
+
+def current_job() -> Optional[TweakJob]:
+    return getattr(_current, "job", None)
+
+
+def check_cancelled():
+    """Raises JobCancelled when the job running on this thread was cancelled"""
+    job = current_job()
+    if job is not None and job.cancelled:
+        raise JobCancelled(f"{job.label} cancelled")
+
+
+def report_progress(message: str, fraction: Optional[float] = None):
+    """Sends a progress event for the job running on this thread"""
+    job = current_job()
+    if job is not None and job.queue is not None:
+        job.queue._emit(job, JOB_PROGRESS, message=message, fraction=fraction)
+
+
+class TweakJobQueue:
+    """Runs tweak actions on worker threads, one job at a time per tweak key"""
+
+    def __init__(self, group: str = "tweak-jobs"):
+        # Задания выполняются в общем пуле потоков приложения
+        self.tasks = task_group(group)
+        self.events: "queue.Queue[TweakJobEvent]" = queue.Queue()
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, TweakJob] = {}
+        self._running: Dict[str, TweakJob] = {}  # ключ твика -> выполняющееся задание
+        self._waiting: Dict[str, Deque[TweakJob]] = {}  # ключ твика -> задания в очереди
+
+    def _emit(self, job: TweakJob, kind: str, result: Any = None, message: str = "",
+              fraction: Optional[float] = None):
+        self.events.put(TweakJobEvent(job.id, job.key, kind, result, message, fraction))
+
+    def submit(self, key: str, func: Callable[[], Any], label: str = "") -> TweakJob:
+        """Queues func() for a tweak; it starts after earlier jobs of the same tweak"""
+        job = TweakJob(next(self._ids), key, func, label, self)
+        with self.lock:
+            self._jobs[job.id] = job
+            if key in self._running:
+                self._waiting.setdefault(key, deque()).append(job)
+                start = False
+            else:
+                self._running[key] = job
+                start = True
+        self._emit(job, JOB_QUEUED, message=job.label)
+        if start:
+            self.tasks.submit(self._run, job)
+        return job
+
+    def job(self, job_id: int) -> Optional[TweakJob]:
+        with self.lock:
+            return self._jobs.get(job_id)
+
+    def is_busy(self, key: str) -> bool:
+        with self.lock:
+            return key in self._running
+
+    def cancel(self, job_id: int) -> bool:
+        job = self.job(job_id)
+        if job is None or job.done:
+            return False
+        job.cancel()
+        return True
+
+    def _run(self, job: TweakJob):
+        if job.cancelled:
+            self._finish(job, JOB_CANCELLED)
+            return
+        job.state = JOB_STARTED
+        self._emit(job, JOB_STARTED, message=job.label)
+        _current.job = job
+        try:
+            result = job.func()
+        except JobCancelled:
+            self._finish(job, JOB_CANCELLED)
+            return
+        except Exception as e:
+            print(f"Error in tweak job {job.label}: {e}")
+            self._finish(job, JOB_FAILED, message=str(e))
+            return
+        finally:
+            _current.job = None
+        # Твики с общим except Exception перехватывают JobCancelled и возвращают False
+        self._finish(job, JOB_CANCELLED if job.cancelled and not result else JOB_FINISHED, result)
+
+    def _finish(self, job: TweakJob, kind: str, result: Any = None, message: str = ""):
+        job.state = kind
+        job.result = result
+        self._emit(job, kind, result, message)
+        with self.lock:
+            self._jobs.pop(job.id, None)
+            waiting = self._waiting.get(job.key)
+            next_job = waiting.popleft() if waiting else None
+            if waiting is not None and not waiting:
+                del self._waiting[job.key]
+            if next_job is not None:
+                self._running[job.key] = next_job
+            else:
+                self._running.pop(job.key, None)
+        if next_job is not None:
+            self.tasks.submit(self._run, next_job)
+
+    def drain(self, limit: int = 100) -> List[TweakJobEvent]:
+        """Events produced since the last call, without blocking"""
+        events = []
+        while len(events) < limit:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def poll_with(self, widget, handler: Callable[[TweakJobEvent], None], interval: int = 50):
+        """Delivers events to handler on the Tk thread, polling with widget.after"""
+        def poll():
+            for event in self.drain():
+                try:
+                    handler(event)
+                except Exception as e:
+                    print(f"Error handling tweak job event: {e}")
+            try:
+                widget.after(interval, poll)
+            except Exception:
+                pass  # виджет уничтожен
+        widget.after(interval, poll)
+
+    def shutdown(self):
+        self.tasks.cancel()
+
+
+_job_queue: Optional[TweakJobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> TweakJobQueue:
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = TweakJobQueue()
+        return _job_queue
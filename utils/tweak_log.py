@@ -0,0 +1,179 @@
+"""
+Общий журнал действий твиков.
+
+Твики не открывают свои лог-файлы: записи (твик, действие, состояние, успех,
+длительность) ставятся в очередь, а фоновый поток пишет их пачками в один JSONL-файл
+%APPDATA%/ASX-Hub/Logs/tweaks.jsonl. Файл ротируется по размеру, query_log() читает
+записи из текущего и архивных файлов.
+"""
+import os
+import json
+import queue
+import atexit
+import threading
+from datetime import datetime
+from typing import Optional, Any, Dict, List
+
+# Проверки статуса пишутся в журнал, но не в консоль
+QUIET_ACTIONS = {"check_status"}
+
+
+def _default_log_dir() -> str:
+    app_data_dir = os.getenv('APPDATA') or os.path.expanduser("~")
+    return os.path.join(app_data_dir, "ASX-Hub", "Logs")
+
+
+class TweakLogWriter:
+    """Batches tweak log records from a queue into a size-rotated JSONL file"""
+
+    def __init__(self, log_dir: Optional[str] = None, file_name: str = "tweaks.jsonl",
+                 max_bytes: int = 1024 * 1024, backups: int = 3, flush_interval: float = 0.5,
+                 batch_size: int = 200):
+        self.log_dir = log_dir or _default_log_dir()
+        self.path = os.path.join(self.log_dir, file_name)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.records: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._idle = threading.Condition(self.lock)
+        self._pending = 0
+        self.written = 0
+        self.batches = 0
+        self.rotations = 0
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="tweak-log-writer", daemon=True)
+            self._thread.start()
+
+    def write(self, record: Dict[str, Any]):
+        with self.lock:
+            self._pending += 1
+            self._ensure_started()
+        self.records.put(record)
+
+    def _run(self):
+        while True:
+            record = self.records.get()
+            batch = [record]
+            # Всё, что накопилось за flush_interval, уходит в файл одной записью
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self.records.get(timeout=self.flush_interval if len(batch) == 1 else 0.01))
+            except queue.Empty:
+                pass
+            self._write_batch([item for item in batch if item is not None])
+            with self.lock:
+                self._pending -= len(batch)
+                self._idle.notify_all()
+
+    def _write_batch(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+        lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch)
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._rotate_if_needed(len(lines.encode("utf-8")))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+            self.written += len(batch)
+            self.batches += 1
+        except OSError as e:
+            print(f"Error writing to tweak log: {e}")
+
+    def _rotate_if_needed(self, incoming: int):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size + incoming <= self.max_bytes:
+            return
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Waits until every queued record has been written"""
+        with self.lock:
+            if self._thread is None:
+                return True
+            self.records.put(None)
+            self._pending += 1
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def files(self) -> List[str]:
+        """Log files from newest to oldest"""
+        paths = [self.path] + [f"{self.path}.{index}" for index in range(1, self.backups + 1)]
+        return [path for path in paths if os.path.exists(path)]
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"pending": self._pending, "written": self.written, "batches": self.batches,
+                    "rotations": self.rotations}
+
+
+_writer: Optional[TweakLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_tweak_log() -> TweakLogWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = TweakLogWriter()
+            atexit.register(_writer.flush)
+        return _writer
+
+
+def log_tweak_action(tweak: str, action: str, state: Any, success: Any, duration_ms: Optional[float] = None):
+    """Queues one structured record for the tweak log"""
+    timestamp = datetime.now()
+    record = {"ts": timestamp.isoformat(timespec="milliseconds"), "tweak": tweak, "action": action,
+              "state": str(state), "success": bool(success)}
+    if duration_ms is not None:
+        record["duration_ms"] = round(duration_ms, 3)
+    get_tweak_log().write(record)
+    if action not in QUIET_ACTIONS:
+        print(f"[{timestamp.strftime('%Y-%m-%d %H:%M:%S')}] {tweak}: {action}, State: {state}, Success: {success}")
+
+
+def query_log(tweak: Optional[str] = None, action: Optional[str] = None, success: Optional[bool] = None,
+              since: Optional[datetime] = None, limit: Optional[int] = 100) -> List[Dict[str, Any]]:
+    """Records matching the filters, newest first"""
+    writer = get_tweak_log()
+    writer.flush()
+    since_text = since.isoformat(timespec="milliseconds") if since is not None else None
+    matches: List[Dict[str, Any]] = []
+    for path in writer.files():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            continue
+        for line in reversed(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if since_text is not None and record.get("ts", "") < since_text:
+                # Файлы и строки идут от новых к старым - дальше только более ранние записи
+                return matches
+            if tweak is not None and record.get("tweak") != tweak:
+                continue
+            if action is not None and record.get("action") != action:
+                continue
+            if success is not None and record.get("success") != success:
+                continue
+            matches.append(record)
+            if limit is not None and len(matches) >= limit:
+                return matches
+    return matches
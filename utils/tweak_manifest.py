@@ -0,0 +1,333 @@
+"""
+Манифест твиков: метаданные классов из utils/tweaks без импорта модулей.
+
+Манифест строится разбором исходников (ast) и сохраняется на диск; при следующем
+запуске заново разбираются только модули, у которых изменились время изменения и
+содержимое. Боковая панель и поиск берут заголовки и категории из манифеста, а модуль
+твика импортируется при первом реальном обращении к нему (LazyTweak).
+"""
+import os
+import ast
+import json
+import hashlib
+import importlib
+import threading
+from dataclasses import dataclass, asdict
+from typing import Optional, Any, Dict, List, Type
+
+from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
+
+TWEAKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tweaks")
+# Заголовки и категории декларативных твиков берутся из спецификаций, а не из модуля-алиаса
+SPEC_MODULES = (os.path.join(os.path.dirname(os.path.abspath(__file__)), "tweak_specs.py"),
+                os.path.join(TWEAKS_DIR, "declarative_specs.py"))
+# Модули пакета, которые не являются твиками
+NON_TWEAK_MODULES = {"__init__", "base_tweak", "plugin_loader", "declarative_specs"}
+MANIFEST_VERSION = 3
+
+
+@dataclass
+class TweakManifestEntry:
+    class_name: str
+    module: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    warning: Optional[str] = None
+    optimized_state: bool = True  # из config.TWEAKS, в кэш манифеста не пишется
+    slow_check: bool = False
+    check_timeout: float = 20.0
+    registry_only: bool = False
+    declarative: Optional[str] = None  # ключ TweakSpec для declarative_tweak()
+    static: bool = True  # False - metadata вычисляется в коде, нужен импорт модуля
+
+
+def _default_cache_file() -> str:
+    app_data_dir = os.getenv('APPDATA') or os.path.expanduser("~")
+    return os.path.join(app_data_dir, "ASX-Hub", "Cache", "tweak_manifest.json")
+
+
+def _specs_stamp() -> List[Optional[List[int]]]:
+    stamps = []
+    for path in SPEC_MODULES:
+        try:
+            stat = os.stat(path)
+            stamps.append([stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            stamps.append(None)
+    return stamps
+
+
+def _literal(node: ast.AST) -> Any:
+    return ast.literal_eval(node)
+
+
+def _metadata_call(function: ast.FunctionDef) -> Optional[ast.Call]:
+    """The TweakMetadata(...) call returned by a metadata property"""
+    for node in ast.walk(function):
+        if isinstance(node, ast.Return) and isinstance(node.value, ast.Call):
+            func = node.value.func
+            if isinstance(func, ast.Name) and func.id == "TweakMetadata":
+                return node.value
+    return None
+
+
+def _class_entry(module: str, node: ast.ClassDef) -> Optional[TweakManifestEntry]:
+    entry = TweakManifestEntry(class_name=node.name, module=module)
+    is_tweak = False
+    for item in node.body:
+        if isinstance(item, ast.FunctionDef) and item.name == "metadata":
+            is_tweak = True
+            call = _metadata_call(item)
+            fields = ["title", "description", "category", "warning"]
+            values = {}
+            try:
+                if call is None:
+                    raise ValueError("metadata does not return TweakMetadata(...)")
+                for name, arg in zip(fields, call.args):
+                    values[name] = _literal(arg)
+                for keyword in call.keywords:
+                    if keyword.arg in fields:
+                        values[keyword.arg] = _literal(keyword.value)
+            except ValueError:
+                entry.static = False
+                continue
+            for name, value in values.items():
+                setattr(entry, name, value)
+        elif isinstance(item, ast.Assign) and len(item.targets) == 1 and isinstance(item.targets[0], ast.Name):
+            if item.targets[0].id in ("slow_check", "check_timeout", "registry_only"):
+                try:
+                    setattr(entry, item.targets[0].id, _literal(item.value))
+                except ValueError:
+                    pass
+    return entry if is_tweak else None
+
+
+def _declarative_entry(module: str, node: ast.Assign) -> Optional[TweakManifestEntry]:
+    """`SomeTweak = declarative_tweak("key")` aliases"""
+    call = node.value
+    if not (isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id == "declarative_tweak"):
+        return None
+    if len(node.targets) != 1 or not isinstance(node.targets[0], ast.Name) or not call.args:
+        return None
+    try:
+        key = _literal(call.args[0])
+    except ValueError:
+        return None
+    from utils.tweak_specs import get_spec
+    spec = get_spec(key)
+    if spec is None:
+        return None
+    return TweakManifestEntry(
+        class_name=node.targets[0].id, module=module, title=spec.title, description=spec.description,
+        category=spec.category, warning=spec.warning, declarative=key
+    )
+
+
+def parse_module(module: str, source: str) -> List[TweakManifestEntry]:
+    """Manifest entries of the tweak classes defined in a module's source"""
+    entries = []
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef):
+            entry = _class_entry(module, node)
+        elif isinstance(node, ast.Assign):
+            entry = _declarative_entry(module, node)
+        else:
+            entry = None
+        if entry is not None:
+            entries.append(entry)
+    return entries
+
+
+class TweakManifest:
+    """class name -> TweakManifestEntry for utils/tweaks, rebuilt per changed module"""
+
+    def __init__(self, tweaks_dir: str = TWEAKS_DIR, cache_file: Optional[str] = None):
+        self.tweaks_dir = tweaks_dir
+        self.cache_file = cache_file or _default_cache_file()
+        self.lock = threading.Lock()
+        self._entries: Optional[Dict[str, TweakManifestEntry]] = None
+        # модуль -> {"mtime", "size", "hash", "entries": [...]}
+        self._modules: Dict[str, Dict[str, Any]] = {}
+        self.parsed_modules = 0
+
+    def _read_cache(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION or data.get("tweaks_dir") != self.tweaks_dir:
+            return {}
+        return data.get("modules", {})
+
+    def _write_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            temp_file = f"{self.cache_file}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump({"version": MANIFEST_VERSION, "tweaks_dir": self.tweaks_dir, "modules": self._modules},
+                          f, ensure_ascii=False)
+            os.replace(temp_file, self.cache_file)
+        except OSError as e:
+            print(f"Error saving tweak manifest: {e}")
+
+    def _scan(self):
+        cached = self._read_cache()
+        specs = _specs_stamp()
+        modules = {}
+        changed = False
+
+        def specs_current(state: Dict[str, Any]) -> bool:
+            # Записи алиасов устаревают и при правке спецификаций, а не только самого модуля
+            return state.get("specs") == specs or not any(entry.get("declarative") for entry in state["entries"])
+
+        try:
+            filenames = sorted(os.listdir(self.tweaks_dir))
+        except OSError:
+            # Сборка без исходников: твики импортируются напрямую, без манифеста
+            filenames = []
+
+        for filename in filenames:
+            module = filename[:-3]
+            if not filename.endswith(".py") or module in NON_TWEAK_MODULES:
+                continue
+            path = os.path.join(self.tweaks_dir, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            state = cached.get(module)
+            if state and state["mtime"] == stat.st_mtime_ns and state["size"] == stat.st_size \
+                    and specs_current(state):
+                modules[module] = state
+                continue
+
+            with open(path, "rb") as f:
+                content = f.read()
+            digest = hashlib.sha1(content).hexdigest()
+            changed = True
+            if state and state["hash"] == digest and specs_current(state):
+                # Файл тронут, но не изменён - пересобирать записи не нужно
+                modules[module] = dict(state, mtime=stat.st_mtime_ns, size=stat.st_size)
+                continue
+            try:
+                entries = parse_module(module, content.decode("utf-8-sig"))
+            except (SyntaxError, UnicodeDecodeError) as e:
+                print(f"Error parsing tweak module {module}: {e}")
+                entries = []
+            self.parsed_modules += 1
+            modules[module] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "hash": digest, "specs": specs,
+                               "entries": [asdict(entry) for entry in entries]}
+
+        if set(modules) != set(cached):
+            changed = True
+        self._modules = modules
+        self._entries = {}
+        for state in modules.values():
+            for raw_entry in state["entries"]:
+                entry = TweakManifestEntry(**raw_entry)
+                self._entries[entry.class_name] = entry
+        # Оптимальное состояние задаётся в config.TWEAKS (TweakMetadata его не хранит)
+        from config import TWEAKS
+        for tweak_config in TWEAKS:
+            entry = self._entries.get(tweak_config.get("class_name"))
+            if entry is not None:
+                entry.optimized_state = tweak_config.get("optimized_state", True)
+        if changed and modules:
+            self._write_cache()
+
+    def entries(self) -> Dict[str, TweakManifestEntry]:
+        with self.lock:
+            if self._entries is None:
+                self._scan()
+            return dict(self._entries)
+
+    def entry(self, class_name: str) -> Optional[TweakManifestEntry]:
+        return self.entries().get(class_name)
+
+    def categories(self) -> List[str]:
+        return sorted({entry.category for entry in self.entries().values() if entry.category})
+
+
+def load_tweak_class(entry: TweakManifestEntry) -> Type[BaseTweak]:
+    """Imports the tweak class described by a manifest entry"""
+    if entry.declarative:
+        from utils.tweak_specs import declarative_tweak
+        return declarative_tweak(entry.declarative)
+    module = importlib.import_module(f"utils.tweaks.{entry.module}")
+    return getattr(module, entry.class_name)
+
+
+class LazyTweak:
+    """
+    Stand-in for a tweak instance. Metadata comes from the manifest; the module is
+    imported and the tweak constructed on the first call that needs the real object.
+    """
+
+    def __init__(self, entry: TweakManifestEntry):
+        self.entry = entry
+        self.slow_check = entry.slow_check
+        self.check_timeout = entry.check_timeout
+        self.registry_only = entry.registry_only
+        self._instance: Optional[BaseTweak] = None
+        self._lock = threading.Lock()
+
+    @property
+    def instance(self) -> BaseTweak:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = load_tweak_class(self.entry)()
+        return self._instance
+
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+    @property
+    def metadata(self) -> TweakMetadata:
+        if not self.entry.static:
+            return self.instance.metadata
+        return TweakMetadata(
+            title=self.entry.title,
+            description=self.entry.description,
+            category=self.entry.category,
+            warning=self.entry.warning
+        )
+
+    def check_status(self) -> bool:
+        return self.instance.check_status()
+
+    def toggle(self) -> bool:
+        return self.instance.toggle()
+
+    def enable(self) -> bool:
+        return self.instance.enable()
+
+    def disable(self) -> bool:
+        return self.instance.disable()
+
+    def __getattr__(self, name):
+        # Всё остальное (uninstall, service_changes и т.п.) - у настоящего твика
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.instance, name)
+
+
+_manifest: Optional[TweakManifest] = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest() -> TweakManifest:
+    global _manifest
+    with _manifest_lock:
+        if _manifest is None:
+            _manifest = TweakManifest()
+        return _manifest
+
+
+def lazy_tweak(class_name: str) -> Optional[LazyTweak]:
+    """LazyTweak for a class listed in the manifest, None when it is not listed"""
+    entry = get_manifest().entry(class_name)
+    return LazyTweak(entry) if entry is not None else None
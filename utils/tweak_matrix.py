@@ -0,0 +1,136 @@
+"""
+Прогон матрицы check/apply по всем твикам из config.TWEAKS на подменённом реестре.
+Позволяет профилировать движок твиков и ловить регрессии без живой Windows-машины:
+
+    python -m utils.tweak_matrix --seed export.reg --apply --json matrix.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Dict, Any, List, Optional
+
+from utils.registry_backends import RegistryBackend, MemoryBackend, RegFileBackend, set_default_backend
+from utils.tweak_specs import get_spec, declarative_tweak, default_probe_plan
+from utils.registry_handler import RegistryHandler
+
+# Твики, которые при применении трогают файлы, сеть, перезапускают explorer или удаляют
+# компоненты системы, а не только реестр. В матрице для них выполняется лишь check_status.
+CHECK_ONLY_TWEAKS = {
+    "onedrive",
+    "widgets_uninstall",
+    "data_domains",
+    "power_plan",
+    "nvidia_optimization",
+    "explorer_blur",  # скачивает архив, regsvr32, taskkill
+    "icon_arrow_on_shortcut",  # перезапуск explorer через shell=True
+    "taskbar_date",  # перезапуск explorer через shell=True
+}
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def run_matrix(backend: RegistryBackend, apply: bool = False, keys: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Runs check (and optionally enable/disable round trips) for every tweak against the backend"""
+    if apply and platform.system() == "Windows":
+        # Твики служб и задач запускают sc/net/schtasks - на Windows это изменит систему
+        raise RuntimeError("The apply matrix must not be run on a live Windows machine")
+
+    # На CI без Windows-окружения файлы твиков (SaveData, Resources) пишутся во временный каталог
+    for variable in ("APPDATA", "TEMP"):
+        if not os.getenv(variable):
+            os.environ[variable] = tempfile.mkdtemp(prefix="asx-matrix-")
+
+    set_default_backend(backend)
+    from config import TWEAKS
+
+    results = []
+    total_start = time.perf_counter()
+    for config in TWEAKS:
+        if keys and config["key"] not in keys:
+            continue
+        row: Dict[str, Any] = {"key": config["key"]}
+        try:
+            start = time.perf_counter()
+            if get_spec(config["key"]) is not None:
+                tweak_class = declarative_tweak(config["key"])
+                row["declarative"] = True
+            else:
+                module = importlib.import_module(f"utils.tweaks.{config.get('module', config['key'])}")
+                tweak_class = getattr(module, config["class_name"])
+            row["import_ms"] = _elapsed_ms(start)
+
+            start = time.perf_counter()
+            tweak = tweak_class()
+            row["init_ms"] = _elapsed_ms(start)
+
+            start = time.perf_counter()
+            row["status"] = tweak.check_status()
+            row["check_ms"] = _elapsed_ms(start)
+
+            if apply and config["key"] not in CHECK_ONLY_TWEAKS:
+                for action in ("enable", "disable") if not row["status"] else ("disable", "enable"):
+                    start = time.perf_counter()
+                    row[f"{action}_result"] = getattr(tweak, action)()
+                    row[f"{action}_ms"] = _elapsed_ms(start)
+                    row[f"status_after_{action}"] = tweak.check_status()
+        except Exception as e:
+            row["error"] = f"{type(e).__name__}: {e}"
+        results.append(row)
+
+    # Все декларативные твики одним планом проб - для сравнения с построчными check_ms
+    start = time.perf_counter()
+    planned = default_probe_plan().evaluate(RegistryHandler(backend, use_cache=False))
+    probe_plan_ms = _elapsed_ms(start)
+
+    return {
+        "platform": platform.system(),
+        "backend": type(backend).__name__,
+        "apply": apply,
+        "total_ms": _elapsed_ms(total_start),
+        "probe_plan": {"tweaks": len(planned), "values": len(default_probe_plan().requests), "ms": probe_plan_ms},
+        "backend_stats": backend.stats(),
+        "tweaks": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the config.TWEAKS check/apply matrix on a fake registry")
+    parser.add_argument("--seed", help=".reg export to seed an in-memory registry from")
+    parser.add_argument("--regfile", help=".reg file used (and updated) as the registry")
+    parser.add_argument("--apply", action="store_true", help="also run enable/disable round trips")
+    parser.add_argument("--tweak", action="append", dest="keys", help="limit the run to these tweak keys")
+    parser.add_argument("--json", dest="json_path", help="write the full result table to this file")
+    args = parser.parse_args(argv)
+
+    if args.regfile:
+        backend = RegFileBackend(args.regfile)
+    elif args.seed:
+        backend = MemoryBackend.from_reg_file(args.seed)
+    else:
+        backend = MemoryBackend()
+
+    report = run_matrix(backend, apply=args.apply, keys=args.keys)
+
+    for row in report["tweaks"]:
+        timings = " ".join(f"{name}={value}" for name, value in row.items() if name.endswith("_ms"))
+        outcome = row.get("error") or f"status={row.get('status')}"
+        print(f"{row['key']:<32} {outcome:<40} {timings}")
+    print(f"Total: {report['total_ms']} ms, backend: {report['backend_stats']}")
+    print(f"Probe plan: {report['probe_plan']}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4, ensure_ascii=False)
+
+    return 1 if any("error" in row for row in report["tweaks"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Реестр экземпляров твиков по ключу из config.TWEAKS.
+
+Экземпляр создаётся при первом обращении и дальше переиспользуется: фасад SystemTweaks,
+вкладка твиков и периодический опрос статусов работают с одним и тем же объектом, а не
+создают новый (с новым RegistryHandler и лог-файлом) на каждый вызов.
+"""
+import threading
+from typing import Optional, Any, Dict, List
+
+from utils.tweak_manifest import lazy_tweak
+from utils.tweak_specs import get_spec, declarative_tweak
+
+
+class TweakRegistry:
+    """tweak key -> shared tweak instance, populated lazily"""
+
+    def __init__(self, tweaks: Optional[List[Dict[str, Any]]] = None):
+        if tweaks is None:
+            from config import TWEAKS
+            tweaks = TWEAKS
+        self.configs = {tweak_config["key"]: tweak_config for tweak_config in tweaks}
+        self.lock = threading.Lock()
+        self._instances: Dict[str, Any] = {}
+        self.created = 0
+
+    def _create(self, tweak_config: Dict[str, Any]):
+        # Манифест отдаёт LazyTweak - модуль импортируется при первой проверке или переключении
+        instance = lazy_tweak(tweak_config["class_name"])
+        if instance is not None:
+            return instance
+        if get_spec(tweak_config["key"]) is not None:
+            return declarative_tweak(tweak_config["key"])()
+        module_name = tweak_config.get("module", tweak_config["key"])
+        module = __import__(f"utils.tweaks.{module_name}", fromlist=[tweak_config["class_name"]])
+        return getattr(module, tweak_config["class_name"])()
+
+    def get(self, key: str):
+        """The shared instance for a tweak key; raises KeyError for unknown keys"""
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+        tweak_config = self.configs[key]
+        if not tweak_config.get("class_name"):
+            raise KeyError(f"Tweak {key} has no class")
+        with self.lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                instance = self._create(tweak_config)
+                self._instances[key] = instance
+                self.created += 1
+            return instance
+
+    def keys(self) -> List[str]:
+        return list(self.configs)
+
+    def loaded(self) -> List[str]:
+        with self.lock:
+            return list(self._instances)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drops one instance (or all of them) so the next get() builds a fresh one"""
+        with self.lock:
+            if key is None:
+                self._instances.clear()
+            else:
+                self._instances.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"tweaks": len(self.configs), "instances": len(self._instances), "created": self.created}
+
+
+_registry: Optional[TweakRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_tweak_registry() -> TweakRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TweakRegistry()
+        return _registry
+
+
+def get_tweak(key: str):
+    """Shared instance of the tweak with this key"""
+    return get_tweak_registry().get(key)
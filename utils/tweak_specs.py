@@ -0,0 +1,205 @@
+"""
+Декларативные твики: описание значений реестра вместо отдельного класса на каждый твик.
+
+Спецификации (utils/tweaks/declarative_specs.py) компилируются в ProbePlan, который
+читает значения всех твиков одним сгруппированным проходом get_many(). Твики со своей
+логикой (службы, PowerShell, файлы) по-прежнему пишутся обычными классами BaseTweak.
+"""
+import platform
+import time
+import operator
+from dataclasses import dataclass
+from typing import Optional, Any, Tuple, Dict, List, Iterable, Type
+
+from utils.registry_backends import winreg
+from utils.registry_handler import RegistryHandler, RegistryTransactionError
+from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
+
+_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+@dataclass(frozen=True)
+class RegistryCheck:
+    """The tweak counts as enabled when `value <op> expected` holds (a missing value reads as None)"""
+    key_path: str
+    value_name: str
+    op: str
+    expected: Any
+
+    def matches(self, value: Any) -> bool:
+        return _OPERATORS[self.op](value, self.expected)
+
+
+@dataclass(frozen=True)
+class RegistryWrite:
+    """A value written by enable()/disable(); delete=True removes the value instead"""
+    key_path: str
+    value_name: str
+    value: Any = None
+    value_type: int = winreg.REG_DWORD
+    delete: bool = False
+
+
+@dataclass(frozen=True)
+class TweakSpec:
+    key: str  # ключ из config.TWEAKS
+    class_name: str
+    title: str
+    description: str
+    category: str
+    checks: Tuple[RegistryCheck, ...]
+    enable: Tuple[RegistryWrite, ...]
+    disable: Tuple[RegistryWrite, ...]
+    match: str = "all"  # включён, если выполняются все ("all") или хотя бы одна ("any") проверка
+    windows_only: bool = False  # вне Windows статус всегда False
+    log_name: Optional[str] = None  # имя твика в журнале (utils.tweak_log); None - ключ твика
+    warning: Optional[str] = None
+
+    def is_enabled(self, values: Dict[Tuple[str, str], Any]) -> bool:
+        """Evaluates the checks against {(key_path, value_name): value}"""
+        results = (check.matches(values.get((check.key_path, check.value_name))) for check in self.checks)
+        return all(results) if self.match == "all" else any(results)
+
+
+class DeclarativeTweak(BaseTweak):
+    """BaseTweak driven by a TweakSpec"""
+
+    spec: TweakSpec = None
+
+    def __init__(self, spec: Optional[TweakSpec] = None):
+        if spec is not None:
+            self.spec = spec
+        self.reg = RegistryHandler()
+
+    @property
+    def log_name(self) -> str:
+        return self.spec.log_name or self.spec.key
+
+    @property
+    def metadata(self) -> TweakMetadata:
+        return TweakMetadata(
+            title=self.spec.title,
+            description=self.spec.description,
+            category=self.spec.category,
+            warning=self.spec.warning
+        )
+
+    def check_status(self) -> bool:
+        if self.spec.windows_only and platform.system() != "Windows":
+            return False
+        requests = [(check.key_path, check.value_name) for check in self.spec.checks]
+        return self.spec.is_enabled(self.reg.get_many(requests))
+
+    def toggle(self) -> bool:
+        current_status = self.check_status()
+        result = self.disable() if current_status else self.enable()
+        self.log_action("toggle", "Disabled" if current_status else "Enabled", result)
+        return result
+
+    def enable(self, log: bool = True) -> bool:
+        """log=False - the caller commits an outer transaction and logs the outcome itself"""
+        start = time.perf_counter()
+        result = self._apply(self.spec.enable)
+        if log:
+            self.log_action("enable", "Enabled", result, (time.perf_counter() - start) * 1000)
+        return result
+
+    def disable(self, log: bool = True) -> bool:
+        start = time.perf_counter()
+        result = self._apply(self.spec.disable)
+        if log:
+            self.log_action("disable", "Disabled", result, (time.perf_counter() - start) * 1000)
+        return result
+
+    def _apply(self, writes: Iterable[RegistryWrite]) -> bool:
+        success = True
+        try:
+            with self.reg.transaction():
+                for write in writes:
+                    if write.delete:
+                        success &= self.reg.delete_registry_value(write.key_path, write.value_name, ignore_not_found=True)
+                    else:
+                        success &= self.reg.set_registry_value(write.key_path, write.value_name, write.value, write.value_type)
+        except RegistryTransactionError as e:
+            print(f"Error applying {self.spec.key}: {e}")
+            return False
+        return success
+
+
+class ProbePlan:
+    """
+    Every registry value read by a set of specs, deduplicated across tweaks, so that
+    the statuses of all of them come from a single grouped get_many() pass.
+    """
+
+    def __init__(self, specs: Iterable[TweakSpec]):
+        self.specs: List[TweakSpec] = list(specs)
+        self.requests: List[Tuple[str, str]] = []
+        seen = set()
+        handler = RegistryHandler(use_cache=False)
+        for spec in self.specs:
+            for check in spec.checks:
+                value_key = handler._value_key(check.key_path, check.value_name)
+                if value_key not in seen:
+                    seen.add(value_key)
+                    self.requests.append((check.key_path, check.value_name))
+
+    def evaluate(self, registry: RegistryHandler, keys: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """Returns {tweak key: enabled} for the specs (optionally only for the given keys)"""
+        wanted = set(keys) if keys is not None else None
+        specs = [spec for spec in self.specs if wanted is None or spec.key in wanted]
+        is_windows = platform.system() == "Windows"
+
+        requests = self.requests if wanted is None else ProbePlan(specs).requests
+        read = registry.get_many(requests) if requests else {}
+        # Разные написания одного и того же пути сводятся к одному прочитанному значению
+        by_value_key = {registry._value_key(path, name): value for (path, name), value in read.items()}
+
+        statuses = {}
+        for spec in specs:
+            if spec.windows_only and not is_windows:
+                statuses[spec.key] = False
+                continue
+            values = {(check.key_path, check.value_name): by_value_key.get(registry._value_key(check.key_path, check.value_name))
+                      for check in spec.checks}
+            statuses[spec.key] = spec.is_enabled(values)
+        return statuses
+
+
+_specs: Optional[Dict[str, TweakSpec]] = None
+_classes: Dict[str, Type[DeclarativeTweak]] = {}
+_default_plan: Optional[ProbePlan] = None
+
+
+def get_specs() -> Dict[str, TweakSpec]:
+    """All declarative specs keyed by their config.TWEAKS key"""
+    global _specs
+    if _specs is None:
+        from utils.tweaks.declarative_specs import SPECS
+        _specs = {spec.key: spec for spec in SPECS}
+    return _specs
+
+
+def get_spec(key: str) -> Optional[TweakSpec]:
+    return get_specs().get(key)
+
+
+def declarative_tweak(key: str) -> Type[DeclarativeTweak]:
+    """Returns the (cached) DeclarativeTweak subclass for a spec, named after spec.class_name"""
+    tweak_class = _classes.get(key)
+    if tweak_class is None:
+        spec = get_specs()[key]
+        tweak_class = type(spec.class_name, (DeclarativeTweak,), {"spec": spec, "__module__": __name__})
+        _classes[key] = tweak_class
+    return tweak_class
+
+
+def default_probe_plan() -> ProbePlan:
+    """Probe plan compiled from every declarative spec"""
+    global _default_plan
+    if _default_plan is None:
+        _default_plan = ProbePlan(get_specs().values())
+    return _default_plan
@@ -1,14 +1,15 @@
 # Код для utils/tweaks/app_start_notify.py (с исправленной логикой check_status)
 
-import os
-import winreg
+from utils.registry_backends import winreg
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
 
 class AppStartNotifyTweak(BaseTweak):
+    log_name = "app_start_notify"
+    registry_only = True
+
     def __init__(self):
         self.reg = RegistryHandler()
-        self.log_file = self.setup_log_file()
 
     @property
     def metadata(self) -> TweakMetadata:
@@ -99,31 +100,3 @@ class AppStartNotifyTweak(BaseTweak):
             r"HKCU\Software\Microsoft\Windows\CurrentVersion\Internet Settings\Zones\3",
             "1806", zone_3_1806_value, winreg.REG_DWORD
         )
-
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "app_start_notify_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
@@ -1,15 +1,17 @@
 import os
-import winreg
+from utils.registry_backends import winreg
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
 
 class AppStartTrackingTweak(BaseTweak):
+    log_name = "app_start_tracking"
+    registry_only = True
+
     def __init__(self):
         self.reg = RegistryHandler()
         self.registry_path = r"HKCU\Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced"
         self.value_name = "Start_TrackProgs"
-        self.log_file = self.setup_log_file()
-        self.save_data_path = os.path.join(os.getenv('APPDATA'), "ASX-Hub", "SaveData", "ParameterFunction")
+        self.save_data_path = os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "ASX-Hub", "SaveData", "ParameterFunction")
         self.param_value_name = "AppsTrack"
 
     @property
@@ -67,29 +69,3 @@ class AppStartTrackingTweak(BaseTweak):
             self.log_action("disable", "Failed to disable", False)
             print(f"Error disabling App Start Tracking: {e}")
             return False
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "app_start_tracking_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
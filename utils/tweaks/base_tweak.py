@@ -2,6 +2,9 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Optional
 
+from utils.tweak_fingerprint import StatusInputs
+from utils.tweak_log import log_tweak_action
+
 @dataclass
 class TweakMetadata:
     def __init__(self, title, description, category, warning=None, optimized_state=True):
@@ -11,6 +14,30 @@ class TweakMetadata:
         self.warning = warning
 
 class BaseTweak(ABC):
+    # check_status запускает внешние процессы (powercfg, PowerShell, tasklist) или обходит
+    # файлы - анализатор выполняет такие проверки параллельно и ограничивает их по времени
+    slow_check = False
+    check_timeout = 20.0
+    # enable/disable вызывают check_cancelled() из utils.tweak_jobs и могут быть отменены
+    cancellable = False
+    # enable/disable только пишут в реестр (без процессов, файлов и служб) - пресеты применяют
+    # такие твики сразу после декларативных, до служб и внешних процессов
+    registry_only = False
+    # Имя твика в общем журнале (utils.tweak_log); по умолчанию - имя модуля
+    log_name: Optional[str] = None
+
+    def log_action(self, action, state, success, duration_ms=None):
+        """Queues a record for the shared tweak log."""
+        log_tweak_action(self.log_name or type(self).__module__.rsplit(".", 1)[-1], action, state, success, duration_ms)
+
+    def status_inputs(self) -> Optional[StatusInputs]:
+        """
+        Inputs of check_status() besides the registry values it reads through RegistryHandler
+        (those are recorded automatically). None - the check depends on external programs
+        and is re-run on every analysis.
+        """
+        return StatusInputs()
+
     @property
     @abstractmethod
     def metadata(self) -> TweakMetadata:
@@ -1,7 +1,7 @@
 import platform
-import winreg
+from utils.registry_backends import winreg
 import subprocess  # Import subprocess
-from utils.registry_handler import RegistryHandler
+from utils.registry_handler import RegistryHandler, RegistryTransactionError
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 
 class CortanaTweak(BaseTweak):
@@ -62,27 +62,33 @@ class CortanaTweak(BaseTweak):
         """Enables Cortana using registry keys."""
         success = True
 
-        # Set AllowCortana to 1
-        success &= self.reg.set_registry_value(self.policy_path, self.policy_value, 1, winreg.REG_DWORD)
-        # Restore other registry settings
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_consent, 1, winreg.REG_DWORD)
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_bing, 1, winreg.REG_DWORD)
-        success &= self.reg.set_registry_value(self.explorer_path, self.explorer_value, 1, winreg.REG_DWORD)
-
-        # New registry keys for enabling (setting to default/enabled state)
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_can_cortana, 1, winreg.REG_DWORD)  #HKCU
-        success &= self.reg.set_registry_value(self.speech_onecore_path, self.speech_onecore_value, 1, winreg.REG_DWORD) # HKLM
-        success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_cloud, 1, winreg.REG_DWORD)  # HKLM
-        success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_location, 1, winreg.REG_DWORD)  # HKLM
-        success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_web, 1, winreg.REG_DWORD)  # HKLM
-        success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_disableweb, 0, winreg.REG_DWORD)  # HKLM
-        success &= self.reg.set_registry_value(self.input_personalization_path, self.input_personalization_value_ink, 0, winreg.REG_DWORD) #HKCU
-        success &= self.reg.set_registry_value(self.input_personalization_path, self.input_personalization_value_text, 0, winreg.REG_DWORD) #HKCU
-        success &= self.reg.set_registry_value(self.trained_data_path, self.trained_data_value, 1, winreg.REG_DWORD)  #HKCU
-        success &= self.reg.set_registry_value(self.personalization_settings_path, self.personalization_settings_value, 1, winreg.REG_DWORD) #HKCU
-        success &= self.reg.set_registry_value(self.windows_search_user_path, self.windows_search_user_value, 1, winreg.REG_DWORD) #HKCU
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_cortana_enabled, 1, winreg.REG_DWORD)  #HKCU
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_searchbox, 1, winreg.REG_DWORD)  #HKCU
+        # Все значения применяются одним пакетом и откатываются при сбое
+        try:
+            with self.reg.transaction():
+                # Set AllowCortana to 1
+                success &= self.reg.set_registry_value(self.policy_path, self.policy_value, 1, winreg.REG_DWORD)
+                # Restore other registry settings
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_consent, 1, winreg.REG_DWORD)
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_bing, 1, winreg.REG_DWORD)
+                success &= self.reg.set_registry_value(self.explorer_path, self.explorer_value, 1, winreg.REG_DWORD)
+
+                # New registry keys for enabling (setting to default/enabled state)
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_can_cortana, 1, winreg.REG_DWORD)  #HKCU
+                success &= self.reg.set_registry_value(self.speech_onecore_path, self.speech_onecore_value, 1, winreg.REG_DWORD) # HKLM
+                success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_cloud, 1, winreg.REG_DWORD)  # HKLM
+                success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_location, 1, winreg.REG_DWORD)  # HKLM
+                success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_web, 1, winreg.REG_DWORD)  # HKLM
+                success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_disableweb, 0, winreg.REG_DWORD)  # HKLM
+                success &= self.reg.set_registry_value(self.input_personalization_path, self.input_personalization_value_ink, 0, winreg.REG_DWORD) #HKCU
+                success &= self.reg.set_registry_value(self.input_personalization_path, self.input_personalization_value_text, 0, winreg.REG_DWORD) #HKCU
+                success &= self.reg.set_registry_value(self.trained_data_path, self.trained_data_value, 1, winreg.REG_DWORD)  #HKCU
+                success &= self.reg.set_registry_value(self.personalization_settings_path, self.personalization_settings_value, 1, winreg.REG_DWORD) #HKCU
+                success &= self.reg.set_registry_value(self.windows_search_user_path, self.windows_search_user_value, 1, winreg.REG_DWORD) #HKCU
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_cortana_enabled, 1, winreg.REG_DWORD)  #HKCU
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_searchbox, 1, winreg.REG_DWORD)  #HKCU
+        except RegistryTransactionError as e:
+            print(f"Error enabling Cortana: {e}")
+            success = False
 
         # Restart explorer.exe to apply changes
         subprocess.run("taskkill /f /im explorer.exe", shell=True, capture_output=True)
@@ -94,33 +100,38 @@ class CortanaTweak(BaseTweak):
         """Disables Cortana using registry keys and taskkill."""
         success = True
 
-        # Set AllowCortana to 0 (the main policy setting)
-        success &= self.reg.set_registry_value(self.policy_path, self.policy_value, 0, winreg.REG_DWORD)
-
-        # Set additional registry keys to disable related features
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_consent, 0, winreg.REG_DWORD)
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_bing, 0, winreg.REG_DWORD)
-        success &= self.reg.set_registry_value(self.explorer_path, self.explorer_value, 0, winreg.REG_DWORD)
+        # Все значения применяются одним пакетом и откатываются при сбое
+        try:
+            with self.reg.transaction():
+                # Set AllowCortana to 0 (the main policy setting)
+                success &= self.reg.set_registry_value(self.policy_path, self.policy_value, 0, winreg.REG_DWORD)
+
+                # Set additional registry keys to disable related features
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_consent, 0, winreg.REG_DWORD)
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_bing, 0, winreg.REG_DWORD)
+                success &= self.reg.set_registry_value(self.explorer_path, self.explorer_value, 0, winreg.REG_DWORD)
+
+                # New registry keys for disabling
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_can_cortana, 0, winreg.REG_DWORD)  #HKCU
+                success &= self.reg.set_registry_value(self.speech_onecore_path, self.speech_onecore_value, 0, winreg.REG_DWORD) # HKLM
+                success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_cloud, 0, winreg.REG_DWORD) # HKLM
+                success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_location, 0, winreg.REG_DWORD) # HKLM
+                success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_web, 0, winreg.REG_DWORD)  # HKLM
+                success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_disableweb, 1, winreg.REG_DWORD)  # HKLM
+                success &= self.reg.set_registry_value(self.input_personalization_path, self.input_personalization_value_ink, 1, winreg.REG_DWORD) #HKCU
+                success &= self.reg.set_registry_value(self.input_personalization_path, self.input_personalization_value_text, 1, winreg.REG_DWORD) #HKCU
+                success &= self.reg.set_registry_value(self.trained_data_path, self.trained_data_value, 0, winreg.REG_DWORD)  #HKCU
+                success &= self.reg.set_registry_value(self.personalization_settings_path, self.personalization_settings_value, 0, winreg.REG_DWORD) #HKCU
+                success &= self.reg.set_registry_value(self.windows_search_user_path, self.windows_search_user_value, 0, winreg.REG_DWORD)  #HKCU
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_cortana_enabled, 0, winreg.REG_DWORD)  #HKCU
+                success &= self.reg.set_registry_value(self.search_path, self.search_value_searchbox, 0, winreg.REG_DWORD)  #HKCU
+        except RegistryTransactionError as e:
+            print(f"Error disabling Cortana: {e}")
+            success = False
 
         # Kill Cortana process (if running)
         subprocess.run("taskkill /f /im Cortana.exe", shell=True, capture_output=True)
 
-        # New registry keys for disabling
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_can_cortana, 0, winreg.REG_DWORD)  #HKCU
-        success &= self.reg.set_registry_value(self.speech_onecore_path, self.speech_onecore_value, 0, winreg.REG_DWORD) # HKLM
-        success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_cloud, 0, winreg.REG_DWORD) # HKLM
-        success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_location, 0, winreg.REG_DWORD) # HKLM
-        success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_web, 0, winreg.REG_DWORD)  # HKLM
-        success &= self.reg.set_registry_value(self.windows_search_path, self.windows_search_value_disableweb, 1, winreg.REG_DWORD)  # HKLM
-        success &= self.reg.set_registry_value(self.input_personalization_path, self.input_personalization_value_ink, 1, winreg.REG_DWORD) #HKCU
-        success &= self.reg.set_registry_value(self.input_personalization_path, self.input_personalization_value_text, 1, winreg.REG_DWORD) #HKCU
-        success &= self.reg.set_registry_value(self.trained_data_path, self.trained_data_value, 0, winreg.REG_DWORD)  #HKCU
-        success &= self.reg.set_registry_value(self.personalization_settings_path, self.personalization_settings_value, 0, winreg.REG_DWORD) #HKCU
-        success &= self.reg.set_registry_value(self.windows_search_user_path, self.windows_search_user_value, 0, winreg.REG_DWORD)  #HKCU
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_cortana_enabled, 0, winreg.REG_DWORD)  #HKCU
-        success &= self.reg.set_registry_value(self.search_path, self.search_value_searchbox, 0, winreg.REG_DWORD)  #HKCU
-
-
         # Restart explorer.exe to apply changes
         subprocess.run("taskkill /f /im explorer.exe", shell=True, capture_output=True)
         subprocess.run("start explorer.exe", shell=True, capture_output=True)
@@ -1,20 +1,21 @@
 import os
 import subprocess
-import requests  # Добавляем requests
 import shutil  # Для копирования файла hosts
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
+from utils.asset_cache import fetch_asset, AssetUnavailable, ASSET_MAX_AGE
 from utils.registry_handler import RegistryHandler  #  Может пригодиться в будущем
 
 class DataDomainsTweak(BaseTweak):
+    log_name = "data_domains"
+
     def __init__(self):
         self.reg = RegistryHandler()  #  Может пригодиться в будущем
-        self.log_file = self.setup_log_file()
         self.hosts_url = "https://github.com/ALFiX01/ASX-Hub/raw/main/Files/Other/hosts.txt"  # URL файла hosts
-        self.hosts_local_path = os.path.join(os.getenv('APPDATA'), "ASX-Hub", "Files", "Resources", "host.txt")
+        self.hosts_local_path = os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "ASX-Hub", "Files", "Resources", "host.txt")
         self.system_hosts_path = r"C:\Windows\System32\drivers\etc\hosts"  # Путь к системному файлу hosts
-        self.restore_dir = os.path.join(os.getenv('APPDATA'), "ASX-Hub", "Files", "Restore")
+        self.restore_dir = os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "ASX-Hub", "Files", "Restore")
         self.backup_file = os.path.join(self.restore_dir, "hosts_backup")
-        self.save_data_path = os.path.join(os.getenv('APPDATA'), "ASX-Hub", "SaveData", "ParameterFunction") # путь к реестру
+        self.save_data_path = os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "ASX-Hub", "SaveData", "ParameterFunction") # путь к реестру
         self.value_name = "DataDomains"
 
 
@@ -93,21 +94,13 @@ class DataDomainsTweak(BaseTweak):
             return False
 
     def _download_hosts_file(self) -> bool:
-        """Скачивает файл hosts.txt."""
+        """Скачивает файл hosts.txt (через кэш загрузок)."""
         try:
-            response = requests.get(self.hosts_url, stream=True)
-            response.raise_for_status()  # Проверяем статус HTTP (200 OK)
-
-            # Создаем директории, если их нет
-            os.makedirs(os.path.dirname(self.hosts_local_path), exist_ok=True)
-
-            with open(self.hosts_local_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            fetch_asset(self.hosts_url, self.hosts_local_path, max_age=ASSET_MAX_AGE)
             self.log_action("_download_hosts_file", f"Downloaded hosts file to {self.hosts_local_path}", True)
             return True
 
-        except requests.exceptions.RequestException as e:
+        except AssetUnavailable as e:
             self.log_action("_download_hosts_file", f"Failed to download hosts file: {e}", False)
             print(f"Error downloading hosts file: {e}")
             return False
@@ -128,30 +121,3 @@ class DataDomainsTweak(BaseTweak):
             self.log_action("_backup_system_hosts", f"Failed to backup system hosts file: {e}", False)
             print(f"Error backing up hosts file: {e}")
             return False
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "data_domains_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                if (state != "Attempting") and ("Not applicable" not in state) :
-                    print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
@@ -0,0 +1,221 @@
+# utils/tweaks/declarative_specs.py
+# Твики, которые только читают и пишут значения реестра. Модули с именами этих твиков
+# оставлены как тонкие обёртки (declarative_tweak), чтобы старые импорты продолжали работать.
+
+from utils.tweak_specs import TweakSpec, RegistryCheck, RegistryWrite
+
+_OPTIMIZATION = "Оптимизация и настройки"
+_PRIVACY = "Конфиденциальность"
+
+_GAME_DVR = r"HKEY_CURRENT_USER\System\GameConfigStore"
+_MEMORY_MANAGEMENT = r"HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Control\Session Manager\Memory Management"
+_DISPLAY_CLASS = r"HKEY_LOCAL_MACHINE\System\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}"
+_POWER_THROTTLING = r"HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Control\Power\PowerThrottling"
+_BACKGROUND_APPS = r"HKEY_CURRENT_USER\Software\Microsoft\Windows\CurrentVersion\BackgroundAccessApplications"
+_PUSH_NOTIFICATIONS = r"HKEY_CURRENT_USER\Software\Microsoft\Windows\CurrentVersion\PushNotifications"
+_SESSION_POWER = r"HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Control\Session Manager\Power"
+_GRAPHICS_DRIVERS = r"HKLM\SYSTEM\CurrentControlSet\Control\GraphicsDrivers"
+_CLIPBOARD = r"HKCU\Software\Microsoft\Clipboard"
+_HVCI = r"HKLM\SYSTEM\CurrentControlSet\Control\DeviceGuard\Scenarios\HypervisorEnforcedCodeIntegrity"
+_MAPS = r"HKLM\SYSTEM\Maps"
+_WINDOWS_STORE = r"HKLM\SOFTWARE\Policies\Microsoft\WindowsStore"
+_EDGE_POLICIES = r"HKLM\SOFTWARE\Policies\Microsoft\Edge"
+_APP_COMPAT = r"HKLM\SOFTWARE\Policies\Microsoft\Windows\AppCompat"
+_SPEECH = r"HKLM\SOFTWARE\Policies\Microsoft\Speech"
+_CDP_USER_SVC = r"HKLM\SYSTEM\CurrentControlSet\Services\CDPUserSvc"
+_EXPERIMENTATION = r"HKLM\SOFTWARE\Microsoft\PolicyManager\current\device\System"
+_DIAGNOSTICS_HUB = r"HKLM\SYSTEM\CurrentControlSet\Services\diagnosticshub.standardcollector.service"
+
+SPECS = [
+    TweakSpec(
+        "FsoGameBar", "FsoGameBarTweak",
+        title="FSO и GameBar",
+        description="Отключает/Включает FSO и GameBar",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_GAME_DVR, "GameDVR_Enabled", "!=", 0),),
+        enable=(RegistryWrite(_GAME_DVR, "GameDVR_Enabled", 1),),
+        disable=(RegistryWrite(_GAME_DVR, "GameDVR_Enabled", 0),),
+        windows_only=True,
+        log_name="GameDVR",
+    ),
+    TweakSpec(
+        "spectre_meltdown", "SpectreMeltdownTweak",
+        title="Spectre, Meldown, DownFall",
+        description="Отключает/Включает Spectre, Meldown, DownFall",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_MEMORY_MANAGEMENT, "FeatureSettings", "!=", 1),),
+        enable=(RegistryWrite(_MEMORY_MANAGEMENT, "FeatureSettings", 0),),
+        disable=(RegistryWrite(_MEMORY_MANAGEMENT, "FeatureSettings", 1),),
+        windows_only=True,
+        log_name="spectre_meltdown",
+    ),
+    TweakSpec(
+        "hdcp", "HdcpTweak",
+        title="HDCP",
+        description="Отключает/Включает HDCP",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_DISPLAY_CLASS, "RMHdcpKeyglobZero", "!=", 1),),
+        enable=(RegistryWrite(_DISPLAY_CLASS, "RMHdcpKeyglobZero", 0),),
+        disable=(RegistryWrite(_DISPLAY_CLASS, "RMHdcpKeyglobZero", 1),),
+        windows_only=True,
+        log_name="hdcp",
+    ),
+    TweakSpec(
+        "power_throttling", "PowerThrottlingTweak",
+        title="Power Throttling",
+        description="Отключает/Включает Power Throttling",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_POWER_THROTTLING, "PowerThrottlingOff", "!=", 1),),
+        enable=(RegistryWrite(_POWER_THROTTLING, "PowerThrottlingOff", 0),),
+        disable=(RegistryWrite(_POWER_THROTTLING, "PowerThrottlingOff", 1),),
+        windows_only=True,
+        log_name="power_throttling",
+    ),
+    TweakSpec(
+        "uwp_background", "UWPBackgroundTweak",
+        title="Работа UWP программ в фоне",
+        description="Запрещает UWP (Universal Windows Platform) приложениям работать в фоновом режиме.",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_BACKGROUND_APPS, "GlobalUserDisabled", "!=", 1),),
+        enable=(RegistryWrite(_BACKGROUND_APPS, "GlobalUserDisabled", 0),),
+        disable=(RegistryWrite(_BACKGROUND_APPS, "GlobalUserDisabled", 1),),
+        windows_only=True,
+    ),
+    TweakSpec(
+        "notifications", "NotificationsTweak",
+        title="Уведомления",
+        description="Отключает/Включает все уведомления",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_PUSH_NOTIFICATIONS, "ToastEnabled", "!=", 0),),
+        enable=(RegistryWrite(_PUSH_NOTIFICATIONS, "ToastEnabled", 1),),
+        disable=(RegistryWrite(_PUSH_NOTIFICATIONS, "ToastEnabled", 0),),
+        windows_only=True,
+    ),
+    TweakSpec(
+        "fastboot", "FastBootTweak",
+        title="Быстрый запуск (Hiberboot)",
+        description="Отключает/Включает Hiberboot",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_SESSION_POWER, "HiberbootEnabled", "!=", 0),),
+        enable=(RegistryWrite(_SESSION_POWER, "HiberbootEnabled", 1),),
+        disable=(RegistryWrite(_SESSION_POWER, "HiberbootEnabled", 0),),
+        windows_only=True,
+        log_name="fastboot",
+    ),
+    TweakSpec(
+        "hw_sch_mode", "HwSchModeTweak",
+        title="Аппаратное ускорение GPU",
+        description="Включает/отключает планирование графического процессора с аппаратным ускорением",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_GRAPHICS_DRIVERS, "HwSchMode", "==", 2),),
+        enable=(RegistryWrite(_GRAPHICS_DRIVERS, "HwSchMode", 2),),
+        disable=(RegistryWrite(_GRAPHICS_DRIVERS, "HwSchMode", 1),),
+        log_name="hw_sch_mode",
+    ),
+    TweakSpec(
+        "clipboard_history", "ClipboardHistoryTweak",
+        title="Журнал буфера обмена",
+        description="Включает/отключает журнал буфера обмена Windows",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_CLIPBOARD, "EnableClipboardHistory", "==", 1),),
+        enable=(RegistryWrite(_CLIPBOARD, "EnableClipboardHistory", 1),),
+        disable=(RegistryWrite(_CLIPBOARD, "EnableClipboardHistory", 0),),
+        log_name="clipboard_history",
+    ),
+    TweakSpec(
+        "core_isolation", "CoreIsolationTweak",
+        title="Изоляция ядра",
+        description="Включает/отключает изоляцию ядра (Hypervisor-protected Code Integrity)",
+        category="Безопасность",
+        checks=(RegistryCheck(_HVCI, "Enabled", "==", 1),),
+        enable=(RegistryWrite(_HVCI, "Enabled", 1),),
+        disable=(RegistryWrite(_HVCI, "Enabled", 0),),
+        log_name="core_isolation",
+    ),
+    TweakSpec(
+        "auto_update_maps", "AutoUpdateMapsTweak",
+        title="Автообновление карт",
+        description="Включает/отключает автоматическое обновление карт Windows",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_MAPS, "AutoUpdateEnabled", "!=", 0),),
+        enable=(RegistryWrite(_MAPS, "AutoUpdateEnabled", delete=True),),
+        disable=(RegistryWrite(_MAPS, "AutoUpdateEnabled", 0),),
+        log_name="auto_update_maps",
+    ),
+    TweakSpec(
+        "auto_store_apps", "AutoStoreAppsTweak",
+        title="Автообновление приложений Магазина",
+        description="Включает/отключает автоматическое обновление приложений из Microsoft Store",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_WINDOWS_STORE, "AutoDownload", "!=", 2),),
+        enable=(RegistryWrite(_WINDOWS_STORE, "AutoDownload", delete=True),),
+        disable=(RegistryWrite(_WINDOWS_STORE, "AutoDownload", 2),),
+        log_name="auto_store_apps",
+    ),
+    TweakSpec(
+        "background_task_edge_browser", "BackgroundTaskEdgeBrowserTweak",
+        title="Фоновая работа Microsoft Edge",
+        description="Включает/отключает фоновую работу и Startup Boost для Microsoft Edge",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_EDGE_POLICIES, "BackgroundModeEnabled", "!=", 0),),
+        enable=(
+            RegistryWrite(_EDGE_POLICIES, "StartupBoostEnabled", delete=True),
+            RegistryWrite(_EDGE_POLICIES, "BackgroundModeEnabled", delete=True),
+        ),
+        disable=(
+            RegistryWrite(_EDGE_POLICIES, "StartupBoostEnabled", 0),
+            RegistryWrite(_EDGE_POLICIES, "BackgroundModeEnabled", 0),
+        ),
+        log_name="background_task_edge_browser",
+    ),
+    TweakSpec(
+        "installed_app_data", "InstalledAppDataTweak",
+        title="Сбор данных об установленных приложениях",
+        description="Включает/отключает сбор данных об установленных приложениях (Application Compatibility Inventory)",
+        category=_PRIVACY,
+        checks=(RegistryCheck(_APP_COMPAT, "DisableInventory", "==", 0),),
+        enable=(RegistryWrite(_APP_COMPAT, "DisableInventory", 0),),
+        disable=(RegistryWrite(_APP_COMPAT, "DisableInventory", 1),),
+        log_name="installed_app_data",
+    ),
+    TweakSpec(
+        "background_speech_synthesis", "BackgroundSpeechSynthesisTweak",
+        title="Фоновое обновление синтеза речи",
+        description="Включает/отключает скрытое фоновое обновление моделей синтеза речи",
+        category=_PRIVACY,
+        checks=(RegistryCheck(_SPEECH, "AllowSpeechModelUpdate", "!=", 0),),
+        enable=(RegistryWrite(_SPEECH, "AllowSpeechModelUpdate", 1),),
+        disable=(RegistryWrite(_SPEECH, "AllowSpeechModelUpdate", 0),),
+        log_name="background_speech_synthesis",
+    ),
+    TweakSpec(
+        "system_monitoring", "SystemMonitoringTweak",
+        title="Мониторинг системы",
+        description="Включает/отключает скрытый мониторинг системы (CDPUserSvc)",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_CDP_USER_SVC, "Start", "!=", 4),),
+        enable=(RegistryWrite(_CDP_USER_SVC, "Start", 3),),  # 3 - Manual
+        disable=(RegistryWrite(_CDP_USER_SVC, "Start", 4),),  # 4 - Disabled
+        log_name="system_monitoring",
+    ),
+    TweakSpec(
+        "remote_pc_experiments", "RemotePCExperimentsTweak",
+        title="Удаленные эксперименты над ПК",
+        description="Включает/отключает разрешение на проведение удаленных экспериментов над ПК",
+        category=_PRIVACY,
+        checks=(RegistryCheck(_EXPERIMENTATION, "AllowExperimentation", "!=", 0),),
+        enable=(RegistryWrite(_EXPERIMENTATION, "AllowExperimentation", 1),),
+        disable=(RegistryWrite(_EXPERIMENTATION, "AllowExperimentation", 0),),
+        log_name="remote_pc_experiments",
+    ),
+    TweakSpec(
+        "windows_event_logging", "WindowsEventLoggingTweak",
+        title="Журналирование событий Windows",
+        description="Включает/отключает службу 'diagnosticshub.standardcollector.service'",
+        category=_OPTIMIZATION,
+        checks=(RegistryCheck(_DIAGNOSTICS_HUB, "Start", "!=", 4),),
+        enable=(RegistryWrite(_DIAGNOSTICS_HUB, "Start", 3),),  # 3 - Manual
+        disable=(RegistryWrite(_DIAGNOSTICS_HUB, "Start", 4),),  # 4 - Disabled
+        log_name="windows_event_logging",
+    ),
+]
@@ -1,21 +1,22 @@
 import os
 import subprocess
-import requests
 import zipfile
-import winreg
+from utils.registry_backends import winreg
 from utils.registry_handler import RegistryHandler
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
+from utils.asset_cache import fetch_asset, AssetUnavailable, ASSET_MAX_AGE
+
 
 class ExplorerBlurTweak(BaseTweak):
+    log_name = "explorer_blur"
+
     def __init__(self):
-        self.asx_directory = os.getenv('APPDATA') + "\\ASX-Hub" #Пример
+        self.asx_directory = os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "ASX-Hub")
         self.resource_dir = os.path.join(self.asx_directory, "Files", "Resources", "AcrylicExplorer")
         self.dll_path = os.path.join(self.resource_dir, "ExplorerBlurMica.dll")
         self.zip_url = "https://github.com/ALFiX01/ASX-Hub/releases/download/File/AcrylicExplorer.zip"
-        self.zip_path = os.path.join(self.asx_directory, "Files", "Resources", "AcrylicExplorer.zip")
         self.save_data_key = "HKCU\\Software\\ASX-Hub\\ParameterFunction"  #  Используем полный путь с HKCU
         self.value_name = "AcrylicExplorer"
-        self.log_file = self.setup_log_file()
         self.reg = RegistryHandler()  #  Не передаём HKEY
 
     @property
@@ -42,22 +43,13 @@ class ExplorerBlurTweak(BaseTweak):
 
     def enable(self) -> bool:
         try:
-            # Создаём все директории
-            os.makedirs(os.path.dirname(self.zip_path), exist_ok=True)
-
-            # Скачиваем ZIP-архив
-            response = requests.get(self.zip_url, stream=True)
-            response.raise_for_status()  # Проверяем статус ответа
-            with open(self.zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            # Распаковываем архив
-            with zipfile.ZipFile(self.zip_path, 'r') as zip_ref:
-                zip_ref.extractall(self.resource_dir)
+            # ZIP-архив берётся из кэша загрузок (без повторного скачивания и офлайн)
+            zip_path = fetch_asset(self.zip_url, max_age=ASSET_MAX_AGE)
 
-            # Удаляем ZIP-архив
-            os.remove(self.zip_path)
+            # Распаковываем архив прямо из кэша
+            os.makedirs(self.resource_dir, exist_ok=True)
+            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+                zip_ref.extractall(self.resource_dir)
 
             # Регистрируем DLL
             subprocess.run(["regsvr32", self.dll_path], check=True, shell = True)
@@ -69,7 +61,7 @@ class ExplorerBlurTweak(BaseTweak):
             self.log_action("enable", "Enabled", True)
             return True
 
-        except (requests.exceptions.RequestException, zipfile.BadZipFile, subprocess.CalledProcessError, OSError, Exception) as e:
+        except (AssetUnavailable, zipfile.BadZipFile, subprocess.CalledProcessError, OSError, Exception) as e:
             self.log_action("enable", "Enabled", False)
             print(f"Error enabling Explorer Blur: {e}")
             return False
@@ -103,30 +95,3 @@ class ExplorerBlurTweak(BaseTweak):
             print(f"Error disabling Explorer Blur: {e}")
             self.log_action("disable", "Disabled", False)
             return False
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "explorer_blur_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)  # Print to console too
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
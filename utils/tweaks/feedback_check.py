@@ -1,13 +1,14 @@
-import os
-import winreg
+from utils.registry_backends import winreg
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
 
 
 class FeedbackCheckTweak(BaseTweak):
+    log_name = "feedback_check"
+    registry_only = True
+
     def __init__(self):
         self.reg = RegistryHandler()
-        self.log_file = self.setup_log_file()
 
     @property
     def metadata(self) -> TweakMetadata:
@@ -104,30 +105,3 @@ class FeedbackCheckTweak(BaseTweak):
             do_not_show_value,
             winreg.REG_DWORD
         )
-
-    def setup_log_file(self):
-        """Настраивает путь к лог-файлу, создавая необходимые директории."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "feedback_check_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Логирует действия в лог-файл."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Возвращает текущую метку времени для логирования."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
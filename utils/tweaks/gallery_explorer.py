@@ -1,16 +1,17 @@
-import os
-import winreg
+from utils.registry_backends import winreg
 from utils.registry_handler import RegistryHandler
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 
 class GalleryExplorerTweak(BaseTweak):
+    log_name = "gallery_explorer"
+    registry_only = True
+
     def __init__(self):
         self.reg = RegistryHandler()
         self.user_reg_path = "HKCU\\Software\\Classes\\CLSID\\{e88865ea-0e1c-4e20-9aa6-edcd0212c87c}"
         self.system_reg_path = "HKLM\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Explorer\\Advanced\\NavPane\\ShowGallery"
 
         self.value_name = "System.IsPinnedToNameSpaceTree"
-        self.log_file = self.setup_log_file()
 
     @property
     def metadata(self) -> TweakMetadata:
@@ -77,29 +78,3 @@ class GalleryExplorerTweak(BaseTweak):
             print(f"Error disabling GalleryExplorer: {e}")
             self.log_action("disable", "Disabled", False)
             return False
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "gallery_explorer_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)  # Print to console too
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
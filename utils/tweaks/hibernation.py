@@ -2,16 +2,19 @@ import platform
 import subprocess
 import os
 from utils.registry_handler import RegistryHandler
+from utils.tweak_fingerprint import StatusInputs
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 
 
 class HibernationTweak(BaseTweak):
+    slow_check = True
+    log_name = "hibernation"
+
     def __init__(self):
         self.reg = RegistryHandler()
         self.registry_path = os.path.join(os.getenv('APPDATA', os.path.expanduser("~")), "ASX-Hub",
                                           "ParameterFunction")  # Пример пути
         self.value_name = "Hibernation"
-        self.log_file = self.setup_log_file()
 
     @property
     def metadata(self) -> TweakMetadata:
@@ -21,6 +24,10 @@ class HibernationTweak(BaseTweak):
             category="Оптимизация и настройки"
         )
 
+    def status_inputs(self):
+        # powercfg /a показывает гибернацию, пока HibernateEnabled не сброшен
+        return StatusInputs(registry=((r"HKLM\SYSTEM\CurrentControlSet\Control\Power", "HibernateEnabled"),))
+
     def check_status(self) -> bool:
         if platform.system() != "Windows":
             return False
@@ -70,30 +77,3 @@ class HibernationTweak(BaseTweak):
             return False
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "hibernation_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
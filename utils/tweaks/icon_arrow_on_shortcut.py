@@ -1,19 +1,23 @@
 import os
-import winreg
+from utils.registry_backends import winreg
 from utils.registry_handler import RegistryHandler
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 import subprocess
-import requests
+from utils.lazy_import import lazy_import
+
+requests = lazy_import("requests")
+
 
 class IconArrowOnShortcutTweak(BaseTweak):
+    log_name = "icon_arrow_on_shortcut"
+
     def __init__(self):
         self.reg = RegistryHandler()
         self.registry_path = "HKLM\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Explorer\\Shell Icons"
         self.value_name = "29"
-        self.log_file = self.setup_log_file()
         #self.favicon_url = "https://git.io/blankfavicon16x16"  #  Устаревший URL
         self.favicon_url = "https://raw.githubusercontent.com/ALFiX01/blank-favicon/master/favicon.ico" #Актуальнй URL
-        self.favicon_path = os.path.join(os.getenv('APPDATA'), "ASX-Hub", "Files", "Resources", "favicon.ico")
+        self.favicon_path = os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "ASX-Hub", "Files", "Resources", "favicon.ico")
 
 
     @property
@@ -80,30 +84,3 @@ class IconArrowOnShortcutTweak(BaseTweak):
             self.log_action("restart_explorer", "Explorer restarted", True)
         except Exception as e:
             self.log_action("restart_explorer", f"Error restarting explorer: {e}", False)
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "icon_arrow_on_shortcut_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)  # Print to console too
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
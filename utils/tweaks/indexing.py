@@ -1,16 +1,16 @@
-import os
 import subprocess
-import winreg  # Используем winreg для работы с реестром
+from utils.registry_backends import winreg
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
 
 
 class IndexingTweak(BaseTweak):
+    log_name = "indexing"
+
     def __init__(self):
         self.reg = RegistryHandler()
         self.registry_path = r"HKEY_LOCAL_MACHINE\SYSTEM\CurrentControlSet\Services\WSearch"
         self.value_name = "Start"
-        self.log_file = self.setup_log_file()
         self.service_name = "WSearch"
 
     @property
@@ -93,31 +93,3 @@ class IndexingTweak(BaseTweak):
             self.log_action("disable", "Disabled", False)
             print(f"An unexpected error occurred: {e}")
             return False
-
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "indexing_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)  # Print to console too
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
@@ -1,13 +1,13 @@
-import os
-import winreg
+from utils.registry_backends import winreg
 import subprocess
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
 
 class MicrosoftSpyModulesTweak(BaseTweak):
+    log_name = "microsoft_spy_modules"
+
     def __init__(self):
         self.reg = RegistryHandler()
-        self.log_file = self.setup_log_file()
         self.diagtrack_path = r"HKLM\SYSTEM\CurrentControlSet\Services\DiagTrack"
         self.dmwappushservice_path = r"HKLM\SYSTEM\CurrentControlSet\Services\dmwappushservice"
 
@@ -74,30 +74,3 @@ class MicrosoftSpyModulesTweak(BaseTweak):
             self.log_action("disable", "Failed to disable", False)
             print(f"Error disabling Microsoft Spy Modules: {e}")
             return False
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "microsoft_spy_modules_log.txt")
-        return log_file
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                if state != "Attempting" and "applicable" not in state:
-                    print(log_message)  # Print to console too
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
@@ -1,15 +1,16 @@
-import os
-import winreg
+from utils.registry_backends import winreg
 from utils.registry_handler import RegistryHandler
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
-import subprocess
+from utils.powershell_host import run_powershell
 
 class NetworkExplorerTweak(BaseTweak):
+    slow_check = True
+    log_name = "network_explorer"
+
     def __init__(self):
         self.reg = RegistryHandler()
         self.registry_path = "HKCU\\Software\\Classes\\CLSID\\{F02C1A0D-BE21-4350-88B0-7367FC96EF3C}"
         self.value_name = "System.IsPinnedToNameSpaceTree"
-        self.log_file = self.setup_log_file()
 
     @property
     def metadata(self) -> TweakMetadata:
@@ -19,6 +20,10 @@ class NetworkExplorerTweak(BaseTweak):
             category="Кастомизация"
         )
 
+    def status_inputs(self):
+        # Результат зависит от вывода PowerShell - отпечатком не описать
+        return None
+
     def check_status(self) -> bool:
         # Продвинутая проверка статуса: проверяем и реестр, и наличие иконки в проводнике
         reg_value = self.reg.get_registry_value(self.registry_path, self.value_name)
@@ -31,12 +36,11 @@ class NetworkExplorerTweak(BaseTweak):
         try:
             # Используем PowerShell для проверки, виден ли элемент "Network" в Namespace
             #  Эта команда PowerShell проверяет наличие элемента Network в пространстве имен проводника.
-            command = 'powershell -Command "[bool]((New-Object -ComObject Shell.Application).Namespace(\'::{F02C1A0D-BE21-4350-88B0-7367FC96EF3C}\').Self.Name)"'
-            result = subprocess.run(command, capture_output=True, text=True, shell=True, check=True) #Добавил , shell=True
+            result = run_powershell("[bool]((New-Object -ComObject Shell.Application).Namespace('::{F02C1A0D-BE21-4350-88B0-7367FC96EF3C}').Self.Name)")
             # Если команда выполнилась успешно и вернула "True", значит, иконка видна.
-            return result.stdout.strip().lower() == 'true'
+            return result.success and result.text.lower() == 'true'
 
-        except (subprocess.CalledProcessError, FileNotFoundError, Exception):
+        except Exception:
             # Если произошла ошибка при выполнении PowerShell (например, PowerShell не установлен),
             # считаем, что иконка не видна (на всякий случай лучше вернуть False)
             return False
@@ -65,30 +69,3 @@ class NetworkExplorerTweak(BaseTweak):
             print(f"Error disabling NetworkExplorer: {e}")
             self.log_action("disable", "Disabled", False)
             return False
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "network_explorer_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)  # Print to console too
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
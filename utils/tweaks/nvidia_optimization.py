@@ -1,23 +1,23 @@
 import platform
-import winreg
+from utils.registry_backends import winreg
 import os
 import subprocess
-import requests
 import zipfile
 from utils.registry_handler import RegistryHandler
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
+from utils.asset_cache import fetch_asset, ASSET_MAX_AGE
+from utils.tweak_jobs import check_cancelled, report_progress
 
 
 class NvidiaOptimizationTweak(BaseTweak):
+    cancellable = True
+    log_name = "nvidia_optimization"
+
     def __init__(self):
         self.reg = RegistryHandler()
         self.registry_path = r"HKEY_CURRENT_USER\Software\ALFiX inc.\ASX\Data\ParameterFunction"
         self.value_name = "NvidiaPanelOptimization"
-        self.log_file = self.setup_log_file()
 
-        self.base_dir = "downloads"
-        self.nvidia_inspector_zip_filename = "nvidiaProfileInspector.zip"
-        self.nvidia_inspector_zip_filepath = os.path.join(self.base_dir, self.nvidia_inspector_zip_filename)
         self.nvidia_inspector_extract_dir = os.path.join("resources", "nvidiaProfileInspector")
         self.nvidia_inspector_exe_path = os.path.join(self.nvidia_inspector_extract_dir, "nvidiaProfileInspector.exe")
         self.asx_profile_nip_filename = "ASX_Profile.nip"
@@ -54,7 +54,6 @@ class NvidiaOptimizationTweak(BaseTweak):
         """Apply Nvidia optimization."""
         success = True
         try:
-            os.makedirs(self.base_dir, exist_ok=True)
             os.makedirs(self.nvidia_inspector_extract_dir, exist_ok=True)
 
             if not os.path.exists(self.nvidia_inspector_exe_path):
@@ -78,7 +77,6 @@ class NvidiaOptimizationTweak(BaseTweak):
         """Restore default Nvidia settings."""
         success = True
         try:
-            os.makedirs(self.base_dir, exist_ok=True)
             os.makedirs(self.nvidia_inspector_extract_dir, exist_ok=True)
 
             if not os.path.exists(self.nvidia_inspector_exe_path):
@@ -100,44 +98,20 @@ class NvidiaOptimizationTweak(BaseTweak):
 
     def _download_and_extract_inspector(self):
         """Downloads and extracts Nvidia Profile Inspector."""
-        self._download_file(self.nvidia_inspector_zip_url, self.nvidia_inspector_zip_filepath)
-        with zipfile.ZipFile(self.nvidia_inspector_zip_filepath, 'r') as zip_ref:
+        # Архив остаётся в кэше загрузок, распаковывается из него
+        zip_path = self._download_file(self.nvidia_inspector_zip_url)
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
             zip_ref.extractall(self.nvidia_inspector_extract_dir)
-        os.remove(self.nvidia_inspector_zip_filepath)
-
-    def _download_file(self, url, filepath):
-        """Downloads a file."""
-        print(f"Downloading {os.path.basename(filepath)} from: {url}")
-        response = requests.get(url, stream=True, allow_redirects=True)
-        response.raise_for_status()
-        with open(filepath, 'wb') as file:
-            for chunk in response.iter_content(chunk_size=8192):
-                file.write(chunk)
-        print(f"{os.path.basename(filepath)} downloaded successfully.")
-
-    def setup_log_file(self):
-        """Sets up the log file."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "nvidia_optimization_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
 
-    def get_timestamp(self):
-        """Gets the current timestamp."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
+    def _download_file(self, url, filepath=None):
+        """Fetches a file through the asset cache; unchanged files are not downloaded again."""
+        name = os.path.basename(filepath or url)
+
+        def progress(received, total):
+            check_cancelled()
+            if total:
+                report_progress(f"Загрузка {name}", received / total)
+
+        path = fetch_asset(url, filepath, max_age=ASSET_MAX_AGE, progress=progress)
+        print(f"{name} is ready.")
+        return path
@@ -1,15 +1,15 @@
-import os
-import winreg
+from utils.registry_backends import winreg
 import subprocess
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
 
 class NvidiaTelemetryTweak(BaseTweak):
+    log_name = "nvidia_telemetry"
+
     def __init__(self):
         self.reg = RegistryHandler()
         self.registry_path = r"HKLM\SYSTEM\CurrentControlSet\Services\NvTelemetryContainer"
         self.value_name = "Start"
-        self.log_file = self.setup_log_file()
         self.service_name = "NvTelemetryContainer"
         # Задачи, связанные с телеметрией NVIDIA (GUID может отличаться в разных системах!)
         self.tasks = [
@@ -128,30 +128,3 @@ class NvidiaTelemetryTweak(BaseTweak):
                 self.log_action(f"_control_tasks ({task})", f"Failed to {action}", False)
                 print(f"Error controlling task ({task}): {e}, stdout: {e.stdout}, stderr:{e.stderr}")
                 # Не выходим, а продолжаем со следующей задачей
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "nvidia_telemetry_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
@@ -1,14 +1,17 @@
 import os
 import subprocess
-import winreg
+from utils.registry_backends import winreg
 import shutil
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
+from utils.powershell_host import run_powershell, PowerShellError
 
 class OneDriveTweak(BaseTweak):
+    slow_check = True
+    log_name = "onedrive_removal"
+
     def __init__(self):
         self.reg = RegistryHandler()
-        self.log_file = self.setup_log_file()
         # Удаляем self.save_data_path и self.value_name, так как они больше не нужны для check_status
 
     @property
@@ -19,6 +22,10 @@ class OneDriveTweak(BaseTweak):
             category="Оптимизация и настройки"
         )
 
+    def status_inputs(self):
+        # Результат зависит от процессов и файлов OneDrive - отпечатком не описать
+        return None
+
     def check_status(self) -> bool:
         """
         Проверяет, установлен ли OneDrive.  Надежная проверка, не зависящая от нашего кастомного ключа в реестре.
@@ -275,11 +282,7 @@ class OneDriveTweak(BaseTweak):
 
         # Проверка версии Windows (этот код, вероятно, не нужен на современных системах)
         try:
-            version = subprocess.check_output(
-                ["powershell", "-command", "[Environment]::OSVersion.Version | Select-Object -ExpandProperty Build"],
-                text=True,
-                creationflags = subprocess.CREATE_NO_WINDOW
-            ).strip()
+            version = run_powershell("[Environment]::OSVersion.Version | Select-Object -ExpandProperty Build").text
             build_number = int(version)
             if not (18363 <= build_number <= 19045):  # Диапазон версий
                 self.log_action("_disable_automatic_installation", "Skipped (version check)", True)
@@ -287,7 +290,7 @@ class OneDriveTweak(BaseTweak):
 
             self.reg.delete_registry_value(r"HKCU\Software\Microsoft\Windows\CurrentVersion\Run", "OneDriveSetup", ignore_not_found=True)
             self.log_action("_disable_automatic_installation", "Disabled", True)
-        except (subprocess.CalledProcessError, ValueError, Exception) as e:
+        except (PowerShellError, ValueError, Exception) as e:
             self.log_action("_disable_automatic_installation", "Failed or skipped", False)
             print(f"Error disabling automatic OneDrive installation: {e}")
 
@@ -316,14 +319,12 @@ class OneDriveTweak(BaseTweak):
         for pattern in task_patterns:
             try:
                 # -Force для скрытых задач, -ErrorAction SilentlyContinue чтобы не вываливаться если задач нет
-                subprocess.run(
-                    ["powershell", "-command",
-                     f"Get-ScheduledTask -TaskName '{pattern}' -ErrorAction SilentlyContinue | Disable-ScheduledTask -Confirm:$false -ErrorAction SilentlyContinue"],
-                    check=False, capture_output=True, text=True
+                run_powershell(
+                    f"Get-ScheduledTask -TaskName '{pattern}' -ErrorAction SilentlyContinue | Disable-ScheduledTask -Confirm:$false -ErrorAction SilentlyContinue"
                 )
                 self.log_action(f"_disable_scheduled_tasks ({pattern})", "Disabled", True)
 
-            except subprocess.CalledProcessError as e:
+            except PowerShellError as e:
                 self.log_action(f"_disable_scheduled_tasks ({pattern})", "Failed to disable", False)
                 print(f"Error disabling scheduled tasks ({pattern}): {e}")
 
@@ -336,32 +337,3 @@ class OneDriveTweak(BaseTweak):
         except Exception as e:
             self.log_action("_clear_environment_variable", "Failed to clear", False)
             print(f"Error clearing OneDrive environment variable: {e}")
-
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "onedrive_removal_log.txt") # Изменен лог файл
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                if state != "Attempting":
-                    print(log_message)  # Print to console too
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
@@ -1,30 +1,42 @@
-import os
-import importlib
-import inspect
-from typing import Dict, Type, List
+from typing import Dict, Type, List, Iterator
+from collections.abc import Mapping
 from utils.tweaks.base_tweak import BaseTweak
+from utils.tweak_manifest import get_manifest, load_tweak_class
+
+
+class _LazyTweakClasses(Mapping):
+    """class name -> tweak class; a module is imported when its class is first looked up"""
+
+    def __init__(self):
+        self.entries = get_manifest().entries()
+        self._classes: Dict[str, Type[BaseTweak]] = {}
+
+    def __getitem__(self, name: str) -> Type[BaseTweak]:
+        if name not in self._classes:
+            self._classes[name] = load_tweak_class(self.entries[name])
+        return self._classes[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
 
 class TweakPluginLoader:
     @staticmethod
     def load_tweaks() -> Dict[str, Type[BaseTweak]]:
-        tweaks = {}
-        tweaks_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        for filename in os.listdir(tweaks_dir):
-            if filename.endswith('.py') and filename not in ['__init__.py', 'base_tweak.py', 'plugin_loader.py']:
-                module_name = filename[:-3]
-                module = importlib.import_module(f'utils.tweaks.{module_name}')
-                
-                for name, obj in inspect.getmembers(module):
-                    if (inspect.isclass(obj) and issubclass(obj, BaseTweak) 
-                        and obj != BaseTweak):
-                        tweaks[name] = obj
-        
-        return tweaks
+        # Список классов берётся из манифеста; модули импортируются при первом обращении
+        return _LazyTweakClasses()
 
     @staticmethod
     def get_categories(tweaks: Dict[str, Type[BaseTweak]]) -> List[str]:
+        entries = get_manifest().entries()
         categories = set()
-        for tweak_class in tweaks.values():
-            categories.add(tweak_class().metadata.category)
+        for name in tweaks:
+            entry = entries.get(name)
+            if entry is not None and entry.static:
+                categories.add(entry.category)
+            else:
+                categories.add(tweaks[name]().metadata.category)
         return sorted(list(categories))
@@ -1,20 +1,21 @@
 import platform
 import os
 import subprocess
-import requests
+from utils.tweak_fingerprint import StatusInputs
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
+from utils.asset_cache import fetch_asset, AssetUnavailable, ASSET_MAX_AGE
 
 
 class PowerPlanTweak(BaseTweak):
+    slow_check = True
+
     ASX_POWER_PLAN_GUID = "44444444-4444-4444-4444-444444444449"  # Replace with YOUR GUID
     DEFAULT_POWER_PLANS = [
         "381b4222-f694-41f0-9685-ff5bb260df2e",  # Balanced
         "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c",  # High performance
         "a1841308-3541-4fab-bc81-f71556f20b4a",  # Power saver
     ]
-
-    def __init__(self):
-        self.log_file = self.setup_log_file()
+    log_name = "power_plan"
 
     @property
     def metadata(self) -> TweakMetadata:
@@ -24,6 +25,9 @@ class PowerPlanTweak(BaseTweak):
             category="Оптимизация и настройки"
         )
 
+    def status_inputs(self):
+        return StatusInputs(power_scheme=True)
+
     def check_status(self) -> bool:
         """Checks if the ASX power plan is active."""
         if platform.system() != "Windows":
@@ -63,12 +67,8 @@ class PowerPlanTweak(BaseTweak):
             temp_pow_file = os.path.join(os.environ['TEMP'], "ASX.Hub-Power.pow")
 
             try:
-                response = requests.get(download_url, stream=True)
-                response.raise_for_status()
-                with open(temp_pow_file, 'wb') as file:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        file.write(chunk)
-            except requests.exceptions.RequestException as e:
+                fetch_asset(download_url, temp_pow_file, max_age=ASSET_MAX_AGE)
+            except AssetUnavailable as e:
                 print(f"Error downloading power plan file: {e}")
                 self.log_action("enable", "N/A", False)
                 return False
@@ -105,30 +105,3 @@ class PowerPlanTweak(BaseTweak):
             print(f"Error restoring default power plans: {e}")
             self.log_action("disable", "N/A", False)
             return False
-
-    def setup_log_file(self):
-        """Sets up the log file."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "power_plan_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
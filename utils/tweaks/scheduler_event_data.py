@@ -4,10 +4,11 @@ from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
 
 class SchedulerEventDataTweak(BaseTweak):
+    log_name = "scheduler_event_data"
+
     def __init__(self):
         self.reg = RegistryHandler()
-        self.log_file = self.setup_log_file()
-        self.save_data_path = os.path.join(os.getenv('APPDATA'), "ASX-Hub", "SaveData", "ParameterFunction")
+        self.save_data_path = os.path.join(os.getenv('APPDATA') or os.path.expanduser("~"), "ASX-Hub", "SaveData", "ParameterFunction")
         self.value_name = "SchedulerEventData"
         # Запланированные задачи
         self.tasks = [
@@ -97,31 +98,3 @@ class SchedulerEventDataTweak(BaseTweak):
                 else:
                     self.log_action(f"_set_scheduled_tasks ({task})", f"Failed to {action}", False)
                     print(f"Error controlling task ({task}): {e}, stdout:{e.stdout}, stderr: {e.stderr}")
-
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "scheduler_event_data_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
@@ -2,15 +2,29 @@
 
 import os
 import subprocess
-import winreg
+from utils.registry_backends import winreg
 import shutil
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
+from utils.powershell_host import run_powershell, PowerShellError
+from utils.appx_inventory import get_appx_inventory
+
+# Appx-пакеты виджетов (шаблоны Get-AppxPackage)
+WIDGET_PACKAGES = [
+    "*DesktopPackageMetadata*",
+    "*MicrosoftWindows.Client.WebExperience*",
+    "*Microsoft.WidgetsPlatformRuntime*",
+    "*WebExperience*",
+    "*WidgetServicePackage*",
+]
 
 class WidgetsUninstallTweak(BaseTweak):
+    slow_check = True
+    check_timeout = 60.0  # Первый обход WindowsApps и перечисление Appx-пакетов (дальше - из кэша)
+    log_name = "widgets_uninstall"
+
     def __init__(self):
         self.reg = RegistryHandler()
-        self.log_file = self.setup_log_file()
         # Удаляем self.save_data_path и self.value_name
 
     @property
@@ -21,6 +35,10 @@ class WidgetsUninstallTweak(BaseTweak):
             category="Оптимизация и настройки"
         )
 
+    def status_inputs(self):
+        # Результат зависит от установленных Appx-пакетов - отпечатком не описать
+        return None
+
     def check_status(self) -> bool:
         """
         Проверяет, удалены ли виджеты.  Более надежная проверка.
@@ -34,16 +52,13 @@ class WidgetsUninstallTweak(BaseTweak):
                 # return True  # Если TaskbarDa = 0, считаем, что удалены.  Но продолжаем проверки!
 
             # 2. Проверяем наличие папки WindowsApps и Widgets.dll
+            inventory = get_appx_inventory()
             program_files = os.getenv("ProgramFiles")
             if program_files:
                 windows_apps_path = os.path.join(program_files, "WindowsApps")
                 if os.path.exists(windows_apps_path):
-                    widgets_dll_found = False
-                    for root, dirs, files in os.walk(windows_apps_path):
-                        if "Widgets.dll" in files:
-                            widgets_dll_found = True
-                            break  # Выходим из цикла, если нашли
-                    if widgets_dll_found:
+                    # Результат обхода WindowsApps кэшируется до изменения репозитория пакетов
+                    if inventory.has_file("Widgets.dll"):
                         self.log_action("check_status", "Widgets.dll found, likely installed", False)
                         return False # Если нашли Widgets.dll, то не удалены
                 else:
@@ -54,31 +69,17 @@ class WidgetsUninstallTweak(BaseTweak):
                 #return True  # Не можем проверить, считаем, что не удалены, продолжаем проверки.
 
             # 3. Проверяем, удалены ли Appx-пакеты (менее надежный способ, но все же)
-            packages = [
-                "*DesktopPackageMetadata*",
-                "*MicrosoftWindows.Client.WebExperience*",
-                "*Microsoft.WidgetsPlatformRuntime*",
-                "*WebExperience*",
-                "*WidgetServicePackage*",
-            ]
+            # Шаблоны сопоставляются со списком пакетов из кэша Appx
             all_packages_removed = True
-            for package in packages:
-                try:
-                    result = subprocess.run(
-                        ["powershell", "-Command", f"Get-AppxPackage {package}"],
-                        check=False,
-                        capture_output=True,
-                        text=True
-                    )
-                    if result.stdout:  # Если вывод не пустой, значит пакет найден
-                        all_packages_removed = False
-                        self.log_action("check_status", f"Appx package {package} found", False)
-                        break  # Выходим из цикла, если нашли хотя бы один пакет
-                except subprocess.CalledProcessError as e:
-                    print(f"Error checking Appx package ({package}): {e}")
-                    # Если ошибка при проверке, считаем, что пакет присутствует (для надежности)
+            try:
+                package = inventory.first_match(WIDGET_PACKAGES)
+                if package:  # Если пакет найден
                     all_packages_removed = False
-                    break
+                    self.log_action("check_status", f"Appx package {package} found", False)
+            except (PowerShellError, ValueError) as e:
+                print(f"Error checking Appx packages: {e}")
+                # Если ошибка при проверке, считаем, что пакет присутствует (для надежности)
+                all_packages_removed = False
             if all_packages_removed:
                self.log_action("check_status", "Appx packages not found, likely uninstalled", False)
             else:
@@ -122,6 +123,7 @@ class WidgetsUninstallTweak(BaseTweak):
             self._remove_appx_packages()
             self._set_registry_keys()
             self._remove_widgets_folder()
+            get_appx_inventory().invalidate()
 
             self.log_action("uninstall", "Removed", True)
             return True
@@ -133,23 +135,12 @@ class WidgetsUninstallTweak(BaseTweak):
     def _remove_appx_packages(self):
         """Удаляет Appx-пакеты, связанные с виджетами."""
         self.log_action("_remove_appx_packages", "Attempting", False)
-        packages = [
-            "*DesktopPackageMetadata*",
-            "*MicrosoftWindows.Client.WebExperience*",
-            "*Microsoft.WidgetsPlatformRuntime*",
-            "*WebExperience*",
-            "*WidgetServicePackage*",
-        ]
-        for package in packages:
+        for package in WIDGET_PACKAGES:
             try:
-                subprocess.run(
-                    ["powershell", "-Command", f"Get-AppxPackage {package} | Remove-AppxPackage"],
-                    check=False,  # Не выходим, если пакета нет
-                    capture_output=True,
-                    text=True
-                )
+                # Ошибки Remove-AppxPackage не прерывают удаление остальных пакетов
+                run_powershell(f"Get-AppxPackage {package} | Remove-AppxPackage", timeout=120.0)
                 self.log_action(f"_remove_appx_packages ({package})", "Removed", True)
-            except subprocess.CalledProcessError as e:
+            except PowerShellError as e:
                 self.log_action(f"_remove_appx_packages ({package})", "Failed to remove", False)
                 print(f"Error removing Appx package ({package}): {e}")
 
@@ -209,33 +200,3 @@ class WidgetsUninstallTweak(BaseTweak):
                         self.log_action("_remove_widgets_folder", f"Failed to remove {widgets_path}", False)
                         print(f"Error removing Widgets folder ({widgets_path}): {e}")
                     return  # Выходим из цикла, если нашли и удалили
-
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "widgets_uninstall_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                if state != "Attempting" and "changed" not in state and "applicable" not in state:
-                    print(log_message)  # Print to console too
-
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
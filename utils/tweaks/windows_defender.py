@@ -1,14 +1,15 @@
-import os
-import subprocess
-import winreg
+from utils.registry_backends import winreg
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
+from utils.powershell_host import run_powershell, PowerShellError
 
 
 class WindowsDefenderTweak(BaseTweak):
+    slow_check = True
+    log_name = "windows_defender"
+
     def __init__(self):
         self.reg = RegistryHandler()
-        self.log_file = self.setup_log_file()
 
     @property
     def metadata(self) -> TweakMetadata:
@@ -18,21 +19,24 @@ class WindowsDefenderTweak(BaseTweak):
             category="Безопасность"  # Изменено на "Безопасность"
         )
 
+    def status_inputs(self):
+        # Результат зависит от вывода PowerShell - отпечатком не описать
+        return None
+
     def check_status(self) -> bool:
         """
         Проверяет, включен ли Защитник Windows.  Использует PowerShell для получения
         более точного статуса, чем просто проверка реестра.
         """
         try:
-            result = subprocess.run(
-                ["powershell", "-command", "Get-MpComputerStatus | Select-Object -ExpandProperty AMServiceEnabled"],
-                capture_output=True, text=True, check=True
-            )
-            # result.stdout будет содержать "True" или "False" (как строку)
-            status = result.stdout.strip().lower() == "true"
+            result = run_powershell("Get-MpComputerStatus | Select-Object -ExpandProperty AMServiceEnabled")
+            if not result.success:
+                raise PowerShellError("; ".join(result.errors))
+            # result.text будет содержать "True" или "False" (как строку)
+            status = result.text.lower() == "true"
             self.log_action("check_status", f"WindowsDefender: {status}", True)  # Логируем результат проверки
             return status
-        except subprocess.CalledProcessError as e:
+        except PowerShellError as e:
             self.log_action("check_status", "WindowsDefender Error checking status", False)
             print(f"Error checking Windows Defender status: {e}")
             return False  # В случае ошибки считаем, что отключен
@@ -115,31 +119,3 @@ class WindowsDefenderTweak(BaseTweak):
         }
         for service_name, start_value in services.items():
             self.reg.set_registry_value(r"HKLM\SYSTEM\CurrentControlSet\Services\\" + service_name, "Start", start_value, winreg.REG_DWORD)
-
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "windows_defender_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)  # Print to console too
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
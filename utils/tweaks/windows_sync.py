@@ -1,13 +1,14 @@
-import os
-import winreg
+from utils.registry_backends import winreg
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
 
 class WindowsSyncTweak(BaseTweak):
+    log_name = "windows_sync"
+    registry_only = True
+
     def __init__(self):
         self.reg = RegistryHandler()
         self.base_path = r"HKCU\Software\Microsoft\Windows\CurrentVersion\SettingSync\Groups"
-        self.log_file = self.setup_log_file()
         # Группы синхронизации
         self.sync_groups = [
             "Accessibility",
@@ -85,30 +86,3 @@ class WindowsSyncTweak(BaseTweak):
         value = 1 if enabled else 0
         for group in self.sync_groups:
             self.reg.set_registry_value(f"{self.base_path}\\{group}", "Enabled", value, winreg.REG_DWORD)
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "windows_sync_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file
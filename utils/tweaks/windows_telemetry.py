@@ -1,15 +1,15 @@
 # utils/tweaks/windows_telemetry.py (с исправленной кодировкой)
 
-import os
-import winreg
+from utils.registry_backends import winreg
 import subprocess
 from utils.tweaks.base_tweak import BaseTweak, TweakMetadata
 from utils.registry_handler import RegistryHandler
 
 class WindowsTelemetryTweak(BaseTweak):
+    log_name = "windows_telemetry"
+
     def __init__(self):
         self.reg = RegistryHandler()
-        self.log_file = self.setup_log_file()
         # Определение кодировки OEM
         try:
             # chcp возвращает строку типа "Active code page: 866\n", поэтому берем только число
@@ -90,10 +90,12 @@ class WindowsTelemetryTweak(BaseTweak):
         diagtrack_start = 3 if enabled else 4
         dmwappushservice_start = 3 if enabled else 4
 
-        self.reg.set_registry_value(r"HKLM\SYSTEM\CurrentControlSet\Control\WMI\Autologger\Diagtrack-Listener", "Start", diagtrack_listener_start, winreg.REG_DWORD)
-        self.reg.set_registry_value(r"HKCU\Software\Microsoft\Windows\CurrentVersion\Policies\Attachments", "SaveZoneInformation", save_zone_information, winreg.REG_DWORD)
-        self.reg.set_registry_value(r"HKLM\SYSTEM\CurrentControlSet\Services\DiagTrack", "Start", diagtrack_start, winreg.REG_DWORD)
-        self.reg.set_registry_value(r"HKLM\SYSTEM\CurrentControlSet\Services\dmwappushservice", "Start", dmwappushservice_start, winreg.REG_DWORD)
+        # Все четыре значения применяются вместе или не применяются вовсе
+        with self.reg.transaction():
+            self.reg.set_registry_value(r"HKLM\SYSTEM\CurrentControlSet\Control\WMI\Autologger\Diagtrack-Listener", "Start", diagtrack_listener_start, winreg.REG_DWORD)
+            self.reg.set_registry_value(r"HKCU\Software\Microsoft\Windows\CurrentVersion\Policies\Attachments", "SaveZoneInformation", save_zone_information, winreg.REG_DWORD)
+            self.reg.set_registry_value(r"HKLM\SYSTEM\CurrentControlSet\Services\DiagTrack", "Start", diagtrack_start, winreg.REG_DWORD)
+            self.reg.set_registry_value(r"HKLM\SYSTEM\CurrentControlSet\Services\dmwappushservice", "Start", dmwappushservice_start, winreg.REG_DWORD)
 
 
     def _set_scheduled_tasks(self, enabled: bool):
@@ -117,31 +119,3 @@ class WindowsTelemetryTweak(BaseTweak):
                 print(f"Error {action}ing scheduled task ({task}): {e}, stdout: {e.stdout}, stderr:{e.stderr}")
                 # Не выходим, а продолжаем со следующей задачей
                 # raise  #  Перевыбрасываем исключение -  теперь НЕ перевыбрасываем, чтобы продолжить выполнение
-
-
-    def setup_log_file(self):
-        """Sets up the log file path, creating directories if necessary."""
-        app_data_dir = os.getenv('APPDATA')
-        if not app_data_dir:
-            app_data_dir = os.path.expanduser("~")
-        log_dir = os.path.join(app_data_dir, "ASX-Hub", "Logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, "windows_telemetry_log.txt")
-        return log_file
-
-    def log_action(self, action, state, success):
-        """Logs actions to the log file."""
-        try:
-            with open(self.log_file, "a") as f:
-                timestamp = self.get_timestamp()
-                log_message = f"[{timestamp}] Action: {action}, State: {state}, Success: {success}\n"
-                f.write(log_message)
-                print(log_message)
-        except Exception as e:
-            print(f"Error writing to log file: {e}")
-
-    def get_timestamp(self):
-        """Gets the current timestamp formatted for logging."""
-        import datetime
-        now = datetime.datetime.now()
-        return now.strftime("%Y-%m-%d %H:%M:%S")
\ No newline at end of file